@@ -3,50 +3,204 @@ Flask API Server for Women's Wellness Tracker
 Replaces Streamlit backend with REST API for React frontend
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
-from datetime import datetime
+from datetime import datetime, date
+import gc
 import json
 import os
+import threading
 
-from database import init_db
+from database import init_db, describe_engine, reset_pool_after_fork, read_snapshot
+from database import entry_dates_need_migration, ENTRY_MIGRATION_NEEDED
+from request_sessions import init_request_sessions
 from db_storage import get_all_entries, save_wellness_entry, get_recent_entries, get_user_profile, update_user_profile
+from db_storage import get_entries_page, count_entries, to_entry_date, iter_entry_chunks, get_symptom_keys, load_entries_frame
+from db_storage import get_entry_by_date as fetch_entry_by_date, get_entry_changes, get_data_version
 from ml_models import WellnessPredictor
+from training_worker import TrainingWorker, XGB_MIN_ENTRIES, LSTM_MIN_ENTRIES
+from entry_cache import EntryFrameCache
+from result_cache import ResultCache
+from events import create_event_bus, stream_events, ENTRY_SAVED, MODEL_TRAINED, CACHE_INVALIDATED
+from bulk_ingest import ingest_entries
+from http_cache import conditional_get
+from json_provider import make_json_provider
+from compression import init_compression
+from chart_data import CHART_COLUMNS, build_chart_payload, build_chart_columns
+from entry_frame import records_to_columns
 from reports import generate_weekly_report, generate_monthly_report
 from recommendations import get_personalized_recommendations
 from cycle_prediction import predict_next_cycle, predict_symptom_likelihood
 from comparative_analytics import calculate_monthly_aggregates, compare_months
-from data_export import export_to_csv, export_to_json, create_summary_report
+from data_export import export_to_json, create_summary_report, stream_csv, stream_ndjson
+from columnar_export import PYARROW_AVAILABLE, EXPORT_FORMATS, write_entries
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for React frontend
+init_request_sessions(app)  # One database session per request, closed at teardown
+app.json = make_json_provider(app)  # orjson when available: numpy/pandas values, NaN as null
+init_compression(app)  # gzip/brotli for text responses above COMPRESS_MIN_SIZE
+
+# Upper bound for ?limit= on paginated entry listings
+MAX_PAGE_SIZE = 1000
+# Upper bound on entries accepted by one POST /api/entries/bulk
+MAX_BULK_ENTRIES = 10000
+# Upper bound on entries scored by one POST /api/ml/predict/batch, and the
+# entries scored per model call (bounds the feature matrix and frames)
+MAX_PREDICT_ENTRIES = 100000
+PREDICT_CHUNK_SIZE = int(os.environ.get('PREDICT_CHUNK_SIZE', 5000))
+# Rows per chunk of a streamed export (bounds its memory use)
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 1000))
+# Seconds an /api/events stream stays open before the client is asked to reconnect
+EVENT_STREAM_SECONDS = int(os.environ.get('EVENT_STREAM_SECONDS', 300))
 
 # Initialize database and ML predictor
 init_db()
 ml_predictor = WellnessPredictor()
 
-# Load ML models if available
-try:
-    entries = get_all_entries()
-    if len(entries) >= 10:
-        ml_predictor.train_xgboost_model(entries)
-    if len(entries) >= 7:
-        ml_predictor.train_lstm_model(entries)
-except:
-    pass
+# Pushed to /api/events streams; EVENT_BROKER=database (default) reaches every worker
+event_bus = create_event_bus()
+
+def announce_model_trained(job):
+    """Tell event streams that new models (and so new predictions) are live"""
+    event_bus.publish(MODEL_TRAINED, job)
+    event_bus.publish(CACHE_INVALIDATED, {"reason": "model", "model_version": job['model_version']})
+
+def announce_entries_saved(dates, **details):
+    """Tell event streams about written entries; a publish failure never fails the write"""
+    try:
+        version = get_data_version()
+        event_bus.publish(ENTRY_SAVED, {"dates": dates, "version": version, **details})
+        event_bus.publish(CACHE_INVALIDATED, {"reason": "entries", "version": version})
+    except Exception as e:
+        print(f"Event publish failed: {e}")
+
+# Models are (re)trained in the background; until a job publishes, requests are
+# served with the models saved on disk or the heuristic fallback.
+training_worker = TrainingWorker(ml_predictor, on_published=announce_model_trained)
+
+def start_background_jobs():
+    """
+    Queue the startup job, which starts this process's training thread. It
+    retrains only when the saved models are behind the entries (one process
+    does, the others adopt its result); see TrainingWorker.submit_startup.
+    """
+    training_worker.submit_startup()
+
+# Under gunicorn with preload (gunicorn.conf.py) this module is imported once in
+# the master, which must not start threads: each worker starts its own after fork.
+if os.environ.get('WELLNESS_PRELOAD') != '1':
+    start_background_jobs()
+
+def preload_shared_state():
+    """
+    Run once in the gunicorn master before workers fork: import the fork-safe
+    backends (XGBoost, TextBlob) and read the saved XGBoost model, so every
+    worker shares those pages copy-on-write, then freeze the heap so the
+    garbage collector does not write to (and so copy) them. TensorFlow is
+    left to init_worker(). Returns load_costs().
+    """
+    costs = ml_predictor.warmup(tensorflow=False)
+    reset_pool_after_fork(parent=True)
+    gc.collect()
+    gc.freeze()
+    return costs
+
+def init_worker():
+    """
+    Run in each gunicorn worker right after fork: drop the database
+    connections inherited from the master, queue the startup job, and
+    load TensorFlow and the LSTM model in this process (in the background,
+    so the worker serves meanwhile).
+    """
+    reset_pool_after_fork()
+    start_background_jobs()
+    threading.Thread(target=ml_predictor.warmup, name='ml-warmup', daemon=True).start()
+
+# Shared per-user entries frames, invalidated through the data version on write
+entry_cache = EntryFrameCache(max_users=int(os.environ.get('ENTRY_CACHE_USERS', 128)))
+# Read endpoints answer If-None-Match / If-Modified-Since with 304 when neither
+# the entries, the models nor the day have changed
+cached_read = conditional_get(lambda: (ml_predictor.model_id, ml_predictor.published_at))
+# Computed reports, recommendations, predictions and analytics, keyed by data
+# version (and model for ML-backed views); RESULT_CACHE_DIR persists them
+result_cache = ResultCache(
+    max_bytes=int(os.environ.get('RESULT_CACHE_MB', 64)) * 1024 * 1024,
+    persist_dir=os.environ.get('RESULT_CACHE_DIR') or None
+)
+
+def memoized(name, compute, params=(), uses_model=False):
+    """Result of compute() from result_cache for the default user (shared: do not mutate)"""
+    return result_cache.get_or_compute('default_user', name, compute, params=params,
+                                       model_id=ml_predictor.model_id if uses_model else None)
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({"status": "healthy", "message": "API is running"})
 
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """
+    Readiness probe: imports the ML backends and reads the saved models (on
+    the first call only) so they are not loaded by a user request, and
+    reports what each load cost. Not ready while the entry date migration
+    is outstanding (every save would fail).
+    """
+    try:
+        if entry_dates_need_migration():
+            return jsonify({"status": "not ready", "error": ENTRY_MIGRATION_NEEDED}), 503
+        return jsonify({"status": "ready", "load_costs": ml_predictor.warmup()})
+    except Exception as e:
+        return jsonify({"status": "not ready", "error": str(e)}), 503
+
 # ==================== Entries Endpoints ====================
 
+def wants_columnar():
+    """
+    True for ?format=columnar (parallel arrays, one per field), False for
+    the default row objects; ValueError for anything else.
+    """
+    response_format = request.args.get('format', 'rows')
+    if response_format not in ('rows', 'columnar'):
+        raise ValueError(f"Unknown format '{response_format}' (expected rows or columnar)")
+    return response_format == 'columnar'
+
 @app.route('/api/entries', methods=['GET'])
+@cached_read
 def get_entries():
-    """Get all wellness entries"""
+    """
+    Get wellness entries, oldest first.
+    Optional query params: from/to (inclusive YYYY-MM-DD bounds) and keyset
+    pagination with after=<date>&limit=N. Without any of them the full history
+    is returned as before. format=columnar returns {field: [values...]}
+    without the stress alias fields.
+    """
     try:
-        entries = get_all_entries()
+        try:
+            columnar = wants_columnar()
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+        try:
+            start = to_entry_date(request.args['from']) if request.args.get('from') else None
+            end = to_entry_date(request.args['to']) if request.args.get('to') else None
+            after = to_entry_date(request.args['after']) if request.args.get('after') else None
+            limit = int(request.args['limit']) if request.args.get('limit') else None
+        except ValueError:
+            return jsonify({"success": False, "error": "Invalid from/to/after date (YYYY-MM-DD) or limit"}), 400
+        if limit is not None:
+            limit = max(1, min(limit, MAX_PAGE_SIZE))
+        
+        if start is None and end is None and after is None and limit is None:
+            entries = get_all_entries()
+        else:
+            entries = get_entries_page(start=start, end=end, after=after, limit=limit)
+        
+        if columnar:
+            next_cursor = entries[-1]['date'] if limit is not None and len(entries) == limit else None
+            return jsonify({"success": True, "format": "columnar", "count": len(entries),
+                            "data": records_to_columns(entries), "next_cursor": next_cursor})
+        
         # Map database field names to frontend field names for compatibility
         mapped_entries = []
         for entry in entries:
@@ -57,14 +211,40 @@ def get_entries():
                 mapped_entry['afternoon_stress'] = mapped_entry.get('stress_afternoon', 0)
                 mapped_entry['night_stress'] = mapped_entry.get('stress_night', 0)
             mapped_entries.append(mapped_entry)
-        return jsonify({"success": True, "data": mapped_entries})
+        
+        # A full page means there may be more; the cursor is the last date served
+        next_cursor = mapped_entries[-1]['date'] if limit is not None and len(mapped_entries) == limit else None
+        return jsonify({"success": True, "data": mapped_entries, "next_cursor": next_cursor})
     except Exception as e:
         import traceback
         print(f"Error in get_entries: {e}")
         print(traceback.format_exc())
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route('/api/entries/changes', methods=['GET'])
+@cached_read
+def get_changes():
+    """
+    Delta sync: entries inserted, updated or deleted since ?since=<version>.
+    
+    Returns {"version", "full", "upserted": [entries], "deleted": [dates]};
+    pass version back as since on the next call. since=0 (or an unknown
+    version) returns every entry with full=true.
+    """
+    try:
+        try:
+            since = int(request.args.get('since', 0))
+        except ValueError:
+            return jsonify({"success": False, "error": "since must be a version number"}), 400
+        if since < 0:
+            return jsonify({"success": False, "error": "since must be a version number"}), 400
+        
+        return jsonify({"success": True, "data": get_entry_changes(since)})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @app.route('/api/entries/recent', methods=['GET'])
+@cached_read
 def get_recent():
     """Get recent entries"""
     try:
@@ -157,12 +337,11 @@ def create_entry():
         # Save entry
         saved_entry = save_wellness_entry(entry_data)
         
-        # Train ML models if enough data
-        all_entries = get_all_entries()
-        if len(all_entries) >= 10 and not ml_predictor.is_xgb_trained:
-            ml_predictor.train_xgboost_model(all_entries)
-        if len(all_entries) >= 7 and not ml_predictor.is_lstm_trained:
-            ml_predictor.train_lstm_model(all_entries)
+        # Queue training if the retrain policy calls for it; the response does not wait for it
+        training_worker.notify_entry_count(count_entries())
+        announce_entries_saved([to_entry_date(entry_data['date']).isoformat()],
+                               wellness_score=entry_data.get('wellness_score'),
+                               predicted_energy=entry_data.get('predicted_energy'))
         
         return jsonify({"success": True, "data": entry_data, "ml_trained": {
             "xgboost": ml_predictor.is_xgb_trained,
@@ -175,12 +354,44 @@ def create_entry():
         print(error_trace)
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route('/api/entries/bulk', methods=['POST'])
+def create_entries_bulk():
+    """
+    Create or update many entries at once (backfills).
+    Body: {"entries": [...]} or a bare list. Invalid rows are reported per
+    index in "errors" and do not stop the rest of the batch from being saved.
+    """
+    try:
+        payload = request.get_json(silent=True)
+        records = payload.get('entries') if isinstance(payload, dict) else payload
+        if not isinstance(records, list) or not records:
+            return jsonify({"success": False, "error": "Expected a non-empty list of entries"}), 400
+        if len(records) > MAX_BULK_ENTRIES:
+            return jsonify({"success": False, "error": f"At most {MAX_BULK_ENTRIES} entries per request"}), 413
+        
+        result = ingest_entries(records, ml_predictor)
+        dates = result.pop('dates')
+        
+        if result['saved']:
+            training_worker.notify_entry_count(count_entries())
+            announce_entries_saved(dates)
+        
+        return jsonify({"success": True, "data": result})
+    except Exception as e:
+        import traceback
+        print(f"Error in create_entries_bulk: {e}")
+        print(traceback.format_exc())
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @app.route('/api/entries/<date>', methods=['GET'])
+@cached_read
 def get_entry_by_date(date):
     """Get entry by date"""
     try:
-        entries = get_all_entries()
-        entry = next((e for e in entries if e['date'] == date), None)
+        try:
+            entry = fetch_entry_by_date(date)
+        except ValueError:
+            return jsonify({"success": False, "error": "Invalid date, expected YYYY-MM-DD"}), 400
         if entry:
             return jsonify({"success": True, "data": entry})
         else:
@@ -190,38 +401,43 @@ def get_entry_by_date(date):
 
 # ==================== Dashboard Endpoints ====================
 
+STATS_COLUMNS = ['wellness_score', 'sleep_hours', 'exercise_minutes', 'average_stress']
+
+def dashboard_stats(df):
+    """Averages over the last 7 entries plus the entry count"""
+    if df.empty:
+        return {
+            "avg_wellness": 0,
+            "avg_sleep": 0,
+            "avg_exercise": 0,
+            "avg_stress": 0,
+            "total_entries": 0
+        }
+    
+    recent = df.tail(7)
+    
+    # Helper function to safely get mean
+    def safe_mean(series, default=0):
+        try:
+            return float(series.mean()) if len(series) > 0 else default
+        except:
+            return default
+    
+    return {
+        "avg_wellness": safe_mean(recent['wellness_score']) if 'wellness_score' in recent.columns else 0,
+        "avg_sleep": safe_mean(recent['sleep_hours'], 0),
+        "avg_exercise": safe_mean(recent['exercise_minutes'], 0),
+        "avg_stress": safe_mean(recent['average_stress'], 0),
+        "total_entries": len(df)
+    }
+
 @app.route('/api/dashboard/stats', methods=['GET'])
+@cached_read
 def get_dashboard_stats():
     """Get dashboard statistics"""
     try:
-        entries = get_all_entries()
-        if not entries:
-            return jsonify({"success": True, "data": {
-                "avg_wellness": 0,
-                "avg_sleep": 0,
-                "avg_exercise": 0,
-                "avg_stress": 0,
-                "total_entries": 0
-            }})
-        
-        import pandas as pd
-        df = pd.DataFrame(entries)
-        recent = df.tail(7)
-        
-        # Helper function to safely get mean
-        def safe_mean(series, default=0):
-            try:
-                return float(series.mean()) if len(series) > 0 else default
-            except:
-                return default
-        
-        return jsonify({"success": True, "data": {
-            "avg_wellness": safe_mean(recent['wellness_score']) if 'wellness_score' in recent.columns else 0,
-            "avg_sleep": safe_mean(recent['sleep_hours'], 0),
-            "avg_exercise": safe_mean(recent['exercise_minutes'], 0),
-            "avg_stress": safe_mean(recent['average_stress'], 0),
-            "total_entries": len(entries)
-        }})
+        df = entry_cache.get_frame(columns=STATS_COLUMNS)
+        return jsonify({"success": True, "data": dashboard_stats(df)})
     except Exception as e:
         import traceback
         print(f"Error in get_dashboard_stats: {e}")
@@ -229,57 +445,20 @@ def get_dashboard_stats():
         return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/dashboard/charts', methods=['GET'])
+@cached_read
 def get_dashboard_charts():
-    """Get dashboard chart data"""
-    try:
-        entries = get_all_entries()
-        if not entries:
-            return jsonify({"success": True, "data": {
-                "wellness_scores": [],
-                "stress_levels": [],
-                "sleep_data": [],
-                "exercise_data": [],
-                "water_data": []
-            }})
-        
-        import pandas as pd
-        df = pd.DataFrame(entries)
-        df['date'] = pd.to_datetime(df['date'])
-        df = df.sort_values('date')
-        
-        # Helper function to safely get numeric values
-        def safe_float(value, default=0):
-            try:
-                return float(value) if value is not None else default
-            except (ValueError, TypeError):
-                return default
-        
-        def safe_int(value, default=0):
-            try:
-                return int(value) if value is not None else default
-            except (ValueError, TypeError):
-                return default
-        
-        chart_data = {
-            "wellness_scores": [{"date": str(row['date']), "score": safe_float(row.get('wellness_score', 0))} 
-                                for _, row in df.iterrows()] if 'wellness_score' in df.columns else [],
-            "stress_levels": [{
-                "date": str(row['date']),
-                "morning": safe_float(row.get('stress_morning', row.get('morning_stress', 0))),
-                "afternoon": safe_float(row.get('stress_afternoon', row.get('afternoon_stress', 0))),
-                "night": safe_float(row.get('stress_night', row.get('night_stress', 0)))
-            } for _, row in df.iterrows()],
-            "sleep_data": [{
-                "date": str(row['date']),
-                "hours": safe_float(row.get('sleep_hours', 0)),
-                "quality": safe_float(row.get('sleep_quality', 0))
-            } for _, row in df.iterrows()],
-            "exercise_data": [{"date": str(row['date']), "minutes": safe_int(row.get('exercise_minutes', 0))} 
-                             for _, row in df.iterrows()],
-            "water_data": [{"date": str(row['date']), "intake": safe_int(row.get('water_intake', 0))} 
-                           for _, row in df.iterrows()]
-        }
+    """Get dashboard chart data (?format=columnar: one shared date array and one array per metric)"""
+    try:
+        try:
+            columnar = wants_columnar()
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
         
+        df = entry_cache.get_frame(columns=CHART_COLUMNS)
+        if columnar:
+            return jsonify({"success": True, "format": "columnar", "data": build_chart_columns(df)})
+        
+        chart_data = build_chart_payload(df)
         return jsonify({"success": True, "data": chart_data})
     except Exception as e:
         import traceback
@@ -287,118 +466,195 @@ def get_dashboard_charts():
         print(traceback.format_exc())
         return jsonify({"success": False, "error": str(e)}), 500
 
+# Sections GET /api/dashboard/bundle can return, and the frame columns each needs
+DASHBOARD_SECTIONS = {
+    'stats': STATS_COLUMNS,
+    'charts': CHART_COLUMNS,
+    'ml_status': [],
+    'cycle': ['on_period']
+}
+
+@app.route('/api/dashboard/bundle', methods=['GET'])
+@cached_read
+def get_dashboard_bundle():
+    """
+    Stats, chart series, ML status and the cycle prediction in one response,
+    all computed from one entries frame. ?sections=stats,charts limits it to
+    what a page renders; format=columnar applies to the charts. The ML status
+    here leaves out the live training queue (see /api/ml/status).
+    """
+    try:
+        try:
+            columnar = wants_columnar()
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+        
+        requested = request.args.get('sections')
+        sections = [name.strip() for name in requested.split(',') if name.strip()] if requested else list(DASHBOARD_SECTIONS)
+        unknown = [name for name in sections if name not in DASHBOARD_SECTIONS]
+        if unknown:
+            return jsonify({"success": False, "error": f"Unknown sections: {', '.join(unknown)} "
+                                                       f"(expected {', '.join(DASHBOARD_SECTIONS)})"}), 400
+        
+        def build_bundle():
+            columns = list(dict.fromkeys(col for name in sections for col in DASHBOARD_SECTIONS[name]))
+            df = entry_cache.get_frame(columns=columns)
+            
+            data = {}
+            if 'stats' in sections:
+                data['stats'] = dashboard_stats(df)
+            if 'charts' in sections:
+                data['charts'] = build_chart_columns(df) if columnar else build_chart_payload(df)
+            if 'ml_status' in sections:
+                data['ml_status'] = model_status(len(df))
+            if 'cycle' in sections:
+                # None until two cycles have been tracked
+                data['cycle'] = cached_cycle_prediction(lambda: df)
+            return data
+        
+        # Only the ML status depends on the published models
+        data = memoized('dashboard_bundle', build_bundle,
+                        params=(tuple(sections), columnar, date.today().isoformat()),
+                        uses_model='ml_status' in sections)
+        return jsonify({"success": True, "data": data})
+    except Exception as e:
+        import traceback
+        print(f"Error in get_dashboard_bundle: {e}")
+        print(traceback.format_exc())
+        return jsonify({"success": False, "error": str(e)}), 500
+
 # ==================== Reports Endpoints ====================
 
+def build_weekly_report():
+    df = entry_cache.get_frame()
+    if len(df) < 3:
+        return {"success": False, "error": "Need at least 3 entries"}, 400
+    
+    # Generate report HTML (simplified version)
+    report_html = generate_weekly_report(df)
+    
+    # Also return structured data
+    recent = df.tail(7)
+    report_data = {
+        "avg_wellness": float(recent['wellness_score'].mean()) if 'wellness_score' in recent.columns else 0,
+        "avg_stress": float(recent['average_stress'].mean()),
+        "avg_sleep": float(recent['sleep_hours'].mean()),
+        "total_exercise": int(recent['exercise_minutes'].sum()),
+        "avg_water": float(recent['water_intake'].mean()),
+        "period_days": int(recent['on_period'].sum()) if 'on_period' in recent.columns else 0
+    }
+    
+    return {"success": True, "html": report_html, "data": report_data}, 200
+
 @app.route('/api/reports/weekly', methods=['GET'])
+@cached_read
 def get_weekly_report():
     """Generate weekly report"""
     try:
-        entries = get_all_entries()
-        if len(entries) < 3:
-            return jsonify({"success": False, "error": "Need at least 3 entries"}), 400
-        
-        import pandas as pd
-        df = pd.DataFrame(entries)
-        
-        # Generate report HTML (simplified version)
-        report_html = generate_weekly_report(df)
-        
-        # Also return structured data
-        recent = df.tail(7)
-        report_data = {
-            "avg_wellness": float(recent['wellness_score'].mean()) if 'wellness_score' in recent.columns else 0,
-            "avg_stress": float(recent['average_stress'].mean()),
-            "avg_sleep": float(recent['sleep_hours'].mean()),
-            "total_exercise": int(recent['exercise_minutes'].sum()),
-            "avg_water": float(recent['water_intake'].mean()),
-            "period_days": int(recent['on_period'].sum()) if 'on_period' in recent.columns else 0
-        }
-        
-        return jsonify({"success": True, "html": report_html, "data": report_data})
+        body, status = memoized('weekly_report', build_weekly_report)
+        return jsonify(body), status
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+def build_monthly_report():
+    df = entry_cache.get_frame()
+    if len(df) < 7:
+        return {"success": False, "error": "Need at least 7 entries"}, 400
+    
+    report_html = generate_monthly_report(df, ml_predictor)
+    
+    # Structured data
+    recent = df.tail(30)
+    report_data = {
+        "total_entries": len(recent),
+        "avg_wellness": float(recent['wellness_score'].mean()) if 'wellness_score' in recent.columns else 0,
+        "total_exercise": int(recent['exercise_minutes'].sum()),
+        "avg_sleep": float(recent['sleep_hours'].mean()),
+        "period_days": int(recent['on_period'].sum()) if 'on_period' in recent.columns else 0,
+        "avg_stress": float(recent['average_stress'].mean())
+    }
+    
+    return {"success": True, "html": report_html, "data": report_data}, 200
+
 @app.route('/api/reports/monthly', methods=['GET'])
+@cached_read
 def get_monthly_report():
     """Generate monthly report"""
     try:
-        entries = get_all_entries()
-        if len(entries) < 7:
-            return jsonify({"success": False, "error": "Need at least 7 entries"}), 400
-        
-        import pandas as pd
-        df = pd.DataFrame(entries)
-        
-        report_html = generate_monthly_report(df, ml_predictor)
-        
-        # Structured data
-        recent = df.tail(30)
-        report_data = {
-            "total_entries": len(recent),
-            "avg_wellness": float(recent['wellness_score'].mean()) if 'wellness_score' in recent.columns else 0,
-            "total_exercise": int(recent['exercise_minutes'].sum()),
-            "avg_sleep": float(recent['sleep_hours'].mean()),
-            "period_days": int(recent['on_period'].sum()) if 'on_period' in recent.columns else 0,
-            "avg_stress": float(recent['average_stress'].mean())
-        }
-        
-        return jsonify({"success": True, "html": report_html, "data": report_data})
+        body, status = memoized('monthly_report', build_monthly_report)
+        return jsonify(body), status
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 # ==================== Recommendations Endpoint ====================
 
+def build_recommendations():
+    df = entry_cache.get_frame()
+    if df.empty:
+        return {"success": False, "error": "No data available"}, 400
+    
+    recommendations_html = get_personalized_recommendations(df)
+    
+    return {"success": True, "html": recommendations_html}, 200
+
 @app.route('/api/recommendations', methods=['GET'])
+@cached_read
 def get_recommendations():
     """Get personalized recommendations"""
     try:
-        entries = get_all_entries()
-        if not entries:
-            return jsonify({"success": False, "error": "No data available"}), 400
-        
-        import pandas as pd
-        df = pd.DataFrame(entries)
-        
-        recommendations_html = get_personalized_recommendations(df)
-        
-        return jsonify({"success": True, "html": recommendations_html})
+        # The advice depends on today's cycle phase
+        body, status = memoized('recommendations', build_recommendations, params=(date.today().isoformat(),))
+        return jsonify(body), status
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 # ==================== Cycle Prediction Endpoints ====================
 
+def cycle_prediction_payload(df):
+    """Next-period prediction from a frame with on_period, or None before 2 cycles"""
+    prediction = predict_next_cycle(df)
+    if prediction is None:
+        return None
+    
+    return {
+        "predicted_date": prediction['predicted_date'].isoformat(),
+        "days_until": (prediction['predicted_date'] - datetime.now()).days,
+        "confidence": prediction['confidence'],
+        "confidence_range_days": prediction['confidence_range_days'],
+        "avg_cycle_length": float(prediction['avg_cycle_length']),
+        "cycle_regularity": prediction['cycle_regularity'],
+        "total_cycles_tracked": prediction['total_cycles_tracked']
+    }
+
+def cached_cycle_prediction(load_frame=lambda: entry_cache.get_frame(columns=['on_period'])):
+    """cycle_prediction_payload, memoized per data version and day (days_until counts from today)"""
+    return memoized('cycle_prediction', lambda: cycle_prediction_payload(load_frame()),
+                    params=(date.today().isoformat(),))
+
 @app.route('/api/cycle/predict', methods=['GET'])
+@cached_read
 def get_cycle_prediction():
     """Get cycle prediction"""
     try:
-        entries = get_all_entries()
-        data = {"entries": entries}
-        
-        prediction = predict_next_cycle(data)
+        prediction = cached_cycle_prediction()
         
         if prediction is None:
             return jsonify({"success": False, "error": "Need at least 2 cycles tracked"}), 400
         
-        return jsonify({"success": True, "data": {
-            "predicted_date": prediction['predicted_date'].isoformat(),
-            "days_until": (prediction['predicted_date'] - datetime.now()).days,
-            "confidence": prediction['confidence'],
-            "confidence_range_days": prediction['confidence_range_days'],
-            "avg_cycle_length": float(prediction['avg_cycle_length']),
-            "cycle_regularity": prediction['cycle_regularity'],
-            "total_cycles_tracked": prediction['total_cycles_tracked']
-        }})
+        return jsonify({"success": True, "data": prediction})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/cycle/symptoms', methods=['GET'])
+@cached_read
 def get_symptom_predictions():
     """Get symptom predictions"""
     try:
-        entries = get_all_entries()
-        data = {"entries": entries}
-        
-        predictions = predict_symptom_likelihood(data)
+        predictions = memoized(
+            'symptom_likelihood',
+            lambda: predict_symptom_likelihood(entry_cache.get_frame(columns=['on_period', 'symptoms'])),
+            params=(date.today().isoformat(),)
+        )
         
         return jsonify({"success": True, "data": predictions})
     except Exception as e:
@@ -406,88 +662,110 @@ def get_symptom_predictions():
 
 # ==================== Analytics Endpoints ====================
 
+def build_trends():
+    df = entry_cache.get_frame(columns=[
+        'average_stress', 'sleep_hours', 'sleep_quality', 'exercise_minutes',
+        'water_intake', 'wellness_score', 'on_period'
+    ])
+    if len(df) < 3:
+        return {"success": False, "error": "Need at least 3 entries"}, 400
+    
+    # Calculate correlations
+    correlation_metrics = ['average_stress', 'sleep_hours', 'sleep_quality', 
+                          'exercise_minutes', 'water_intake', 'wellness_score']
+    
+    corr_data = {}
+    if all(col in df.columns for col in correlation_metrics):
+        corr_matrix = df[correlation_metrics].corr()
+        corr_data = corr_matrix.to_dict()
+    
+    # Monthly aggregates
+    monthly_data = calculate_monthly_aggregates(df) if len(df) >= 14 else None
+    
+    return {"success": True, "data": {
+        "correlations": corr_data,
+        "monthly_aggregates": monthly_data.to_dict('records') if monthly_data is not None else None
+    }}, 200
+
 @app.route('/api/analytics/trends', methods=['GET'])
+@cached_read
 def get_trends():
     """Get trend analysis data"""
     try:
-        entries = get_all_entries()
-        if len(entries) < 3:
-            return jsonify({"success": False, "error": "Need at least 3 entries"}), 400
-        
-        import pandas as pd
-        df = pd.DataFrame(entries)
-        df['date'] = pd.to_datetime(df['date'])
-        
-        # Calculate correlations
-        correlation_metrics = ['average_stress', 'sleep_hours', 'sleep_quality', 
-                              'exercise_minutes', 'water_intake', 'wellness_score']
-        
-        corr_data = {}
-        if all(col in df.columns for col in correlation_metrics):
-            corr_matrix = df[correlation_metrics].corr()
-            corr_data = corr_matrix.to_dict()
-        
-        # Monthly aggregates
-        monthly_data = calculate_monthly_aggregates(df) if len(df) >= 14 else None
-        
-        return jsonify({"success": True, "data": {
-            "correlations": corr_data,
-            "monthly_aggregates": monthly_data.to_dict('records') if monthly_data is not None else None
-        }})
+        body, status = memoized('trends', build_trends)
+        return jsonify(body), status
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+def build_comparative_analytics():
+    df = entry_cache.get_frame(columns=[
+        'wellness_score', 'average_stress', 'sleep_hours', 'sleep_quality',
+        'exercise_minutes', 'water_intake', 'on_period'
+    ])
+    if len(df) < 14:
+        return {"success": False, "error": "Need at least 14 entries"}, 400
+    
+    monthly_stats = calculate_monthly_aggregates(df)
+    comparisons = compare_months(df)
+    
+    return {"success": True, "data": {
+        "monthly_stats": monthly_stats.to_dict('records'),
+        "comparisons": comparisons
+    }}, 200
+
 @app.route('/api/analytics/comparative', methods=['GET'])
+@cached_read
 def get_comparative_analytics():
     """Get comparative analytics"""
     try:
-        entries = get_all_entries()
-        if len(entries) < 14:
-            return jsonify({"success": False, "error": "Need at least 14 entries"}), 400
-        
-        import pandas as pd
-        df = pd.DataFrame(entries)
-        df['date'] = pd.to_datetime(df['date'])
-        
-        monthly_stats = calculate_monthly_aggregates(df)
-        comparisons = compare_months(df)
-        
-        return jsonify({"success": True, "data": {
-            "monthly_stats": monthly_stats.to_dict('records'),
-            "comparisons": comparisons
-        }})
+        body, status = memoized('comparative_analytics', build_comparative_analytics)
+        return jsonify(body), status
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 # ==================== Export Endpoints ====================
 
 @app.route('/api/export/csv', methods=['GET'])
+@cached_read
 def export_csv():
-    """Export data as CSV"""
+    """Export data as CSV, streamed from the database in chunks"""
     try:
-        entries = get_all_entries()
-        data = {"entries": entries}
-        
-        csv_data = export_to_csv(data)
-        
-        if csv_data:
-            return csv_data, 200, {
-                'Content-Type': 'text/csv',
-                'Content-Disposition': f'attachment; filename=wellness_data_{datetime.now().strftime("%Y%m%d")}.csv'
-            }
-        else:
+        if not count_entries():
             return jsonify({"success": False, "error": "No data to export"}), 400
+        
+        def generate():
+            # Symptom columns must be known before the header is written; both
+            # reads share one snapshot so a concurrent write cannot add a
+            # symptom the header lacks
+            with read_snapshot() as snapshot:
+                symptom_keys = get_symptom_keys(chunk_size=EXPORT_CHUNK_SIZE, snapshot=snapshot)
+                yield from stream_csv(iter_entry_chunks(chunk_size=EXPORT_CHUNK_SIZE, snapshot=snapshot), symptom_keys)
+        
+        return Response(generate(), headers={
+            'Content-Type': 'text/csv',
+            'Content-Disposition': f'attachment; filename=wellness_data_{datetime.now().strftime("%Y%m%d")}.csv'
+        })
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/export/ndjson', methods=['GET'])
+@cached_read
+def export_ndjson():
+    """Export data as newline-delimited JSON (one entry per line), streamed in chunks"""
+    try:
+        return Response(stream_ndjson(iter_entry_chunks(chunk_size=EXPORT_CHUNK_SIZE), dumps=app.json.dumps), headers={
+            'Content-Type': 'application/x-ndjson',
+            'Content-Disposition': f'attachment; filename=wellness_data_{datetime.now().strftime("%Y%m%d")}.ndjson'
+        })
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/export/json', methods=['GET'])
+@cached_read
 def export_json():
     """Export data as JSON"""
     try:
-        entries = get_all_entries()
-        data = {"entries": entries}
-        
-        json_data = export_to_json(data)
+        json_data = export_to_json({"entries": get_all_entries()})
         
         return json_data, 200, {
             'Content-Type': 'application/json',
@@ -496,14 +774,48 @@ def export_json():
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+def export_columnar_file(fmt):
+    """Parquet/Arrow export of the entries between ?from= and ?to= (inclusive)"""
+    if not PYARROW_AVAILABLE:
+        return jsonify({"success": False, "error": "Parquet/Arrow export requires pyarrow"}), 501
+    try:
+        start = to_entry_date(request.args['from']) if request.args.get('from') else None
+        end = to_entry_date(request.args['to']) if request.args.get('to') else None
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid from/to date (YYYY-MM-DD)"}), 400
+    
+    data = memoized(f'export_{fmt}', lambda: write_entries(load_entries_frame(start=start, end=end), fmt, start, end),
+                    params=(start, end))
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    return Response(data, headers={
+        'Content-Type': mimetype,
+        'Content-Disposition': f'attachment; filename=wellness_data_{datetime.now().strftime("%Y%m%d")}.{extension}'
+    })
+
+@app.route('/api/export/parquet', methods=['GET'])
+@cached_read
+def export_parquet():
+    """Export data as a Parquet file (typed, compressed, symptoms as boolean columns)"""
+    try:
+        return export_columnar_file('parquet')
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/export/arrow', methods=['GET'])
+@cached_read
+def export_arrow():
+    """Export data as an Arrow IPC file (typed, compressed, symptoms as boolean columns)"""
+    try:
+        return export_columnar_file('arrow')
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @app.route('/api/export/summary', methods=['GET'])
+@cached_read
 def export_summary():
     """Generate summary report"""
     try:
-        entries = get_all_entries()
-        data = {"entries": entries}
-        
-        summary = create_summary_report(data)
+        summary = create_summary_report(entry_cache.get_frame())
         
         return summary, 200, {
             'Content-Type': 'text/plain',
@@ -512,6 +824,29 @@ def export_summary():
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+# ==================== Event Stream ====================
+
+@app.route('/api/events', methods=['GET'])
+def event_stream():
+    """
+    Server-sent events: entry_saved, model_trained (with the training job and
+    its metrics) and cache_invalidated. Streams are closed after
+    EVENT_STREAM_SECONDS; EventSource reconnects with Last-Event-ID and
+    missed events are replayed.
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    
+    subscription = event_bus.subscribe(last_event_id=last_event_id)
+    return Response(
+        stream_events(event_bus, subscription, dumps=app.json.dumps, max_seconds=EVENT_STREAM_SECONDS),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 # ==================== ML Model Endpoints ====================
 
 @app.route('/api/ml/predict', methods=['POST'])
@@ -524,18 +859,87 @@ def predict_wellness():
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+PREDICTION_FIELDS = ['wellness_score', 'sentiment_score', 'predicted_energy', 'health_status']
+
+@app.route('/api/ml/predict/batch', methods=['POST'])
+def predict_wellness_batch():
+    """
+    Score many entries at once (re-scoring history, what-if previews); nothing
+    is saved. Body: {"entries": [...]} or a bare list. Entries are scored
+    PREDICT_CHUNK_SIZE at a time; predictions are returned in input order,
+    as row objects or, with ?format=columnar, one array per field.
+    """
+    try:
+        try:
+            columnar = wants_columnar()
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+        payload = request.get_json(silent=True)
+        records = payload.get('entries') if isinstance(payload, dict) else payload
+        if not isinstance(records, list) or not records:
+            return jsonify({"success": False, "error": "Expected a non-empty list of entries"}), 400
+        if len(records) > MAX_PREDICT_ENTRIES:
+            return jsonify({"success": False, "error": f"At most {MAX_PREDICT_ENTRIES} entries per request"}), 413
+        invalid = [index for index, record in enumerate(records) if not isinstance(record, dict)]
+        if invalid:
+            return jsonify({"success": False, "error": "Entries must be objects", "invalid": invalid[:100]}), 400
+        
+        model_version = ml_predictor.model_version
+        columns = {name: [] for name in PREDICTION_FIELDS}
+        for start in range(0, len(records), PREDICT_CHUNK_SIZE):
+            scores = ml_predictor.predict_wellness_batch(records[start:start + PREDICT_CHUNK_SIZE])
+            for name in PREDICTION_FIELDS:
+                columns[name].extend(scores[name].tolist())
+        
+        if columnar:
+            data = columns
+        else:
+            data = [dict(zip(PREDICTION_FIELDS, values)) for values in zip(*columns.values())]
+        return jsonify({"success": True, "format": "columnar" if columnar else "rows", "count": len(records),
+                        "model_version": model_version, "data": data})
+    except Exception as e:
+        import traceback
+        print(f"Error in predict_wellness_batch: {e}")
+        print(traceback.format_exc())
+        return jsonify({"success": False, "error": str(e)}), 500
+
+def model_status(total_entries):
+    """Which models are trained / trainable for a user with total_entries entries"""
+    return {
+        "xgboost_trained": ml_predictor.is_xgb_trained,
+        "lstm_trained": ml_predictor.is_lstm_trained,
+        "total_entries": total_entries,
+        "xgboost_ready": total_entries >= XGB_MIN_ENTRIES,
+        "lstm_ready": total_entries >= LSTM_MIN_ENTRIES,
+        "model_version": ml_predictor.model_version
+    }
+
 @app.route('/api/ml/status', methods=['GET'])
 def ml_status():
     """Get ML model training status"""
     try:
-        entries = get_all_entries()
-        return jsonify({"success": True, "data": {
-            "xgboost_trained": ml_predictor.is_xgb_trained,
-            "lstm_trained": ml_predictor.is_lstm_trained,
-            "total_entries": len(entries),
-            "xgboost_ready": len(entries) >= 10,
-            "lstm_ready": len(entries) >= 7
-        }})
+        status = model_status(count_entries())
+        status["training"] = training_worker.status()
+        status["load_costs"] = ml_predictor.load_costs()
+        return jsonify({"success": True, "data": status})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+# ==================== Diagnostics Endpoints ====================
+
+@app.route('/api/diagnostics/cache', methods=['GET'])
+def cache_diagnostics():
+    """Entry frame and computed result cache counters"""
+    return jsonify({"success": True, "data": {
+        "entry_cache": entry_cache.stats(),
+        "result_cache": result_cache.stats()
+    }})
+
+@app.route('/api/diagnostics/database', methods=['GET'])
+def database_diagnostics():
+    """Active database engine, pool and SQLite pragma settings"""
+    try:
+        return jsonify({"success": True, "data": describe_engine()})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
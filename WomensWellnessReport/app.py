@@ -10,7 +10,7 @@ from ml_models import WellnessPredictor
 from visualizations import create_wellness_dashboard, create_trend_charts
 from recommendations import get_personalized_recommendations
 from reports import generate_weekly_report, generate_monthly_report
-from data_export import display_export_page
+from ui_pages import display_export_page
 from database import init_db
 from db_storage import get_all_entries, save_wellness_entry
 
@@ -317,12 +317,12 @@ def export_data_page():
 
 def cycle_forecast_page():
     """Display menstrual cycle forecast page"""
-    from cycle_prediction import display_cycle_forecast
+    from ui_pages import display_cycle_forecast
     display_cycle_forecast(st.session_state.data, st.session_state.ml_predictor)
 
 def trends_page():
     """Display trend analysis and charts"""
-    from comparative_analytics import display_comparative_analytics
+    from ui_pages import display_comparative_analytics
     
     st.markdown('<p class="sub-header">Trends & Analytics</p>', unsafe_allow_html=True)
     
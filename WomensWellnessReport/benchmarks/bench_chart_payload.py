@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark the dashboard chart payload builder against the previous
+row-by-row implementation.
+
+    python benchmarks/bench_chart_payload.py [rows ...]
+
+Defaults to 1k, 10k and 100k synthetic entries. Also checks that both
+builders produce identical payloads.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chart_data import build_chart_payload  # noqa: E402
+
+
+def legacy_chart_payload(df):
+    """The iterrows builder GET /api/dashboard/charts used before"""
+    def safe_float(value, default=0):
+        try:
+            return float(value) if value is not None else default
+        except (ValueError, TypeError):
+            return default
+
+    def safe_int(value, default=0):
+        try:
+            return int(value) if value is not None else default
+        except (ValueError, TypeError):
+            return default
+
+    return {
+        "wellness_scores": [{"date": str(row['date']), "score": safe_float(row.get('wellness_score', 0))}
+                            for _, row in df.iterrows()] if 'wellness_score' in df.columns else [],
+        "stress_levels": [{
+            "date": str(row['date']),
+            "morning": safe_float(row.get('stress_morning', row.get('morning_stress', 0))),
+            "afternoon": safe_float(row.get('stress_afternoon', row.get('afternoon_stress', 0))),
+            "night": safe_float(row.get('stress_night', row.get('night_stress', 0)))
+        } for _, row in df.iterrows()],
+        "sleep_data": [{
+            "date": str(row['date']),
+            "hours": safe_float(row.get('sleep_hours', 0)),
+            "quality": safe_float(row.get('sleep_quality', 0))
+        } for _, row in df.iterrows()],
+        "exercise_data": [{"date": str(row['date']), "minutes": safe_int(row.get('exercise_minutes', 0))}
+                          for _, row in df.iterrows()],
+        "water_data": [{"date": str(row['date']), "intake": safe_int(row.get('water_intake', 0))}
+                       for _, row in df.iterrows()]
+    }
+
+
+def make_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'date': pd.date_range('1900-01-01', periods=rows, freq='D'),
+        'wellness_score': rng.uniform(0, 100, rows).round(1),
+        'stress_morning': rng.integers(1, 11, rows).astype(float),
+        'stress_afternoon': rng.integers(1, 11, rows).astype(float),
+        'stress_night': rng.integers(1, 11, rows).astype(float),
+        'sleep_hours': rng.uniform(4, 10, rows).round(1),
+        'sleep_quality': rng.integers(1, 11, rows).astype(float),
+        'exercise_minutes': rng.integers(0, 120, rows).astype(float),
+        'water_intake': rng.integers(500, 4000, rows).astype(float),
+    })
+
+
+def best_of(func, df, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(df)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'legacy (s)':>12} {'vectorized (s)':>15} {'speedup':>8}")
+    for rows in sizes:
+        df = make_frame(rows)
+        legacy_time, legacy = best_of(legacy_chart_payload, df, repeat=1 if rows >= 100000 else 3)
+        new_time, new = best_of(build_chart_payload, df, repeat=3)
+        assert legacy == new, f"payloads differ at {rows} rows"
+        print(f"{rows:>8} {legacy_time:>12.3f} {new_time:>15.4f} {legacy_time / new_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
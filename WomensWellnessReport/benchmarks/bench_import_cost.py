@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark API cold start: wall time and resident memory of importing the
+compute modules the API server uses, and of importing api_server itself,
+each in a fresh interpreter. Also reports which UI/ML libraries the import
+pulled in.
+
+    python benchmarks/bench_import_cost.py [runs]
+
+api_server is imported against a temporary SQLite database and working
+directory, so the repository's database and saved models are not touched.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    'compute modules': ['comparative_analytics', 'cycle_prediction', 'data_export', 'reports', 'recommendations'],
+    'api_server': ['api_server'],
+}
+WATCHED = ['streamlit', 'plotly', 'tensorflow', 'xgboost', 'textblob', 'sklearn']
+
+PROBE = """
+import importlib, json, sys, time
+
+def rss_kb():
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+
+before = rss_kb()
+started = time.perf_counter()
+for name in {modules!r}:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    'seconds': elapsed,
+    'rss_mb': (rss_kb() - before) / 1024,
+    'loaded': [name for name in {watched!r} if name in sys.modules]
+}}))
+"""
+
+
+def probe(modules):
+    work_dir = tempfile.mkdtemp()
+    env = dict(os.environ, PYTHONPATH=ROOT, DATABASE_URL=f"sqlite:///{os.path.join(work_dir, 'bench.db')}")
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE.format(modules=modules, watched=WATCHED)],
+        cwd=work_dir, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    for label, modules in TARGETS.items():
+        results = [probe(modules) for _ in range(runs)]
+        seconds = statistics.median(result['seconds'] for result in results)
+        rss = statistics.median(result['rss_mb'] for result in results)
+        loaded = ', '.join(results[-1]['loaded']) or 'none'
+        print(f"{label:16s} import {seconds * 1000:7.0f} ms   RSS +{rss:6.1f} MB   loaded: {loaded}")
+
+
+if __name__ == '__main__':
+    main()
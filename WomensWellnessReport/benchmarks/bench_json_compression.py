@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark response encoding for the main read endpoints: JSON encode time
+with Flask's default provider vs the orjson provider, and body size raw,
+gzip and brotli.
+
+    python benchmarks/bench_json_compression.py [entries]
+
+Runs against a temporary SQLite database filled with synthetic entries
+(default: three years of daily entries).
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+WORK_DIR = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(WORK_DIR, 'bench.db')}"
+os.chdir(WORK_DIR)  # the predictor saves its models relative to the working directory
+
+import database  # noqa: E402
+from db_storage import bulk_upsert_entries  # noqa: E402
+
+ENDPOINTS = [
+    '/api/entries', '/api/entries?format=columnar', '/api/dashboard/stats', '/api/dashboard/charts',
+    '/api/reports/weekly', '/api/reports/monthly', '/api/recommendations',
+    '/api/analytics/trends', '/api/analytics/comparative'
+]
+
+
+def seed(count, seed=0):
+    rng = np.random.default_rng(seed)
+    start = date.today() - timedelta(days=count)
+    rows = []
+    for day in range(count):
+        stress = rng.integers(1, 11, 3)
+        rows.append((day, {
+            'date': start + timedelta(days=day),
+            'timestamp': datetime.combine(start + timedelta(days=day), datetime.min.time()),
+            'breakfast': 'oatmeal with berries', 'lunch': 'salad', 'dinner': 'rice and vegetables',
+            'stress_morning': float(stress[0]), 'stress_afternoon': float(stress[1]),
+            'stress_night': float(stress[2]), 'average_stress': float(stress.mean()),
+            'exercise_minutes': int(rng.integers(0, 90)), 'water_intake': int(rng.integers(800, 3500)),
+            'sleep_hours': round(float(rng.uniform(5, 9)), 1), 'sleep_quality': float(rng.integers(3, 11)),
+            'on_period': day % 28 < 5, 'symptoms': {'cramping': day % 28 < 3, 'fatigue': bool(day % 5 == 0)},
+            'additional_notes': 'Felt fine today, a little tired in the afternoon.',
+            'wellness_score': round(float(rng.uniform(40, 90)), 1), 'sentiment_score': 0.1, 'predicted_energy': 60.0
+        }))
+    bulk_upsert_entries(rows)
+
+
+def capture_payloads(app, client):
+    """The objects each endpoint hands to the JSON provider"""
+    payloads = {}
+    provider = app.json
+    original = provider.response
+
+    def capturing_response(*args, **kwargs):
+        payloads[current] = provider._prepare_response_obj(args, kwargs)
+        return original(*args, **kwargs)
+
+    provider.response = capturing_response
+    for current in ENDPOINTS:
+        status = client.get(current).status_code
+        if status != 200:
+            print(f"warning: {current} returned {status}")
+    provider.response = original
+    return payloads
+
+
+def best_of(func, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(count):
+    database.init_db()
+    seed(count)
+
+    from flask.json.provider import DefaultJSONProvider
+    import api_server
+    from compression import compress_body, BROTLI_AVAILABLE
+    from json_provider import ORJSON_AVAILABLE
+
+    app = api_server.app
+    payloads = capture_payloads(app, app.test_client())
+    default_provider = DefaultJSONProvider(app)
+
+    print(f"{count} entries; orjson={'yes' if ORJSON_AVAILABLE else 'no'}, brotli={'yes' if BROTLI_AVAILABLE else 'no'}")
+    print(f"{'endpoint':<32} {'default ms':>10} {'orjson ms':>10} {'raw KB':>8} {'gzip KB':>8} {'br KB':>8}")
+    for endpoint, obj in payloads.items():
+        try:
+            default_ms = best_of(lambda: default_provider.dumps(obj)) * 1000
+            default_cell = f"{default_ms:>10.2f}"
+        except (TypeError, ValueError):
+            default_cell = f"{'error':>10}"  # not encodable by the stdlib provider
+        body = app.json.dumps(obj).encode()
+        new_ms = best_of(lambda: app.json.dumps(obj)) * 1000
+        gzip_kb = len(compress_body(body, 'gzip')) / 1024
+        br_kb = f"{len(compress_body(body, 'br')) / 1024:>8.1f}" if BROTLI_AVAILABLE else f"{'-':>8}"
+        print(f"{endpoint:<32} {default_cell} {new_ms:>10.2f} {len(body) / 1024:>8.1f} {gzip_kb:>8.1f} {br_kb}")
+
+    api_server.training_worker._queue.join()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3 * 365)
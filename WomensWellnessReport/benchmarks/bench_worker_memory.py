@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark server memory against the number of gunicorn workers, with and
+without preload_app (gunicorn.conf.py). Boots the server, calls /api/ready
+until every worker has loaded its models, then sums the proportional set
+size (PSS: shared pages split between the processes sharing them) of the
+master and its workers.
+
+    python benchmarks/bench_worker_memory.py [max_workers]
+
+The server runs against a copy of wellness.db and ml_models_saved in a
+temporary directory, so the repository's database and models are not touched.
+"""
+
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SETTLE_SECONDS = 5
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def pss_mb(pid):
+    with open(f'/proc/{pid}/smaps_rollup') as rollup:
+        for line in rollup:
+            if line.startswith('Pss:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def children(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as listing:
+        return [int(child) for child in listing.read().split()]
+
+
+def wait_ready(url, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=30) as response:
+                return response.status == 200
+        except OSError:
+            time.sleep(0.5)
+    return False
+
+
+def measure(workers, preload):
+    work_dir = tempfile.mkdtemp()
+    if os.path.exists(os.path.join(ROOT, 'wellness.db')):
+        shutil.copy(os.path.join(ROOT, 'wellness.db'), work_dir)
+    if os.path.isdir(os.path.join(ROOT, 'ml_models_saved')):
+        shutil.copytree(os.path.join(ROOT, 'ml_models_saved'), os.path.join(work_dir, 'ml_models_saved'))
+    port = free_port()
+    env = dict(
+        os.environ, PYTHONPATH=ROOT, PORT=str(port), WEB_CONCURRENCY=str(workers),
+        PRELOAD_APP='1' if preload else '0',
+        DATABASE_URL=f"sqlite:///{os.path.join(work_dir, 'wellness.db')}"
+    )
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', os.path.join(ROOT, 'gunicorn.conf.py'), 'api_server:app'],
+        cwd=work_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        url = f'http://127.0.0.1:{port}/api/ready'
+        if not wait_ready(url):
+            raise RuntimeError("server did not become ready")
+        # Requests are spread over the workers; enough calls reach every one
+        for _ in range(workers * 4):
+            wait_ready(url)
+        time.sleep(SETTLE_SECONDS)
+        worker_pids = children(server.pid)
+        return pss_mb(server.pid), sum(pss_mb(pid) for pid in worker_pids)
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    for preload in (False, True):
+        for workers in sorted({1, 2, max_workers}):
+            master, total_workers = measure(workers, preload)
+            total = master + total_workers
+            print(f"preload={'on ' if preload else 'off'} workers={workers}   "
+                  f"PSS master {master:6.1f} MB   workers {total_workers:6.1f} MB   "
+                  f"total {total:6.1f} MB   per worker {total_workers / workers:6.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
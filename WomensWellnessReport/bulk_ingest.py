@@ -0,0 +1,176 @@
+"""
+Bulk entry ingestion for POST /api/entries/bulk.
+
+Applies the same normalisation as POST /api/entries (form field aliases,
+numeric coercion, average stress, ML scores) to a whole batch at once: fields
+are coerced column by column with pandas, the batch is scored with a single
+WellnessPredictor.predict_wellness_batch call and written with set-based
+upserts. Problems are reported per row; valid rows are saved regardless.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from db_storage import bulk_upsert_entries, ENTRY_WRITE_COLUMNS
+
+# Form field name -> database column
+FIELD_ALIASES = {
+    'morning_stress': 'stress_morning',
+    'afternoon_stress': 'stress_afternoon',
+    'night_stress': 'stress_night'
+}
+NUMERIC_FIELDS = [
+    'stress_morning', 'stress_afternoon', 'stress_night', 'average_stress',
+    'exercise_minutes', 'water_intake', 'sleep_hours', 'sleep_quality', 'period_day'
+]
+INTEGER_FIELDS = ['exercise_minutes', 'water_intake', 'period_day']
+SCORE_FIELDS = ['wellness_score', 'sentiment_score', 'predicted_energy']
+
+
+def _provided(df, column):
+    """Mask of rows that supplied a (non-null) value for column"""
+    if column not in df.columns:
+        return pd.Series(False, index=df.index)
+    return df[column].notna()
+
+
+def validate_entries(records):
+    """
+    Normalise a list of raw entry dicts.
+
+    Returns (frame, provided, errors): the cleaned frame of valid rows (index =
+    position in records), a same-shaped boolean frame telling which fields
+    each row actually supplied, and a list of (index, message) for rejected
+    rows. When a date appears more than once the last occurrence wins.
+    """
+    errors = []
+    if not records:
+        return pd.DataFrame(), pd.DataFrame(), errors
+
+    raw = pd.DataFrame.from_records(
+        [record if isinstance(record, dict) else {} for record in records],
+        index=pd.RangeIndex(len(records))
+    )
+    for index, record in enumerate(records):
+        if not isinstance(record, dict):
+            errors.append((index, "Entry must be a JSON object"))
+
+    # Form field names fill the database column when it was not given directly
+    for form_field, db_field in FIELD_ALIASES.items():
+        if form_field in raw.columns:
+            if db_field in raw.columns:
+                raw[db_field] = raw[db_field].where(raw[db_field].notna(), raw[form_field])
+            else:
+                raw[db_field] = raw[form_field]
+
+    df = raw[[col for col in raw.columns if col in ENTRY_WRITE_COLUMNS]].copy()
+    provided = df.notna()
+    valid = pd.Series(True, index=df.index)
+    valid[[index for index, _ in errors]] = False
+
+    # Dates: required, ISO formatted
+    if 'date' in df.columns:
+        # Same leniency as db_storage.to_entry_date: the first ten characters must be an ISO date
+        dates = pd.to_datetime(df['date'].astype('string').str.slice(0, 10), format='%Y-%m-%d', errors='coerce')
+    else:
+        dates = pd.Series(pd.NaT, index=df.index)
+    bad_date = valid & dates.isna()
+    errors.extend((index, "Missing or invalid date (expected YYYY-MM-DD)") for index in df.index[bad_date])
+    valid &= ~bad_date
+    df['date'] = dates.dt.date
+
+    # Numeric fields: unlike the single-entry form, a non-numeric value rejects the row
+    for field in NUMERIC_FIELDS:
+        if field not in df.columns:
+            continue
+        values = pd.to_numeric(df[field], errors='coerce')
+        bad = valid & provided[field] & values.isna()
+        errors.extend((index, f"{field} must be a number") for index in df.index[bad])
+        valid &= ~bad
+        if field in INTEGER_FIELDS:
+            values = values.round()
+        df[field] = values
+
+    if 'on_period' in df.columns:
+        df['on_period'] = df['on_period'].map(bool, na_action='ignore')
+
+    # Average stress, when all three readings are present
+    if all(field in df.columns for field in ('stress_morning', 'stress_afternoon', 'stress_night')):
+        stress = df[['stress_morning', 'stress_afternoon', 'stress_night']]
+        complete = stress.notna().all(axis=1)
+        df['average_stress'] = stress.mean(axis=1).where(complete, df.get('average_stress'))
+        provided['average_stress'] = _provided(df, 'average_stress')
+
+    # Timestamps: parse when given, otherwise the time of ingestion
+    now = datetime.now()
+    if 'timestamp' in df.columns:
+        df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce', format='ISO8601')
+        df['timestamp'] = df['timestamp'].where(df['timestamp'].notna(), pd.Timestamp(now))
+    else:
+        df['timestamp'] = pd.Timestamp(now)
+    provided['timestamp'] = True
+
+    # Last entry for a date wins, as it would with sequential single saves
+    duplicate = valid & df['date'].where(valid).duplicated(keep='last')
+    errors.extend((index, "Superseded by a later entry for the same date") for index in df.index[duplicate])
+    valid &= ~duplicate
+
+    errors.sort(key=lambda item: item[0])
+    return df[valid], provided[valid], errors
+
+
+def _row_values(row, supplied):
+    """Database values for one validated row, limited to the fields it supplied"""
+    values = {}
+    for field, value in row.items():
+        if not supplied.get(field, False):
+            continue
+        if isinstance(value, pd.Timestamp):
+            value = value.to_pydatetime()
+        elif isinstance(value, np.generic):
+            value = value.item()
+        if field in INTEGER_FIELDS and value is not None:
+            value = int(value)
+        values[field] = value
+    return values
+
+
+def ingest_entries(records, predictor, user_id='default_user', chunk_size=500):
+    """
+    Validate, score and upsert a batch of entries.
+    Returns {"received", "saved", "failed", "errors": [{"index", "error"}],
+    "dates"}, dates being the normalised (YYYY-MM-DD) dates of the saved rows.
+    """
+    df, provided, errors = validate_entries(records)
+
+    if len(df):
+        try:
+            scores = predictor.predict_wellness_batch(df)
+        except Exception as e:
+            print(f"ML batch prediction error: {e}")
+            scores = pd.DataFrame(0.0, index=df.index, columns=SCORE_FIELDS)
+        for field in SCORE_FIELDS:
+            df[field] = scores[field]
+            provided[field] = True
+
+    rows = [
+        (index, _row_values(row, supplied))
+        for index, row, supplied in zip(
+            df.index,
+            df.astype(object).where(df.notna(), None).to_dict('records'),
+            provided.to_dict('records')
+        )
+    ]
+    saved, write_errors = bulk_upsert_entries(rows, user_id=user_id, chunk_size=chunk_size) if rows else (0, [])
+    unsaved = {index for index, _ in write_errors}
+    errors = sorted(errors + write_errors, key=lambda item: item[0])
+
+    return {
+        "received": len(records),
+        "saved": saved,
+        "failed": len(errors),
+        "errors": [{"index": index, "error": message} for index, message in errors],
+        "dates": [values['date'].isoformat() for index, values in rows if index not in unsaved]
+    }
@@ -0,0 +1,83 @@
+"""
+Dashboard chart payloads built from an entries frame.
+
+Each metric column is coerced once (missing or unparseable values become 0)
+and every series is emitted from those arrays, instead of walking the frame
+row by row once per series. build_chart_columns sends the arrays as they are
+(?format=columnar): one date list shared by all charts and one list per metric.
+"""
+
+import pandas as pd
+
+# Columns GET /api/dashboard/charts reads
+CHART_COLUMNS = [
+    'wellness_score', 'stress_morning', 'stress_afternoon', 'stress_night',
+    'sleep_hours', 'sleep_quality', 'exercise_minutes', 'water_intake'
+]
+# Charted as whole numbers
+INT_CHART_COLUMNS = ['exercise_minutes', 'water_intake']
+
+
+def _floats(df, name):
+    if name not in df.columns:
+        return [0.0] * len(df)
+    return pd.to_numeric(df[name], errors='coerce').fillna(0).astype(float).tolist()
+
+
+def _ints(df, name):
+    """Whole numbers, truncated toward zero like int()"""
+    if name not in df.columns:
+        return [0] * len(df)
+    return pd.to_numeric(df[name], errors='coerce').fillna(0).astype('int64').tolist()
+
+
+def _chart_dates(df):
+    # Dates render as str(Timestamp), which the frontend already parses
+    return pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d %H:%M:%S').tolist()
+
+
+def build_chart_payload(df):
+    """Chart series for the dashboard from an entries frame sorted by date"""
+    if df.empty:
+        return {
+            "wellness_scores": [],
+            "stress_levels": [],
+            "sleep_data": [],
+            "exercise_data": [],
+            "water_data": []
+        }
+
+    dates = _chart_dates(df)
+
+    morning = _floats(df, 'stress_morning')
+    afternoon = _floats(df, 'stress_afternoon')
+    night = _floats(df, 'stress_night')
+    hours = _floats(df, 'sleep_hours')
+    quality = _floats(df, 'sleep_quality')
+
+    return {
+        "wellness_scores": [
+            {"date": d, "score": s} for d, s in zip(dates, _floats(df, 'wellness_score'))
+        ] if 'wellness_score' in df.columns else [],
+        "stress_levels": [
+            {"date": d, "morning": m, "afternoon": a, "night": n}
+            for d, m, a, n in zip(dates, morning, afternoon, night)
+        ],
+        "sleep_data": [
+            {"date": d, "hours": h, "quality": q} for d, h, q in zip(dates, hours, quality)
+        ],
+        "exercise_data": [
+            {"date": d, "minutes": m} for d, m in zip(dates, _ints(df, 'exercise_minutes'))
+        ],
+        "water_data": [
+            {"date": d, "intake": i} for d, i in zip(dates, _ints(df, 'water_intake'))
+        ]
+    }
+
+
+def build_chart_columns(df):
+    """Columnar chart payload: {"date": [YYYY-MM-DD...], <metric>: [...] for CHART_COLUMNS}"""
+    columns = {"date": pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d').tolist() if not df.empty else []}
+    for name in CHART_COLUMNS:
+        columns[name] = _ints(df, name) if name in INT_CHART_COLUMNS else _floats(df, name)
+    return columns
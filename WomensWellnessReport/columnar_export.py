@@ -0,0 +1,83 @@
+"""
+Parquet and Arrow IPC exports for analytics consumers.
+
+Entries are read with db_storage.load_entries_frame at full float64
+precision (float32 would turn a stored 89.53 into 89.529999), symptoms
+are expanded into one boolean
+symptom_<name> column each, and the frame is written as a typed,
+zstd-compressed file: dates as date32, timestamps as timestamp[us].
+Requires pyarrow; PYARROW_AVAILABLE tells whether these formats are offered.
+"""
+
+import io
+
+from data_export import flatten_symptoms
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+COMPRESSION = 'zstd'
+
+# format -> (mimetype, file extension)
+EXPORT_FORMATS = {
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.file', 'arrow')
+}
+
+
+def expand_symptoms(df):
+    """Replace the symptoms dicts with boolean symptom_<name> columns (False when not recorded)"""
+    flat = flatten_symptoms(df)
+    for col in flat.columns:
+        if col.startswith('symptom_'):
+            flat[col] = flat[col].fillna(False).astype(bool)
+    return flat
+
+
+def entries_table(df, start=None, end=None):
+    """
+    Arrow table for an entries frame, with the export range in the schema
+    metadata. Nothing time-dependent goes in, so the same entries always
+    give the same bytes (the API caches them per data version).
+    """
+    table = pa.Table.from_pandas(expand_symptoms(df), preserve_index=False)
+    for name, arrow_type in (('date', pa.date32()), ('timestamp', pa.timestamp('us'))):
+        if name in table.column_names:
+            index = table.column_names.index(name)
+            table = table.set_column(index, name, table[name].cast(arrow_type))
+    metadata = {
+        'from': start.isoformat() if start else '',
+        'to': end.isoformat() if end else ''
+    }
+    return table.replace_schema_metadata({**(table.schema.metadata or {}), **metadata})
+
+
+def write_entries(df, fmt, start=None, end=None):
+    """Serialize an entries frame as a Parquet or Arrow IPC file; returns the bytes"""
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("Parquet/Arrow export requires pyarrow")
+    table = entries_table(df, start, end)
+    sink = io.BytesIO()
+    if fmt == 'parquet':
+        pq.write_table(table, sink, compression=COMPRESSION)
+    elif fmt == 'arrow':
+        options = pa.ipc.IpcWriteOptions(compression=COMPRESSION)
+        with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return sink.getvalue()
+
+
+def read_entries(data, fmt):
+    """Load an exported file back into a DataFrame (for consumers and tests)"""
+    if fmt == 'parquet':
+        return pq.read_table(io.BytesIO(data)).to_pandas()
+    with pa.ipc.open_file(pa.BufferReader(data)) as reader:
+        return reader.read_all().to_pandas()
@@ -0,0 +1,67 @@
+"""
+gzip / brotli compression of API responses.
+
+Text responses (JSON, HTML, CSV, plain text) of at least
+COMPRESS_MIN_SIZE bytes are compressed with the best encoding the client
+accepts: brotli when the brotli package is installed, else gzip. Smaller
+bodies go out as they are, since the framing overhead outweighs the saving.
+Streamed and file passthrough responses are left alone.
+"""
+
+import gzip
+import os
+
+from flask import request
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4  # fast settings for dynamic content
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'text/html', 'text/plain', 'text/csv', 'application/x-ndjson'
+}
+
+
+def available_encodings():
+    return ['br', 'gzip'] if BROTLI_AVAILABLE else ['gzip']
+
+
+def compress_body(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def init_compression(app, min_size=None):
+    """Compress eligible responses of a Flask app according to Accept-Encoding"""
+    threshold = COMPRESS_MIN_SIZE if min_size is None else min_size
+
+    @app.after_request
+    def compress_response(response):
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES and response.status_code != 304:
+            return response
+        response.vary.add('Accept-Encoding')
+
+        if (not 200 <= response.status_code < 300 or response.status_code == 204
+                or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        encoding = request.accept_encodings.best_match(available_encodings())
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if len(data) < threshold:
+            return response
+
+        response.set_data(compress_body(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    return compress_response
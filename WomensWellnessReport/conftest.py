@@ -0,0 +1,62 @@
+import os
+import tempfile
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+# Before any app module is imported: no test may touch the repository's
+# wellness.db (or a DATABASE_URL from the environment), and importing
+# api_server must not start the startup retrain
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='wellness-tests-'), 'wellness.db')}"
+os.environ['WELLNESS_PRELOAD'] = '1'
+
+import database
+
+
+def _make_entries(count):
+    return [{
+        'date': f'2025-01-{day + 1:02d}',
+        'average_stress': 3 + day % 5,
+        'exercise_minutes': 10 * (day % 4),
+        'water_intake': 1500 + 100 * day,
+        'sleep_hours': 6 + day % 3,
+        'sleep_quality': 5 + day % 4,
+        'symptoms': {'cramping': day % 2 == 0},
+        'on_period': day < 4,
+        'wellness_score': 50 + day
+    } for day in range(count)]
+
+
+@pytest.fixture
+def make_entries():
+    """make_entries(count): count varied synthetic entries, enough to train on from 12"""
+    return _make_entries
+
+
+@pytest.fixture(autouse=True)
+def isolated_cwd(tmp_path, monkeypatch):
+    """Run every test in its own directory, so saved models land there and not in ml_models_saved"""
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Point the storage layer at an empty SQLite database for one test"""
+    engine = database.create_db_engine(f"sqlite:///{tmp_path / 'wellness_test.db'}")
+    monkeypatch.setattr(database, 'engine', engine)
+    monkeypatch.setattr(database, 'SessionLocal', sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    database.init_db()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def api_client(temp_db, monkeypatch):
+    """Test client of the API server on the temporary database, with empty caches"""
+    # Imported only once temp_db has replaced the engine
+    import api_server
+    # No retraining: models published mid-test would change predictions and ETags
+    monkeypatch.setattr(api_server.training_worker, 'notify_entry_count', lambda entry_count, user_id='default_user': False)
+    api_server.entry_cache.invalidate()
+    api_server.result_cache.invalidate()
+    return api_server.app.test_client()
@@ -1,33 +1,89 @@
+"""
+CSV, NDJSON, JSON and text summary exports of wellness entries. Pure
+computation: the Streamlit export page is ui_pages.display_export_page.
+"""
+
 import pandas as pd
 import json
-# Streamlit is optional in API runtime
-try:
-    import streamlit as st  # type: ignore
-except Exception:
-    st = None  # type: ignore
 from datetime import datetime
 import io
 
+from entry_frame import as_entries_frame, format_entry_date, frame_to_records, integers_restored, STRESS_ALIASES
+
 def export_to_csv(data):
-    """Export wellness data to CSV format"""
-    if not data or 'entries' not in data or len(data['entries']) == 0:
+    """Export wellness data (entries frame or {'entries': [...]}) to CSV format"""
+    df = as_entries_frame(data)
+    if df is None or len(df) == 0:
         return None
     
-    df = pd.DataFrame(data['entries'])
-    
-    # Flatten symptoms dictionary
-    if 'symptoms' in df.columns:
-        symptoms_df = df['symptoms'].apply(lambda x: pd.Series(x) if isinstance(x, dict) else pd.Series())
-        symptoms_df.columns = [f'symptom_{col}' for col in symptoms_df.columns]
-        df = pd.concat([df.drop('symptoms', axis=1), symptoms_df], axis=1)
-    
     # Convert to CSV
     csv_buffer = io.StringIO()
-    df.to_csv(csv_buffer, index=False)
+    _csv_chunk(df, None).to_csv(csv_buffer, index=False)
     return csv_buffer.getvalue()
 
+def flatten_symptoms(df, keys=None):
+    """
+    Replace the symptoms dict column with one symptom_<name> column per
+    symptom, built in a single from_records call. keys fixes the symptom
+    columns (and their order); by default every symptom present is used.
+    """
+    if 'symptoms' not in df.columns:
+        return df
+    symptoms_df = pd.DataFrame.from_records(
+        [value if isinstance(value, dict) else {} for value in df['symptoms']],
+        index=df.index, columns=keys
+    )
+    symptoms_df.columns = [f'symptom_{col}' for col in symptoms_df.columns]
+    return pd.concat([df.drop('symptoms', axis=1), symptoms_df], axis=1)
+
+def _csv_chunk(df, symptom_keys):
+    """
+    Entries frame as written to CSV, in the layout of the entry dicts the
+    export was first built from: symptoms flattened, dates as text, integer
+    metrics as integers and the frontend stress aliases after stress_night.
+    """
+    out = flatten_symptoms(df, symptom_keys)
+    if out is df:
+        out = df.copy()
+    integers_restored(out)
+    # Formatted per value rather than per column, so every chunk renders
+    # dates the same way (to_csv picks one format from all values in a column,
+    # e.g. padding every timestamp with .000000 if one has microseconds)
+    if 'date' in out.columns:
+        out['date'] = out['date'].dt.strftime('%Y-%m-%d')
+    if 'timestamp' in out.columns:
+        stamps = out['timestamp'].map(lambda ts: ts.isoformat(), na_action='ignore')
+        # Entries without a timestamp show their date instead
+        out['timestamp'] = stamps.where(stamps.notna(), out.get('date'))
+    if 'stress_night' in out.columns:
+        position = out.columns.get_loc('stress_night') + 1
+        for column, alias in STRESS_ALIASES.items():
+            if column in out.columns and alias not in out.columns:
+                out.insert(position, alias, out[column])
+                position += 1
+    return out
+
+def stream_csv(chunks, symptom_keys):
+    """
+    Yield CSV text for an iterable of entries frames (see
+    db_storage.iter_entry_chunks): the header with the first chunk, then one
+    block per chunk. symptom_keys fixes the symptom columns across chunks.
+    """
+    symptom_keys = list(symptom_keys)
+    header = True
+    for df in chunks:
+        yield _csv_chunk(df, symptom_keys).to_csv(index=False, header=header)
+        header = False
+
+def stream_ndjson(chunks, dumps=json.dumps):
+    """Yield newline-delimited JSON, one entry per line, for an iterable of entries frames"""
+    for df in chunks:
+        yield ''.join(dumps(record) + '\n' for record in frame_to_records(df))
+
 def export_to_json(data):
-    """Export wellness data to JSON format"""
+    """Export wellness data (entries frame or {'entries': [...]}) to JSON format"""
+    if isinstance(data, pd.DataFrame):
+        data = {'entries': frame_to_records(data)}
     if not data:
         return None
     
@@ -41,19 +97,18 @@ def export_to_json(data):
     return json.dumps(export_data, indent=2)
 
 def create_summary_report(data):
-    """Create a text summary report of wellness data"""
-    if not data or 'entries' not in data or len(data['entries']) == 0:
+    """Create a text summary report of wellness data (entries frame or {'entries': [...]})"""
+    df = as_entries_frame(data)
+    if df is None or len(df) == 0:
         return "No data available for summary report."
     
-    df = pd.DataFrame(data['entries'])
-    
     report = []
     report.append("=" * 60)
     report.append("WOMEN'S WELLNESS TRACKER - DATA SUMMARY")
     report.append("=" * 60)
     report.append(f"\nExport Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     report.append(f"Total Entries: {len(df)}")
-    report.append(f"Date Range: {df['date'].min()} to {df['date'].max()}")
+    report.append(f"Date Range: {format_entry_date(df['date'].min())} to {format_entry_date(df['date'].max())}")
     
     # Overall statistics
     report.append("\n" + "-" * 60)
@@ -112,7 +167,7 @@ def create_summary_report(data):
         report.append("\n" + "-" * 60)
         report.append("BEST DAY")
         report.append("-" * 60)
-        report.append(f"Date: {best_day['date']}")
+        report.append(f"Date: {format_entry_date(best_day['date'])}")
         report.append(f"Wellness Score: {best_day['wellness_score']:.1f}")
         report.append(f"Sleep: {best_day['sleep_hours']:.1f}h (Quality: {best_day['sleep_quality']}/10)")
         report.append(f"Exercise: {best_day['exercise_minutes']:.0f} minutes")
@@ -121,7 +176,7 @@ def create_summary_report(data):
         report.append("\n" + "-" * 60)
         report.append("MOST CHALLENGING DAY")
         report.append("-" * 60)
-        report.append(f"Date: {worst_day['date']}")
+        report.append(f"Date: {format_entry_date(worst_day['date'])}")
         report.append(f"Wellness Score: {worst_day['wellness_score']:.1f}")
         report.append(f"Sleep: {worst_day['sleep_hours']:.1f}h (Quality: {worst_day['sleep_quality']}/10)")
         report.append(f"Stress: {worst_day['average_stress']:.1f}/10")
@@ -131,102 +186,3 @@ def create_summary_report(data):
     report.append("=" * 60)
     
     return "\n".join(report)
-
-def display_export_page(data):
-    """Display the data export page in Streamlit (no-op if Streamlit absent)"""
-    if st is None:
-        return
-    st.markdown('<p class="sub-header">📥 Export Your Wellness Data</p>', unsafe_allow_html=True)
-    
-    if not data or 'entries' not in data or len(data['entries']) == 0:
-        st.info("📝 No data available to export. Start by adding some daily entries!")
-        return
-    
-    total_entries = len(data['entries'])
-    
-    st.markdown(f"""
-    <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 20px; border-radius: 15px; color: white; margin-bottom: 20px;">
-        <h3>📊 Export Your Health Records</h3>
-        <p>Download your complete wellness data for personal records or to share with healthcare providers.</p>
-        <p><strong>Total Entries:</strong> {total_entries}</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Export options
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("### 📄 CSV Export")
-        st.write("Download your data in spreadsheet format - perfect for Excel, Google Sheets, or data analysis.")
-        
-        csv_data = export_to_csv(data)
-        if csv_data:
-            st.download_button(
-                label="⬇️ Download CSV",
-                data=csv_data,
-                file_name=f"wellness_data_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
-    
-    with col2:
-        st.markdown("### 📋 JSON Export")
-        st.write("Download your data in JSON format - ideal for backups or importing into other applications.")
-        
-        json_data = export_to_json(data)
-        if json_data:
-            st.download_button(
-                label="⬇️ Download JSON",
-                data=json_data,
-                file_name=f"wellness_data_{datetime.now().strftime('%Y%m%d')}.json",
-                mime="application/json",
-                use_container_width=True
-            )
-    
-    st.markdown("---")
-    
-    # Summary report
-    st.markdown("### 📊 Summary Report")
-    st.write("Generate a text-based summary of your wellness journey.")
-    
-    if st.button("📄 Generate Summary Report", use_container_width=True):
-        summary = create_summary_report(data)
-        
-        st.text_area(
-            "Your Wellness Summary",
-            value=summary,
-            height=400,
-            disabled=True
-        )
-        
-        st.download_button(
-            label="⬇️ Download Summary Report",
-            data=summary,
-            file_name=f"wellness_summary_{datetime.now().strftime('%Y%m%d')}.txt",
-            mime="text/plain",
-            use_container_width=True
-        )
-    
-    # Data preview
-    st.markdown("---")
-    st.markdown("### 👁️ Data Preview")
-    
-    df = pd.DataFrame(data['entries'])
-    
-    # Show basic preview
-    preview_columns = ['date', 'wellness_score', 'average_stress', 'sleep_hours', 
-                      'exercise_minutes', 'water_intake', 'on_period']
-    
-    available_columns = [col for col in preview_columns if col in df.columns]
-    
-    if available_columns:
-        st.dataframe(
-            df[available_columns].tail(10).sort_values('date', ascending=False),
-            use_container_width=True
-        )
-        
-        st.caption(f"Showing last 10 entries out of {total_entries} total entries")
-    
-    # Privacy notice
-    st.info("🔒 **Privacy Note:** Your data is stored locally and never transmitted to external servers. "
-            "All exports are generated on your device for your personal use only.")
@@ -1,8 +1,10 @@
 import json
 import os
+import sys
 from datetime import datetime
-from database import init_db, get_db, close_db, WellnessEntry, UserProfile
+from database import init_db, migrate_entry_dates, get_db, close_db, bump_data_version, record_entry_changes, WellnessEntry, UserProfile
 from sqlalchemy import text
+from db_storage import to_entry_date
 
 def migrate_json_to_db(json_file='wellness_data.json'):
     """Migrate data from JSON file to PostgreSQL database"""
@@ -24,11 +26,11 @@ def migrate_json_to_db(json_file='wellness_data.json'):
         entries = data.get('entries', [])
         print(f"Found {len(entries)} entries to migrate...")
         
-        migrated = 0
+        migrated = []
         for entry in entries:
             existing = db.query(WellnessEntry).filter(
-                WellnessEntry.date == entry['date'],
-                WellnessEntry.user_id == 'default_user'
+                WellnessEntry.user_id == 'default_user',
+                WellnessEntry.date == to_entry_date(entry['date'])
             ).first()
             
             if existing:
@@ -37,7 +39,7 @@ def migrate_json_to_db(json_file='wellness_data.json'):
             
             db_entry = WellnessEntry(
                 user_id='default_user',
-                date=entry['date'],
+                date=to_entry_date(entry['date']),
                 timestamp=datetime.fromisoformat(entry['timestamp']) if 'timestamp' in entry else datetime.utcnow(),
                 breakfast=entry.get('breakfast', ''),
                 lunch=entry.get('lunch', ''),
@@ -66,10 +68,13 @@ def migrate_json_to_db(json_file='wellness_data.json'):
             )
             
             db.add(db_entry)
-            migrated += 1
+            migrated.append(db_entry.date)
         
+        if migrated:
+            version = bump_data_version(db, 'default_user')
+            record_entry_changes(db, 'default_user', version, migrated)
         db.commit()
-        print(f"Successfully migrated {migrated} entries to database!")
+        print(f"Successfully migrated {len(migrated)} entries to database!")
         
         user_profile = db.query(UserProfile).filter(UserProfile.user_id == 'default_user').first()
         if not user_profile:
@@ -102,7 +107,7 @@ def export_db_to_json(json_file='wellness_data_backup.json'):
         data = {
             'entries': [
                 {
-                    'date': entry.date,
+                    'date': entry.date.isoformat(),
                     'timestamp': entry.timestamp.isoformat(),
                     'breakfast': entry.breakfast,
                     'lunch': entry.lunch,
@@ -138,4 +143,9 @@ def export_db_to_json(json_file='wellness_data_backup.json'):
         close_db(db)
 
 if __name__ == "__main__":
-    migrate_json_to_db()
+    # python data_migration.py migrate-dates: one-off upgrade of legacy string dates
+    if sys.argv[1:] == ['migrate-dates']:
+        report = migrate_entry_dates()
+        print(f"Entry date migration: {report}" if report else "Entry dates are already migrated")
+    else:
+        migrate_json_to_db()
@@ -1,8 +1,10 @@
 import os
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime, JSON, Text
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, Boolean, Date, DateTime, JSON, Text, Index, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from datetime import datetime
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool, StaticPool
+from datetime import datetime, date
 
 # Use SQLite for local development, PostgreSQL if DATABASE_URL is provided
 DATABASE_URL = os.getenv('DATABASE_URL')
@@ -13,21 +15,86 @@ if not DATABASE_URL:
 if DATABASE_URL.startswith('postgres://'):
     DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
 
-# Configure engine with sensible defaults
-if DATABASE_URL.startswith('sqlite'):
-    engine = create_engine(DATABASE_URL, echo=False, connect_args={"check_same_thread": False}, pool_pre_ping=True)
-else:
-    engine = create_engine(DATABASE_URL, echo=False, pool_pre_ping=True)
+# SQLite production profile, applied to every new connection. WAL lets
+# readers proceed while another worker writes; busy_timeout makes a writer
+# wait for the lock instead of failing with "database is locked".
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -64000)),  # negative = KiB, i.e. 64 MB
+    'temp_store': 'MEMORY',
+}
+
+# Connection pool per worker process
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))  # below typical server/proxy idle cutoffs
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+def create_db_engine(url):
+    """
+    Engine for url with the production settings: pragmas on every SQLite
+    connection, an explicit QueuePool, and pre-ping/recycle for PostgreSQL.
+    """
+    if url.startswith('sqlite'):
+        if ':memory:' in url or url in ('sqlite://', 'sqlite:///'):
+            # One shared connection, otherwise every checkout sees an empty database
+            new_engine = create_engine(url, echo=False, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        else:
+            new_engine = create_engine(
+                url, echo=False,
+                connect_args={"check_same_thread": False},
+                poolclass=QueuePool,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_timeout=DB_POOL_TIMEOUT,
+                pool_pre_ping=True
+            )
+        event.listen(new_engine, 'connect', _apply_sqlite_pragmas)
+        return new_engine
+    
+    return create_engine(
+        url, echo=False,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True
+    )
+
+engine = create_db_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+ENTRY_USER_DATE_INDEX = 'ux_wellness_entries_user_date'
+ENTRY_CHANGES_VERSION_INDEX = 'ix_entry_changes_user_version'
+# Where the date migration moves the extra rows of a user and day
+ENTRY_DUPLICATES_TABLE = 'wellness_entries_duplicates'
+# Raised by init_db() and reported by /api/ready until migrate_entry_dates has run
+ENTRY_MIGRATION_NEEDED = ("wellness_entries has no valid (user_id, date) unique index, so entries cannot be "
+                          "saved; run the one-off migration first: python data_migration.py migrate-dates")
+
 class WellnessEntry(Base):
     __tablename__ = 'wellness_entries'
+    __table_args__ = (
+        # One entry per user per day; also serves every (user_id, date) lookup and range scan
+        Index(ENTRY_USER_DATE_INDEX, 'user_id', 'date', unique=True),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(String, default='default_user')
-    date = Column(String, nullable=False)
+    date = Column(Date, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow)
     
     breakfast = Column(String)
@@ -76,18 +143,392 @@ class UserProfile(Base):
     
     preferences = Column(JSON)
 
-def init_db():
-    """Initialize database tables"""
+class EventRecord(Base):
+    """Shared log of server-sent events, read by every worker (see events.DatabaseEventBroker)"""
+    __tablename__ = 'event_log'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(String, nullable=False)
+    event = Column(String, nullable=False)
+    data = Column(JSON)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+class EventListener(Base):
+    """
+    Heartbeat of a worker with open event streams. Events are only logged
+    while some worker's row is current, so saves skip the log when nobody
+    listens.
+    """
+    __tablename__ = 'event_listeners'
+    
+    worker_id = Column(String, primary_key=True)
+    listening_until = Column(DateTime, nullable=False, index=True)
+
+class UserDataVersion(Base):
+    """
+    Per-user counter advanced by every write to that user's entries.
+    Read caches key on it, so a change made by any process invalidates them.
+    """
+    __tablename__ = 'user_data_versions'
+    
+    user_id = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class EntryChange(Base):
+    """
+    Change log behind delta sync: the data version at which each of a user's
+    dates was last inserted, updated or deleted. One row per date, so the log
+    never outgrows the history. Writes made before the log existed are not
+    in it; clients start from a full snapshot (since=0).
+    """
+    __tablename__ = 'entry_changes'
+    __table_args__ = (
+        Index(ENTRY_CHANGES_VERSION_INDEX, 'user_id', 'version'),
+    )
+    
+    user_id = Column(String, primary_key=True)
+    date = Column(Date, primary_key=True)
+    version = Column(Integer, nullable=False)
+    deleted = Column(Boolean, nullable=False, default=False)
+
+def bump_data_version(conn, user_id):
+    """
+    Advance a user's data version inside the caller's transaction (Session or
+    Connection) and return the new version
+    """
+    table = UserDataVersion.__table__
+    now = datetime.utcnow()
+    # One statement, so two first writes for a user cannot both insert version 1
+    stmt = upsert_statement(dialect_name(conn), table, ['user_id'],
+                            set_={'version': table.c.version + 1, 'updated_at': now})
+    if stmt is not None:
+        return conn.execute(
+            stmt.values(user_id=user_id, version=1, updated_at=now).returning(table.c.version)
+        ).scalar_one()
+    version = conn.execute(
+        table.update()
+        .where(table.c.user_id == user_id)
+        .values(version=table.c.version + 1, updated_at=now)
+        .returning(table.c.version)
+    ).scalar()
+    if version is None:
+        version = 1
+        conn.execute(table.insert().values(user_id=user_id, version=version, updated_at=now))
+    return version
+
+def dialect_name(conn):
+    """Dialect of a Session, Connection or Engine"""
+    bind = conn.get_bind() if isinstance(conn, Session) else conn
+    return bind.dialect.name
+
+def upsert_statement(dialect, table, index_elements, update_columns=(), set_=None):
+    """
+    INSERT ... ON CONFLICT (index_elements) DO UPDATE on PostgreSQL and
+    SQLite; None for other dialects, whose callers update, then insert.
+    update_columns are copied from the inserted row and set_ adds other
+    assignments. With neither, the conflict key is set to itself, so that
+    RETURNING still yields the existing row.
+    """
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    stmt = insert(table)
+    assignments = {name: stmt.excluded[name] for name in update_columns}
+    assignments.update(set_ or {})
+    if not assignments:
+        assignments = {index_elements[-1]: stmt.excluded[index_elements[-1]]}
+    return stmt.on_conflict_do_update(index_elements=index_elements, set_=assignments)
+
+def record_entry_changes(conn, user_id, version, dates, deleted=False):
+    """Log that the entries for dates changed at version (call in the writing transaction)"""
+    rows = [{'user_id': user_id, 'date': day, 'version': version, 'deleted': deleted} for day in dates]
+    if not rows:
+        return
+    table = EntryChange.__table__
+    stmt = upsert_statement(dialect_name(conn), table, ['user_id', 'date'], ['version', 'deleted'])
+    if stmt is not None:
+        conn.execute(stmt, rows)
+        return
+    for row in rows:
+        updated = conn.execute(
+            table.update()
+            .where(table.c.user_id == user_id, table.c.date == row['date'])
+            .values(version=version, deleted=deleted)
+        ).rowcount
+        if not updated:
+            conn.execute(table.insert().values(**row))
+
+def init_db(migrate=False):
+    """
+    Initialize database tables. A legacy SQLite file (a local, single-user
+    database) gets its entry dates migrated here, as does any database with
+    migrate=True (deploy steps such as setup.py). Otherwise a database that
+    still needs migrate_entry_dates raises RuntimeError: every save would
+    fail without the (user_id, date) unique index.
+    """
     Base.metadata.create_all(bind=engine)
+    if entry_dates_need_migration():
+        if migrate or engine.dialect.name == 'sqlite':
+            print(f"Entry date migration: {migrate_entry_dates()}")
+        else:
+            raise RuntimeError(ENTRY_MIGRATION_NEEDED)
 
-def get_db():
-    """Get database session"""
-    db = SessionLocal()
+def _entry_index_status():
+    """'valid', 'missing' or, after a failed CREATE INDEX CONCURRENTLY on PostgreSQL, 'invalid'"""
+    existing = {ix['name'] for ix in inspect(engine).get_indexes(WellnessEntry.__tablename__)}
+    if ENTRY_USER_DATE_INDEX not in existing:
+        return 'missing'
+    if engine.dialect.name == 'postgresql' and not _postgresql_index_is_valid(ENTRY_USER_DATE_INDEX):
+        return 'invalid'
+    return 'valid'
+
+def _postgresql_index_is_valid(name):
+    # The inspector lists invalid indexes too, though PostgreSQL ignores them
+    with engine.connect() as conn:
+        return bool(conn.execute(
+            text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(CAST(:name AS text))"),
+            {'name': name}
+        ).scalar())
+
+def entry_dates_need_migration():
+    """True until the (user_id, date) unique index exists and is usable (see migrate_entry_dates)"""
+    return _entry_index_status() != 'valid'
+
+def _parse_entry_date(value, timestamp):
+    """Best-effort date for a legacy row; falls back to the day it was recorded"""
+    if isinstance(value, date):
+        return value, True
     try:
-        return db
-    finally:
+        return date.fromisoformat(str(value).strip()[:10]), True
+    except (ValueError, TypeError):
         pass
+    if isinstance(timestamp, str):
+        try:
+            timestamp = datetime.fromisoformat(timestamp)
+        except ValueError:
+            timestamp = None
+    return (timestamp or datetime.utcnow()).date(), False
+
+def migrate_entry_dates(batch_size=1000):
+    """
+    One-off migration for databases created when wellness_entries.date was a
+    plain string. On PostgreSQL run it once, as a deploy step or with the
+    API stopped (init_db() runs it for SQLite files):
+    
+        python data_migration.py migrate-dates
+    
+    Legacy rows are normalised to ISO dates (rows without a usable date take
+    the day of their timestamp). Where a user has several rows for one day,
+    the row with a valid date, then the latest one, is kept; the others are
+    moved to ENTRY_DUPLICATES_TABLE, not deleted. Then the (user_id, date)
+    unique index is built.
+    
+    On PostgreSQL the column also becomes DATE without rewriting the table
+    under an ACCESS EXCLUSIVE lock (see _convert_entry_date_column) and the
+    index is created CONCURRENTLY. SQLite stores DATE as ISO text, so
+    existing files only need the index.
+    
+    Returns {"normalized": n, "moved_aside": [ids], "backup_table": name},
+    or None when a valid index already exists. An invalid index left by a
+    failed concurrent build is dropped and rebuilt.
+    """
+    if not entry_dates_need_migration():
+        return None
+    # The data version table the migration bumps
+    Base.metadata.create_all(bind=engine)
+    
+    with engine.begin() as conn:
+        rows = conn.execute(text(
+            "SELECT id, user_id, CAST(date AS VARCHAR) AS date, timestamp FROM wellness_entries ORDER BY id"
+        )).mappings().all()
+        
+        keep = {}
+        for row in rows:
+            entry_date, was_valid = _parse_entry_date(row['date'], row['timestamp'])
+            key = (row['user_id'], entry_date)
+            # Prefer rows that already had a valid date, then the most recent write
+            rank = (was_valid, row['id'])
+            if key not in keep or rank > keep[key][0]:
+                keep[key] = (rank, row)
+        
+        kept_ids = {row['id'] for _, row in keep.values()}
+        dropped = [row for row in rows if row['id'] not in kept_ids]
+        if dropped:
+            ids = [{'id': row['id']} for row in dropped]
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {ENTRY_DUPLICATES_TABLE} AS SELECT * FROM wellness_entries WHERE 1 = 0"
+            ))
+            conn.execute(text(f"INSERT INTO {ENTRY_DUPLICATES_TABLE} SELECT * FROM wellness_entries WHERE id = :id"), ids)
+            conn.execute(text("DELETE FROM wellness_entries WHERE id = :id"), ids)
+            print(f"Date migration: moved {len(dropped)} duplicate entries "
+                  f"(ids {[row['id'] for row in dropped]}) to {ENTRY_DUPLICATES_TABLE}")
+        
+        updated = [
+            (row, entry_date) for (user_id, entry_date), (_, row) in keep.items()
+            if row['date'] != entry_date.isoformat()
+        ]
+        if updated:
+            conn.execute(
+                text("UPDATE wellness_entries SET date = :date WHERE id = :id"),
+                [{'id': row['id'], 'date': entry_date.isoformat()} for row, entry_date in updated]
+            )
+        
+        for user_id in {row['user_id'] for row in dropped} | {row['user_id'] for row, _ in updated}:
+            bump_data_version(conn, user_id)
+    
+    if engine.dialect.name == 'postgresql':
+        _convert_entry_date_column(batch_size)
+    
+    index_sql = f"CREATE UNIQUE INDEX {{}} {ENTRY_USER_DATE_INDEX} ON wellness_entries (user_id, date)"
+    if engine.dialect.name == 'postgresql':
+        drop_sql = f"DROP INDEX CONCURRENTLY IF EXISTS {ENTRY_USER_DATE_INDEX}"
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            if _entry_index_status() == 'invalid':
+                # IF NOT EXISTS would keep it, and it cannot serve ON CONFLICT
+                conn.execute(text(drop_sql))
+            try:
+                conn.execute(text(index_sql.format('CONCURRENTLY IF NOT EXISTS')))
+            except Exception:
+                # e.g. a duplicate written during the build: drop the invalid
+                # index it leaves behind, so the next run starts over
+                conn.execute(text(drop_sql))
+                raise
+    else:
+        with engine.begin() as conn:
+            conn.execute(text(index_sql.format('IF NOT EXISTS')))
+    
+    return {
+        "normalized": len(updated),
+        "moved_aside": [row['id'] for row in dropped],
+        "backup_table": ENTRY_DUPLICATES_TABLE if dropped else None
+    }
+
+def _convert_entry_date_column(batch_size):
+    """
+    PostgreSQL: turn the text date column into DATE. ALTER COLUMN ... TYPE
+    would rewrite the table under ACCESS EXCLUSIVE, so instead a DATE column
+    is added (catalog only) and backfilled in short batched transactions.
+    Only the swap (catch-up of rows written meanwhile, drop, rename) holds
+    ACCESS EXCLUSIVE, briefly. NOT NULL comes from a CHECK constraint added
+    NOT VALID and validated under a lock that lets reads and writes go on,
+    so SET NOT NULL does not scan the table.
+    """
+    columns = {col['name']: col['type'] for col in inspect(engine).get_columns(WellnessEntry.__tablename__)}
+    if isinstance(columns['date'], Date):
+        return
+    
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE wellness_entries ADD COLUMN IF NOT EXISTS date_migrated DATE"))
+    while True:
+        with engine.begin() as conn:
+            filled = conn.execute(text(
+                "UPDATE wellness_entries SET date_migrated = CAST(date AS DATE) WHERE id IN ("
+                "SELECT id FROM wellness_entries WHERE date_migrated IS NULL AND date IS NOT NULL LIMIT :limit)"
+            ), {'limit': batch_size}).rowcount
+        if filled < batch_size:
+            break
+    
+    with engine.begin() as conn:
+        conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+        conn.execute(text(
+            "UPDATE wellness_entries SET date_migrated = CAST(date AS DATE) WHERE date_migrated IS NULL"
+        ))
+        conn.execute(text("ALTER TABLE wellness_entries DROP COLUMN date"))
+        conn.execute(text("ALTER TABLE wellness_entries RENAME COLUMN date_migrated TO date"))
+        conn.execute(text(
+            "ALTER TABLE wellness_entries ADD CONSTRAINT wellness_entries_date_not_null CHECK (date IS NOT NULL) NOT VALID"
+        ))
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE wellness_entries VALIDATE CONSTRAINT wellness_entries_date_not_null"))
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE wellness_entries ALTER COLUMN date SET NOT NULL"))
+        conn.execute(text("ALTER TABLE wellness_entries DROP CONSTRAINT wellness_entries_date_not_null"))
+
+# Optional provider of the session shared by the current unit of work, such
+# as one web request (see request_sessions). Called as provider(create): it
+# returns that session, opening it when create is true, or None outside a scope.
+_session_scope = None
+
+def register_session_scope(provider):
+    """Make get_db() return provider's scoped session whenever there is one"""
+    global _session_scope
+    _session_scope = provider
+
+def get_db():
+    """
+    Get database session. Inside a registered scope (e.g. a Flask request set
+    up with request_sessions.init_request_sessions), every call returns the
+    same scoped session.
+    """
+    if _session_scope is not None:
+        db = _session_scope(True)
+        if db is not None:
+            return db
+    return SessionLocal()
 
 def close_db(db):
-    """Close database session"""
+    """Close database session (a scoped session is closed when its scope ends)"""
+    if _session_scope is not None and _session_scope(False) is db:
+        return
     db.close()
+
+@contextmanager
+def read_snapshot():
+    """
+    Connection whose reads all see the database as of its first query, for
+    callers that read the same rows more than once (e.g. an export that
+    collects its CSV columns before streaming the rows). Writes made
+    meanwhile by other connections are not seen, and are not blocked.
+    """
+    with engine.connect() as conn:
+        if conn.dialect.name == 'postgresql':
+            conn.execution_options(isolation_level='REPEATABLE READ')
+        with conn.begin():
+            if conn.dialect.name == 'sqlite':
+                # pysqlite does not open a transaction for reads by itself;
+                # in WAL mode one read transaction is one snapshot
+                conn.exec_driver_sql("BEGIN")
+            yield conn
+
+def reset_pool_after_fork(parent=False):
+    """
+    Pooled connections must not be shared across fork(). In the parent
+    (parent=True) they are closed before forking; in a forked child they are
+    dropped without closing, since the parent still owns the sockets.
+    A single-connection in-memory pool is left alone.
+    """
+    if not isinstance(engine.pool, StaticPool):
+        engine.dispose(close=parent)
+
+def describe_engine():
+    """Active engine and pool settings, plus the pragmas SQLite actually applied"""
+    info = {'dialect': engine.dialect.name, 'driver': engine.dialect.driver}
+    if engine.dialect.name == 'sqlite':
+        with engine.connect() as conn:
+            info['pragmas'] = {
+                name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+                for name in SQLITE_PRAGMAS
+            }
+    
+    # Settings as configured here rather than read back from pool internals
+    pool = engine.pool
+    pooled = isinstance(pool, QueuePool)
+    info['pool'] = {
+        'class': type(pool).__name__,
+        'status': pool.status(),
+        'pre_ping': pooled,
+        'recycle_seconds': DB_POOL_RECYCLE if pooled and engine.dialect.name != 'sqlite' else None,
+    }
+    if pooled:
+        info['pool'].update({
+            'size': pool.size(),
+            'max_overflow': DB_MAX_OVERFLOW,
+            'overflow': pool.overflow(),
+            'timeout_seconds': pool.timeout(),
+            'checked_out': pool.checkedout(),
+        })
+    return info
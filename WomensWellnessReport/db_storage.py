@@ -1,9 +1,66 @@
-from database import get_db, close_db, WellnessEntry, UserProfile
-from datetime import datetime
-from sqlalchemy import desc
+from database import get_db, close_db, bump_data_version, record_entry_changes, dialect_name, upsert_statement
+from database import WellnessEntry, UserProfile, UserDataVersion, EntryChange
+from datetime import datetime, date
+from functools import lru_cache
+from sqlalchemy import desc, func, select
+import pandas as pd
+
+from entry_frame import ENTRY_FRAME_COLUMNS, type_entries_frame, empty_entries_frame
+
+entries_table = WellnessEntry.__table__
+# Columns read for the dict-shaped entry listings
+_ENTRY_DICT_COLUMNS = [entries_table.c[name] for name in ENTRY_FRAME_COLUMNS]
+
+def to_entry_date(value):
+    """Coerce an ISO date string (or date/datetime) to the date stored in WellnessEntry.date"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value).strip()[:10])
+
+# Columns a caller may write; id and user_id are managed here
+ENTRY_WRITE_COLUMNS = frozenset(col.name for col in entries_table.columns) - {'id', 'user_id'}
+
+@lru_cache(maxsize=256)
+def _entry_upsert(dialect, columns):
+    """
+    INSERT ... ON CONFLICT (user_id, date) DO UPDATE RETURNING id for rows
+    carrying the given columns (a tuple; execute with one or many row dicts).
+    Only the supplied columns are updated, so a partial row merges into the
+    existing entry. Cached per column set; None on dialects without ON
+    CONFLICT (see _merge_entry).
+    """
+    update_columns = [name for name in columns if name not in ('user_id', 'date')]
+    stmt = upsert_statement(dialect, entries_table, ['user_id', 'date'], update_columns)
+    return stmt.returning(entries_table.c.id) if stmt is not None else None
+
+def _merge_entry(db, values):
+    """
+    ORM insert-or-merge of one validated row, for dialects without ON
+    CONFLICT: the supplied columns update the entry for that date, or a new
+    entry is added. Returns the entry's id.
+    """
+    existing = db.query(WellnessEntry).filter(
+        WellnessEntry.user_id == values['user_id'],
+        WellnessEntry.date == values['date']
+    ).first()
+    if existing is None:
+        existing = WellnessEntry(**values)
+        db.add(existing)
+    else:
+        for key, value in values.items():
+            setattr(existing, key, value)
+    db.flush()
+    return existing.id
 
 def save_wellness_entry(entry_data, user_id='default_user'):
-    """Save a wellness entry to the database"""
+    """
+    Save a wellness entry, merging into any existing entry for the same date:
+    only the fields present in entry_data are written. One INSERT ... ON
+    CONFLICT DO UPDATE statement where the dialect has it; returns the
+    entry's id.
+    """
     db = get_db()
     
     try:
@@ -15,60 +72,109 @@ def save_wellness_entry(entry_data, user_id='default_user'):
                 # If parsing fails, use current time
                 entry_data['timestamp'] = datetime.utcnow()
         
-        existing = db.query(WellnessEntry).filter(
-            WellnessEntry.date == entry_data['date'],
-            WellnessEntry.user_id == user_id
-        ).first()
+        # Unknown keys (form-only fields) are ignored
+        values = {key: value for key, value in entry_data.items() if key in ENTRY_WRITE_COLUMNS}
+        values['date'] = to_entry_date(entry_data['date'])
+        values['user_id'] = user_id
         
-        if existing:
-            # Get valid column names from the model
-            from sqlalchemy import inspect as sql_inspect
-            mapper = sql_inspect(WellnessEntry)
-            valid_columns = {col.key for col in mapper.columns}
-            
-            # Fields to skip (internal/metadata fields)
-            skip_fields = {'user_id', 'id'}
+        stmt = _entry_upsert(dialect_name(db), tuple(sorted(values)))
+        if stmt is not None:
+            entry_id = db.execute(stmt, values).scalar_one()
+        else:
+            entry_id = _merge_entry(db, values)
+        version = bump_data_version(db, user_id)
+        record_entry_changes(db, user_id, version, [values['date']])
+        db.commit()
+        return entry_id
             
-            updated_fields = []
-            for key, value in entry_data.items():
-                # Skip internal fields
-                if key in skip_fields:
-                    continue
-                
-                # Skip if not a valid database column
-                if key not in valid_columns:
-                    continue
-                    
-                # Convert timestamp if needed
-                if key == 'timestamp' and isinstance(value, str):
-                    try:
-                        value = datetime.fromisoformat(value)
-                    except (ValueError, TypeError):
-                        value = datetime.utcnow()
-                
-                # Update the field
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        close_db(db)
+
+def _entry_to_dict(entry):
+    """Convert an entry row to the dict shape used by the API and UI"""
+    return {
+        'date': entry.date.isoformat(),
+        'timestamp': entry.timestamp.isoformat() if entry.timestamp else entry.date.isoformat(),
+        'breakfast': entry.breakfast or '',
+        'lunch': entry.lunch or '',
+        'dinner': entry.dinner or '',
+        'snacks': entry.snacks or '',
+        'morning_meal': entry.morning_meal or '',
+        'afternoon_meal': entry.afternoon_meal or '',
+        'night_meal': entry.night_meal or '',
+        'stress_morning': entry.stress_morning,
+        'stress_afternoon': entry.stress_afternoon,
+        'stress_night': entry.stress_night,
+        # Also include frontend field names for compatibility
+        'morning_stress': entry.stress_morning,
+        'afternoon_stress': entry.stress_afternoon,
+        'night_stress': entry.stress_night,
+        'average_stress': entry.average_stress,
+        'exercise_minutes': entry.exercise_minutes,
+        'water_intake': entry.water_intake,
+        'sleep_hours': entry.sleep_hours,
+        'sleep_quality': entry.sleep_quality,
+        'on_period': entry.on_period,
+        'period_day': entry.period_day,
+        'cycle_phase': entry.cycle_phase or '',
+        'symptoms': entry.symptoms or {},
+        'notes': entry.notes or '',
+        'additional_notes': entry.additional_notes or '',
+        'wellness_score': entry.wellness_score,
+        'sentiment_score': entry.sentiment_score,
+        'predicted_energy': entry.predicted_energy
+    }
+
+def bulk_upsert_entries(rows, user_id='default_user', chunk_size=500):
+    """
+    Insert or merge many entries with one statement per chunk.
+    
+    rows is a list of (index, values) pairs; values must already be validated
+    (date a date object, only ENTRY_WRITE_COLUMNS). Rows are grouped by the
+    set of columns they carry so partial rows keep merge semantics (row by
+    row through _merge_entry on dialects without ON CONFLICT), and each
+    chunk runs in its own savepoint: a failing chunk is reported and the rest
+    of the batch is still written. Returns (saved_count, [(index, error)]).
+    """
+    groups = {}
+    for index, values in rows:
+        groups.setdefault(tuple(sorted(values)), []).append((index, values))
+    
+    db = get_db()
+    dialect = dialect_name(db)
+    saved = 0
+    errors = []
+    
+    try:
+        # Bump first: the write opens the outer transaction (pysqlite only
+        # begins one on DML), so the chunk savepoints nest inside it and the
+        # whole batch commits or rolls back together
+        version = bump_data_version(db, user_id)
+        for columns, group in groups.items():
+            stmt = _entry_upsert(dialect, columns)
+            for offset in range(0, len(group), chunk_size):
+                chunk = group[offset:offset + chunk_size]
                 try:
-                    old_value = getattr(existing, key, None)
-                    setattr(existing, key, value)
-                    if old_value != value:
-                        updated_fields.append(key)
+                    with db.begin_nested():
+                        if stmt is not None:
+                            db.execute(stmt, [{**values, 'user_id': user_id} for _, values in chunk])
+                        else:
+                            for _, values in chunk:
+                                _merge_entry(db, {**values, 'user_id': user_id})
+                        record_entry_changes(db, user_id, version, [values['date'] for _, values in chunk])
+                    saved += len(chunk)
                 except Exception as e:
-                    print(f"Warning: Could not update {key}: {e}")
-                    continue
-            
+                    errors.extend((index, str(getattr(e, 'orig', e))) for index, _ in chunk)
+        
+        if saved:
             db.commit()
-            db.refresh(existing)
-            return existing
         else:
-            db_entry = WellnessEntry(
-                user_id=user_id,
-                **entry_data
-            )
-            db.add(db_entry)
-            db.commit()
-            db.refresh(db_entry)
-            return db_entry
-            
+            db.rollback()
+        return saved, errors
+        
     except Exception as e:
         db.rollback()
         raise e
@@ -80,46 +186,13 @@ def get_all_entries(user_id='default_user'):
     db = get_db()
     
     try:
-        entries = db.query(WellnessEntry).filter(
-            WellnessEntry.user_id == user_id
-        ).order_by(WellnessEntry.date).all()
-        
-        result = []
-        for entry in entries:
-            entry_dict = {
-                'date': entry.date,
-                'timestamp': entry.timestamp.isoformat() if entry.timestamp else entry.date,
-                'breakfast': entry.breakfast or '',
-                'lunch': entry.lunch or '',
-                'dinner': entry.dinner or '',
-                'snacks': entry.snacks or '',
-                'morning_meal': entry.morning_meal or '',
-                'afternoon_meal': entry.afternoon_meal or '',
-                'night_meal': entry.night_meal or '',
-                'stress_morning': entry.stress_morning,
-                'stress_afternoon': entry.stress_afternoon,
-                'stress_night': entry.stress_night,
-                # Also include frontend field names for compatibility
-                'morning_stress': entry.stress_morning,
-                'afternoon_stress': entry.stress_afternoon,
-                'night_stress': entry.stress_night,
-                'average_stress': entry.average_stress,
-                'exercise_minutes': entry.exercise_minutes,
-                'water_intake': entry.water_intake,
-                'sleep_hours': entry.sleep_hours,
-                'sleep_quality': entry.sleep_quality,
-                'on_period': entry.on_period,
-                'period_day': entry.period_day,
-                'cycle_phase': entry.cycle_phase or '',
-                'symptoms': entry.symptoms or {},
-                'notes': entry.notes or '',
-                'additional_notes': entry.additional_notes or '',
-                'wellness_score': entry.wellness_score,
-                'sentiment_score': entry.sentiment_score,
-                'predicted_energy': entry.predicted_energy
-            }
-            result.append(entry_dict)
-        return result
+        entries = db.execute(
+            select(*_ENTRY_DICT_COLUMNS)
+            .where(entries_table.c.user_id == user_id)
+            .order_by(entries_table.c.date)
+        ).all()
+        
+        return [_entry_to_dict(entry) for entry in entries]
         
     finally:
         close_db(db)
@@ -129,46 +202,165 @@ def get_recent_entries(user_id='default_user', limit=30):
     db = get_db()
     
     try:
-        entries = db.query(WellnessEntry).filter(
-            WellnessEntry.user_id == user_id
-        ).order_by(desc(WellnessEntry.date)).limit(limit).all()
-        
-        result = []
-        for entry in reversed(entries):
-            entry_dict = {
-                'date': entry.date,
-                'timestamp': entry.timestamp.isoformat() if entry.timestamp else entry.date,
-                'breakfast': entry.breakfast or '',
-                'lunch': entry.lunch or '',
-                'dinner': entry.dinner or '',
-                'snacks': entry.snacks or '',
-                'morning_meal': entry.morning_meal or '',
-                'afternoon_meal': entry.afternoon_meal or '',
-                'night_meal': entry.night_meal or '',
-                'stress_morning': entry.stress_morning,
-                'stress_afternoon': entry.stress_afternoon,
-                'stress_night': entry.stress_night,
-                # Also include frontend field names for compatibility
-                'morning_stress': entry.stress_morning,
-                'afternoon_stress': entry.stress_afternoon,
-                'night_stress': entry.stress_night,
-                'average_stress': entry.average_stress,
-                'exercise_minutes': entry.exercise_minutes,
-                'water_intake': entry.water_intake,
-                'sleep_hours': entry.sleep_hours,
-                'sleep_quality': entry.sleep_quality,
-                'on_period': entry.on_period,
-                'period_day': entry.period_day,
-                'cycle_phase': entry.cycle_phase or '',
-                'symptoms': entry.symptoms or {},
-                'notes': entry.notes or '',
-                'additional_notes': entry.additional_notes or '',
-                'wellness_score': entry.wellness_score,
-                'sentiment_score': entry.sentiment_score,
-                'predicted_energy': entry.predicted_energy
-            }
-            result.append(entry_dict)
-        return result
+        entries = db.execute(
+            select(*_ENTRY_DICT_COLUMNS)
+            .where(entries_table.c.user_id == user_id)
+            .order_by(desc(entries_table.c.date))
+            .limit(limit)
+        ).all()
+        
+        return [_entry_to_dict(entry) for entry in reversed(entries)]
+        
+    finally:
+        close_db(db)
+
+def _date_window(query, user_id, start=None, end=None):
+    """Restrict a select on wellness_entries to one user and an inclusive date range"""
+    query = query.where(entries_table.c.user_id == user_id)
+    if start is not None:
+        query = query.where(entries_table.c.date >= to_entry_date(start))
+    if end is not None:
+        query = query.where(entries_table.c.date <= to_entry_date(end))
+    return query
+
+def load_entries_frame(user_id='default_user', columns=None, start=None, end=None, compact=False):
+    """
+    Load a user's entries as a typed DataFrame, oldest first.
+    
+    Only the requested columns (plus date) are selected, through SQLAlchemy
+    Core rather than ORM objects, and the frame is built column-wise with
+    datetime64 dates, float metrics and bool flags. start/end are inclusive
+    date bounds; compact=True stores metrics as float32.
+    """
+    names = ['date'] + [name for name in (columns or ENTRY_FRAME_COLUMNS) if name != 'date']
+    query = _date_window(select(*[entries_table.c[name] for name in names]), user_id, start, end)
+    query = query.order_by(entries_table.c.date)
+    
+    db = get_db()
+    
+    try:
+        rows = db.execute(query).all()
+    finally:
+        close_db(db)
+    
+    if not rows:
+        return empty_entries_frame(names)
+    return type_entries_frame(pd.DataFrame.from_records(rows, columns=names), compact=compact)
+
+def iter_entry_chunks(user_id='default_user', columns=None, start=None, end=None, chunk_size=1000, snapshot=None):
+    """
+    Yield a user's entries as typed DataFrames of at most chunk_size rows,
+    oldest first. Rows come from a streamed (server-side where the driver
+    supports it) cursor, so memory follows chunk_size rather than the history.
+    snapshot is an optional database.read_snapshot() connection to read from.
+    """
+    names = ['date'] + [name for name in (columns or ENTRY_FRAME_COLUMNS) if name != 'date']
+    query = _date_window(select(*[entries_table.c[name] for name in names]), user_id, start, end)
+    query = query.order_by(entries_table.c.date)
+    
+    db = get_db() if snapshot is None else snapshot
+    
+    try:
+        result = db.execute(query, execution_options={'stream_results': True, 'yield_per': chunk_size})
+        for rows in result.partitions():
+            yield type_entries_frame(pd.DataFrame.from_records(rows, columns=names))
+    finally:
+        if snapshot is None:
+            close_db(db)
+
+def get_symptom_keys(user_id='default_user', start=None, end=None, chunk_size=1000, snapshot=None):
+    """Symptom names recorded in a user's entries, in order of first appearance"""
+    keys = {}
+    for df in iter_entry_chunks(user_id, columns=['symptoms'], start=start, end=end, chunk_size=chunk_size,
+                                snapshot=snapshot):
+        for symptoms in df['symptoms']:
+            keys.update(dict.fromkeys(symptoms))
+    return list(keys)
+
+def get_entries_page(user_id='default_user', start=None, end=None, after=None, limit=None):
+    """
+    Get entries in a date window, oldest first.
+    
+    start/end are inclusive bounds; after is a keyset cursor (the date of the
+    last entry of the previous page). All filters run in SQL on the
+    (user_id, date) index, so cost follows the page size, not the history.
+    """
+    db = get_db()
+    
+    try:
+        query = _date_window(select(*_ENTRY_DICT_COLUMNS), user_id, start, end)
+        if after is not None:
+            query = query.where(entries_table.c.date > to_entry_date(after))
+        query = query.order_by(entries_table.c.date)
+        if limit is not None:
+            query = query.limit(limit)
+        
+        return [_entry_to_dict(entry) for entry in db.execute(query).all()]
+        
+    finally:
+        close_db(db)
+
+def get_entry_changes(since, user_id='default_user'):
+    """
+    Entries changed after data version since, for delta sync.
+    
+    Returns {"version", "full", "upserted", "deleted"}: the version the
+    result is current to (the client's next since), the entry dicts inserted
+    or updated and the dates deleted. since=0, or a version this database
+    never reached, yields a full snapshot (full=True). Changes committed
+    after version was read are left for the next call, so passing version
+    back as since never skips one.
+    """
+    changes = EntryChange.__table__
+    db = get_db()
+    
+    try:
+        version = db.execute(
+            select(UserDataVersion.version).where(UserDataVersion.user_id == user_id)
+        ).scalar() or 0
+        
+        if since <= 0 or since > version:
+            upserted = db.execute(
+                select(*_ENTRY_DICT_COLUMNS).where(entries_table.c.user_id == user_id).order_by(entries_table.c.date)
+            ).all()
+            return {"version": version, "full": True,
+                    "upserted": [_entry_to_dict(entry) for entry in upserted], "deleted": []}
+        
+        window = (
+            changes.c.user_id == user_id,
+            changes.c.version > since,
+            changes.c.version <= version
+        )
+        deleted = db.execute(
+            select(changes.c.date).where(*window, changes.c.deleted.is_(True)).order_by(changes.c.date)
+        ).scalars().all()
+        upserted = db.execute(
+            select(*_ENTRY_DICT_COLUMNS)
+            .join(changes, (changes.c.user_id == entries_table.c.user_id) & (changes.c.date == entries_table.c.date))
+            .where(*window, changes.c.deleted.is_(False))
+            .order_by(entries_table.c.date)
+        ).all()
+        
+        return {"version": version, "full": False,
+                "upserted": [_entry_to_dict(entry) for entry in upserted],
+                "deleted": [day.isoformat() for day in deleted]}
+        
+    finally:
+        close_db(db)
+
+def get_entry_by_date(date, user_id='default_user'):
+    """Get a single entry by date, or None"""
+    db = get_db()
+    
+    try:
+        entry = db.execute(
+            select(*_ENTRY_DICT_COLUMNS).where(
+                entries_table.c.user_id == user_id,
+                entries_table.c.date == to_entry_date(date)
+            )
+        ).first()
+        
+        return _entry_to_dict(entry) if entry else None
         
     finally:
         close_db(db)
@@ -179,12 +371,14 @@ def delete_entry(date, user_id='default_user'):
     
     try:
         entry = db.query(WellnessEntry).filter(
-            WellnessEntry.date == date,
-            WellnessEntry.user_id == user_id
+            WellnessEntry.user_id == user_id,
+            WellnessEntry.date == to_entry_date(date)
         ).first()
         
         if entry:
             db.delete(entry)
+            version = bump_data_version(db, user_id)
+            record_entry_changes(db, user_id, version, [entry.date], deleted=True)
             db.commit()
             return True
         return False
@@ -195,6 +389,44 @@ def delete_entry(date, user_id='default_user'):
     finally:
         close_db(db)
 
+def count_entries(user_id='default_user'):
+    """Number of entries for a user (a count over the (user_id, date) index)"""
+    db = get_db()
+    
+    try:
+        return db.execute(
+            select(func.count()).select_from(entries_table).where(entries_table.c.user_id == user_id)
+        ).scalar()
+        
+    finally:
+        close_db(db)
+
+def get_data_version(user_id='default_user'):
+    """Current data version of a user's entries (0 if never written)"""
+    db = get_db()
+    
+    try:
+        version = db.execute(
+            select(UserDataVersion.version).where(UserDataVersion.user_id == user_id)
+        ).scalar()
+        return version or 0
+        
+    finally:
+        close_db(db)
+
+def get_data_version_info(user_id='default_user'):
+    """(version, updated_at) of a user's entries; (0, None) if never written"""
+    db = get_db()
+    
+    try:
+        row = db.execute(
+            select(UserDataVersion.version, UserDataVersion.updated_at).where(UserDataVersion.user_id == user_id)
+        ).first()
+        return (row.version, row.updated_at) if row else (0, None)
+        
+    finally:
+        close_db(db)
+
 def get_user_profile(user_id='default_user'):
     """Get user profile"""
     db = get_db()
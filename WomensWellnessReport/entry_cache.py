@@ -0,0 +1,85 @@
+"""
+In-process read-through cache of each user's entries frame.
+
+Frames are keyed by the user's data version (see database.UserDataVersion),
+which every write advances in the same transaction. A lookup costs one
+primary-key read of that version; the full entries query only runs when the
+version has moved, so the several API calls behind one page load share a
+single history read. Bounded by number of users with LRU eviction.
+"""
+
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from db_storage import load_entries_frame, get_data_version, to_entry_date
+from entry_frame import ENTRY_FRAME_COLUMNS
+
+
+class EntryFrameCache:
+    """LRU cache of full entries frames, validated against the data version"""
+
+    def __init__(self, max_users=128, load_frame=load_entries_frame, load_version=get_data_version):
+        self.max_users = max_users
+        self._load_frame = load_frame
+        self._load_version = load_version
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_frame(self, user_id='default_user', columns=None, start=None, end=None):
+        """
+        Entries frame for a user, restricted to columns (date is always
+        included) and to an inclusive start/end date window. The result is a
+        new DataFrame, so callers may modify it freely.
+        """
+        frame = self._get_full_frame(user_id)
+        names = ['date'] + [name for name in (columns or ENTRY_FRAME_COLUMNS) if name != 'date']
+        if start is not None:
+            frame = frame[frame['date'] >= pd.Timestamp(to_entry_date(start))]
+        if end is not None:
+            frame = frame[frame['date'] <= pd.Timestamp(to_entry_date(end))]
+        return frame[names]
+
+    def invalidate(self, user_id=None):
+        """Drop one user's frame, or everything"""
+        with self._lock:
+            if user_id is None:
+                self._frames.clear()
+            else:
+                self._frames.pop(user_id, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "users_cached": len(self._frames),
+                "max_users": self.max_users,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None
+            }
+
+    def _get_full_frame(self, user_id):
+        version = self._load_version(user_id)
+        with self._lock:
+            cached = self._frames.get(user_id)
+            if cached is not None and cached[0] == version:
+                self._frames.move_to_end(user_id)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        # Load outside the lock so one slow read does not block other users
+        frame = self._load_frame(user_id)
+        with self._lock:
+            self._frames[user_id] = (version, frame)
+            self._frames.move_to_end(user_id)
+            while len(self._frames) > self.max_users:
+                self._frames.popitem(last=False)
+                self.evictions += 1
+        return frame
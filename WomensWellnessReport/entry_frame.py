@@ -0,0 +1,124 @@
+"""
+Typed pandas representation of wellness entries.
+
+db_storage.load_entries_frame builds these frames straight from the database;
+the report, analytics, cycle and export modules consume them. as_entries_frame
+also accepts the legacy {'entries': [...]} dicts still used by the Streamlit app.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Numeric metrics. Integer columns are nullable in the database, so they are
+# carried as floats with NaN for missing values.
+FLOAT_COLUMNS = [
+    'stress_morning', 'stress_afternoon', 'stress_night', 'average_stress',
+    'exercise_minutes', 'water_intake', 'sleep_hours', 'sleep_quality',
+    'period_day', 'wellness_score', 'sentiment_score', 'predicted_energy'
+]
+# The integer ones among them, exported as whole numbers again
+INTEGER_COLUMNS = ['exercise_minutes', 'water_intake', 'period_day']
+BOOL_COLUMNS = ['on_period']
+TEXT_COLUMNS = [
+    'breakfast', 'lunch', 'dinner', 'snacks',
+    'morning_meal', 'afternoon_meal', 'night_meal',
+    'cycle_phase', 'notes', 'additional_notes'
+]
+DATETIME_COLUMNS = ['date', 'timestamp']
+JSON_COLUMNS = ['symptoms']
+
+# Every entry field, in the order the API has always listed them
+ENTRY_FRAME_COLUMNS = [
+    'date', 'timestamp',
+    'breakfast', 'lunch', 'dinner', 'snacks', 'morning_meal', 'afternoon_meal', 'night_meal',
+    'stress_morning', 'stress_afternoon', 'stress_night', 'average_stress',
+    'exercise_minutes', 'water_intake', 'sleep_hours', 'sleep_quality',
+    'on_period', 'period_day', 'cycle_phase', 'symptoms', 'notes', 'additional_notes',
+    'wellness_score', 'sentiment_score', 'predicted_energy'
+]
+
+# Frontend aliases for the stress columns
+STRESS_ALIASES = {
+    'stress_morning': 'morning_stress',
+    'stress_afternoon': 'afternoon_stress',
+    'stress_night': 'night_stress'
+}
+
+
+def type_entries_frame(df, compact=False):
+    """
+    Apply the entry dtypes in place and return the frame: datetime64 dates,
+    float metrics, bool flags, '' for missing text and {} for missing symptoms.
+    compact=True stores metrics as float32 (half the memory, for internal
+    and cached frames only: values no longer match the database exactly);
+    the default float64 keeps values identical to what the database returns,
+    as anything exported must.
+    """
+    float_dtype = np.float32 if compact else np.float64
+    for col in df.columns:
+        if col in DATETIME_COLUMNS:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+        elif col in FLOAT_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(float_dtype)
+        elif col in BOOL_COLUMNS:
+            df[col] = df[col].map(bool, na_action='ignore').fillna(False).astype(bool)
+        elif col in TEXT_COLUMNS:
+            df[col] = df[col].fillna('').astype(object)
+        elif col in JSON_COLUMNS:
+            df[col] = [value if isinstance(value, dict) else {} for value in df[col]]
+    return df
+
+
+def empty_entries_frame(columns=None):
+    """Typed frame with no rows"""
+    return type_entries_frame(pd.DataFrame(columns=list(columns or ENTRY_FRAME_COLUMNS)))
+
+
+def as_entries_frame(data):
+    """
+    Accept an entries frame or the legacy {'entries': [...]} dict and return
+    a typed DataFrame (or None when there is no data at all).
+    """
+    if isinstance(data, pd.DataFrame):
+        return data
+    if not data or 'entries' not in data:
+        return None
+    return type_entries_frame(pd.DataFrame(data['entries']))
+
+
+def format_entry_date(value):
+    """Render an entry date (Timestamp, date or ISO string) as YYYY-MM-DD"""
+    if isinstance(value, str):
+        return value[:10]
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+def integers_restored(df):
+    """The integer metrics of a (copied) entries frame as nullable Int64 columns"""
+    for col in INTEGER_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].round().astype('Int64')
+    return df
+
+
+def frame_to_records(df):
+    """
+    Convert an entries frame back to JSON-ready dicts: ISO date strings,
+    ints for the integer metrics and None for missing numbers.
+    """
+    out = integers_restored(df.copy())
+    if 'date' in out.columns:
+        out['date'] = out['date'].dt.strftime('%Y-%m-%d')
+    if 'timestamp' in out.columns:
+        out['timestamp'] = out['timestamp'].map(lambda ts: ts.isoformat(), na_action='ignore')
+    out = out.astype(object).where(out.notna(), None)
+    return out.to_dict('records')
+
+
+def records_to_columns(records, columns=None):
+    """
+    Transpose entry dicts into {field: [values...]} parallel arrays (the
+    ?format=columnar wire format). Alias fields are left out unless listed.
+    """
+    columns = list(columns or ENTRY_FRAME_COLUMNS)
+    return {name: [record.get(name) for record in records] for name in columns}
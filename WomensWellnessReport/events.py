@@ -0,0 +1,316 @@
+"""
+Server-sent events for GET /api/events.
+
+EventBus is an in-process pub/sub: every subscriber (one per open SSE
+stream) gets a bounded queue, and publish() fans events out to them. With a
+broker, published events go through a log shared by all worker processes
+instead, so a stream sees events raised by any worker:
+
+- DatabaseEventBroker stores events in the event_log table of the app
+  database (SQLite or PostgreSQL). Each worker polls it from one thread, and
+  only while it has subscribers, so an idle server does no event work.
+  Workers with subscribers keep a heartbeat row in event_listeners, and
+  publish() logs nothing while no heartbeat is current, so saves add no
+  writes when nobody listens. The heartbeat outlives the last stream by
+  listener_ttl, which covers a reconnecting client. Event
+  ids are the log ids, which lets a reconnecting EventSource resume from its
+  Last-Event-ID. On PostgreSQL a lower id can commit after a higher one, so
+  events are delivered in id order only: the poller holds back events behind
+  a missing id until it shows up, or for at most gap_seconds (an insert that
+  was rolled back never does).
+- Without a broker (EVENT_BROKER=memory) events stay in the process, which
+  is enough for a single worker.
+
+A subscriber that falls queue_size events behind is closed; its client
+reconnects and, with the database broker, catches up from the log.
+"""
+
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select, update
+
+from database import get_db, close_db, EventRecord, EventListener
+
+# Event types pushed to clients
+ENTRY_SAVED = 'entry_saved'
+MODEL_TRAINED = 'model_trained'
+CACHE_INVALIDATED = 'cache_invalidated'
+
+events_table = EventRecord.__table__
+listeners_table = EventListener.__table__
+
+
+class DatabaseEventBroker:
+    """Cross-worker event log in the app database"""
+
+    def __init__(self, retention_seconds=3600, prune_every=100, listener_ttl=30):
+        self.retention_seconds = retention_seconds
+        self.prune_every = prune_every
+        self.listener_ttl = listener_ttl
+        self._appended = 0
+
+    def listen(self, worker_id):
+        """Mark worker_id as having subscribers for the next listener_ttl seconds"""
+        now = datetime.utcnow()
+        until = now + timedelta(seconds=self.listener_ttl)
+        db = get_db()
+        try:
+            refreshed = db.execute(
+                update(listeners_table).where(listeners_table.c.worker_id == worker_id).values(listening_until=until)
+            ).rowcount
+            if not refreshed:
+                # Rows of workers that stopped listening (or exited) go first
+                db.execute(delete(listeners_table).where(listeners_table.c.listening_until < now))
+                db.execute(insert(listeners_table).values(worker_id=worker_id, listening_until=until))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            close_db(db)
+
+    def has_listeners(self):
+        """Whether any worker has had subscribers within listener_ttl"""
+        db = get_db()
+        try:
+            return db.execute(
+                select(listeners_table.c.worker_id).where(listeners_table.c.listening_until > datetime.utcnow()).limit(1)
+            ).first() is not None
+        finally:
+            close_db(db)
+
+    def append(self, event, data, user_id):
+        """Store an event; returns its id"""
+        db = get_db()
+        try:
+            event_id = db.execute(
+                insert(events_table).values(user_id=user_id, event=event, data=data, created_at=datetime.utcnow())
+                .returning(events_table.c.id)
+            ).scalar_one()
+            self._appended += 1
+            if self._appended % self.prune_every == 0:
+                cutoff = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+                db.execute(delete(events_table).where(events_table.c.created_at < cutoff))
+            db.commit()
+            return event_id
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            close_db(db)
+
+    def read(self, after, upto=None, user_id=None, limit=1000):
+        """Events with after < id (<= upto), oldest first, as (id, event, data, user_id)"""
+        query = select(events_table.c.id, events_table.c.event, events_table.c.data, events_table.c.user_id)
+        query = query.where(events_table.c.id > after)
+        if upto is not None:
+            query = query.where(events_table.c.id <= upto)
+        if user_id is not None:
+            query = query.where(events_table.c.user_id == user_id)
+        db = get_db()
+        try:
+            return [tuple(row) for row in db.execute(query.order_by(events_table.c.id).limit(limit)).all()]
+        finally:
+            close_db(db)
+
+    def latest_id(self):
+        db = get_db()
+        try:
+            return db.execute(select(func.max(events_table.c.id))).scalar() or 0
+        finally:
+            close_db(db)
+
+
+class Subscription:
+    """One SSE stream's queue of (id, event, data) tuples"""
+
+    def __init__(self, user_id, queue_size):
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.closed = False
+
+    def offer(self, item):
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            # Too far behind: end the stream and let the client reconnect
+            self.closed = True
+
+
+class EventBus:
+    """In-process pub/sub, optionally fanned out across workers through a broker"""
+
+    def __init__(self, broker=None, queue_size=256, poll_interval=0.5, gap_seconds=5.0, heartbeat_seconds=10.0):
+        self.broker = broker
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        self.gap_seconds = gap_seconds
+        # How often a worker with subscribers renews its broker heartbeat
+        # (keep well under the broker's listener_ttl)
+        self.heartbeat_seconds = heartbeat_seconds
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._next_id = 0
+        # Every log id up to the cursor has been delivered (or given up on)
+        self._cursor = 0
+        self._gap_since = None
+        self._poller = None
+        self._pid = None
+        self._heartbeat_at = None
+
+    def publish(self, event, data=None, user_id='default_user'):
+        """Send an event to every subscriber of user_id (on all workers with a broker)"""
+        if self.broker is not None:
+            # No stream open on any worker: nothing to log
+            if self.broker.has_listeners():
+                self.broker.append(event, data, user_id)
+            return
+        with self._lock:
+            self._next_id += 1
+            self._deliver([(self._next_id, event, data, user_id)])
+
+    def subscribe(self, user_id='default_user', last_event_id=None):
+        """
+        Open a subscription. With a broker and last_event_id, events after
+        that id still in the log are replayed first.
+        """
+        subscription = Subscription(user_id, self.queue_size)
+        with self._lock:
+            if self.broker is not None:
+                # Before the cursor is set, so every event logged after it is seen
+                self._heartbeat()
+                self._ensure_poller()
+                if last_event_id is not None:
+                    # Under the lock, so the replay ends exactly where polling resumes
+                    for item in self.broker.read(last_event_id, upto=self._cursor, user_id=user_id, limit=self.queue_size):
+                        subscription.offer(item[:3])
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def _deliver(self, items):
+        # Caller holds the lock
+        for subscription in list(self._subscribers):
+            for event_id, event, data, user_id in items:
+                if user_id == subscription.user_id and not subscription.closed:
+                    subscription.offer((event_id, event, data))
+
+    def _heartbeat(self):
+        # Caller holds the lock
+        now = time.monotonic()
+        if self._pid != os.getpid() or self._heartbeat_at is None or now - self._heartbeat_at >= self.heartbeat_seconds:
+            self.broker.listen(f"{socket.gethostname()}:{os.getpid()}")
+            self._heartbeat_at = now
+
+    def _ensure_poller(self):
+        # Caller holds the lock. Threads do not survive fork(), so each
+        # worker process starts its own poller.
+        if self._pid != os.getpid() or self._poller is None or not self._poller.is_alive():
+            self._pid = os.getpid()
+            self._cursor = self.broker.latest_id()
+            self._gap_since = None
+            self._poller = threading.Thread(target=self._poll, name='event-poller', daemon=True)
+            self._poller.start()
+
+    def _poll(self):
+        while True:
+            time.sleep(self.poll_interval)
+            with self._lock:
+                if not self._subscribers:
+                    # Stop while nobody listens; the next subscribe restarts polling
+                    self._poller = None
+                    return
+                try:
+                    self._heartbeat()
+                except Exception as e:
+                    print(f"Event heartbeat failed: {e}")
+                cursor = self._cursor
+            try:
+                items = self.broker.read(cursor)
+            except Exception as e:
+                print(f"Event poll failed: {e}")
+                continue
+            if items:
+                with self._lock:
+                    items = self._take_in_order(items)
+                    if items:
+                        self._cursor = items[-1][0]
+                        self._deliver(items)
+
+    def _take_in_order(self, items):
+        # Caller holds the lock. The leading run of items with consecutive ids
+        # after the cursor; a missing id stops the run until it is committed
+        # or has been missing for gap_seconds.
+        ready = []
+        expected = self._cursor + 1
+        for item in items:
+            if item[0] < expected:
+                # A poller restarted meanwhile may have moved the cursor
+                continue
+            if item[0] > expected:
+                now = time.monotonic()
+                if self._gap_since is None:
+                    self._gap_since = now
+                if now - self._gap_since < self.gap_seconds:
+                    break
+                # Rolled back: stop waiting for the missing ids
+            self._gap_since = None
+            ready.append(item)
+            expected = item[0] + 1
+        return ready
+
+
+def format_event(event_id, event, data, dumps=json.dumps):
+    """One text/event-stream message (a multi-line payload takes one data: field per line)"""
+    lines = ''.join(f"data: {line}\n" for line in dumps(data).splitlines())
+    return f"id: {event_id}\nevent: {event}\n{lines}\n"
+
+
+def stream_events(bus, subscription, dumps=json.dumps, keepalive_seconds=15, max_seconds=None, retry_ms=3000):
+    """
+    Generator for an SSE response body: a reconnect hint, then events as
+    they arrive with a comment line every keepalive_seconds. Ends after
+    max_seconds (the client reconnects, freeing the server thread meanwhile)
+    or when the subscription is closed; always unsubscribes.
+    """
+    deadline = time.monotonic() + max_seconds if max_seconds else None
+    try:
+        yield f"retry: {retry_ms}\n\n"
+        while not subscription.closed:
+            timeout = keepalive_seconds
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic())
+                if timeout <= 0:
+                    return
+            try:
+                event_id, event, data = subscription.queue.get(timeout=timeout)
+            except queue.Empty:
+                yield ": keepalive\n\n"
+                continue
+            yield format_event(event_id, event, data, dumps)
+    finally:
+        bus.unsubscribe(subscription)
+
+
+def create_event_bus():
+    """The bus configured by EVENT_BROKER (database, the default, or memory)"""
+    if os.environ.get('EVENT_BROKER', 'database') == 'memory':
+        return EventBus()
+    return EventBus(
+        broker=DatabaseEventBroker(retention_seconds=int(os.environ.get('EVENT_RETENTION_SECONDS', 3600)),
+                                   listener_ttl=int(os.environ.get('EVENT_LISTENER_TTL', 30))),
+        poll_interval=float(os.environ.get('EVENT_POLL_INTERVAL', 0.5))
+    )
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { LineChart, Line, BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
-import { getDashboardStats, getDashboardCharts } from '../services/api';
+import { getDashboardBundle, columnsToRows, subscribeEvents } from '../services/api';
 import './Dashboard.css';
 
 const Dashboard = () => {
@@ -11,18 +11,20 @@ const Dashboard = () => {
 
   useEffect(() => {
     loadDashboardData();
+    // Refresh in place when entries or models change, instead of polling
+    return subscribeEvents({ cache_invalidated: () => loadDashboardData(false) });
   }, []);
 
-  const loadDashboardData = async () => {
+  const loadDashboardData = async (showSpinner = true) => {
     try {
-      setLoading(true);
-      const [statsResponse, chartsResponse] = await Promise.all([
-        getDashboardStats(),
-        getDashboardCharts(),
-      ]);
+      if (showSpinner) setLoading(true);
+      // Stats and charts from one request (one entries read on the server)
+      const response = await getDashboardBundle({ sections: 'stats,charts', format: 'columnar' });
+      const { stats: statsData, charts } = response.data.data;
       
-      setStats(statsResponse.data.data);
-      setChartData(chartsResponse.data.data);
+      setStats(statsData);
+      // One row per day shared by every chart; each chart picks its columns
+      setChartData(columnsToRows(charts));
     } catch (err) {
       setError(err.response?.data?.error || 'Failed to load dashboard data');
     } finally {
@@ -108,13 +110,13 @@ const Dashboard = () => {
           <div className="card">
             <h2>🌟 Wellness Score Progression</h2>
             <ResponsiveContainer width="100%" height={400}>
-              <LineChart data={chartData.wellness_scores}>
+              <LineChart data={chartData}>
                 <CartesianGrid strokeDasharray="3 3" />
                 <XAxis dataKey="date" />
                 <YAxis domain={[0, 100]} />
                 <Tooltip />
                 <Legend />
-                <Line type="monotone" dataKey="score" stroke="#ffb3b3" strokeWidth={3} />
+                <Line type="monotone" dataKey="wellness_score" name="score" stroke="#ffb3b3" strokeWidth={3} />
               </LineChart>
             </ResponsiveContainer>
           </div>
@@ -123,15 +125,15 @@ const Dashboard = () => {
             <div className="card">
               <h2>😰 Stress Levels</h2>
               <ResponsiveContainer width="100%" height={350}>
-                <LineChart data={chartData.stress_levels}>
+                <LineChart data={chartData}>
                   <CartesianGrid strokeDasharray="3 3" />
                   <XAxis dataKey="date" />
                   <YAxis domain={[1, 10]} />
                   <Tooltip />
                   <Legend />
-                  <Line type="monotone" dataKey="morning" stroke="#ffd9b3" strokeWidth={2} />
-                  <Line type="monotone" dataKey="afternoon" stroke="#ffc7a3" strokeWidth={2} />
-                  <Line type="monotone" dataKey="night" stroke="#ffb3b3" strokeWidth={2} />
+                  <Line type="monotone" dataKey="stress_morning" name="morning" stroke="#ffd9b3" strokeWidth={2} />
+                  <Line type="monotone" dataKey="stress_afternoon" name="afternoon" stroke="#ffc7a3" strokeWidth={2} />
+                  <Line type="monotone" dataKey="stress_night" name="night" stroke="#ffb3b3" strokeWidth={2} />
                 </LineChart>
               </ResponsiveContainer>
             </div>
@@ -139,15 +141,15 @@ const Dashboard = () => {
             <div className="card">
               <h2>😴 Sleep Quality & Duration</h2>
               <ResponsiveContainer width="100%" height={350}>
-                <LineChart data={chartData.sleep_data}>
+                <LineChart data={chartData}>
                   <CartesianGrid strokeDasharray="3 3" />
                   <XAxis dataKey="date" />
                   <YAxis yAxisId="left" domain={[0, 12]} label={{ value: 'Hours', angle: -90, position: 'insideLeft' }} />
                   <YAxis yAxisId="right" domain={[1, 10]} orientation="right" label={{ value: 'Quality', angle: 90, position: 'insideRight' }} />
                   <Tooltip />
                   <Legend />
-                  <Bar yAxisId="left" dataKey="hours" fill="#ffc7a3" />
-                  <Line yAxisId="right" type="monotone" dataKey="quality" stroke="#ffd9b3" strokeWidth={3} />
+                  <Bar yAxisId="left" dataKey="sleep_hours" name="hours" fill="#ffc7a3" />
+                  <Line yAxisId="right" type="monotone" dataKey="sleep_quality" name="quality" stroke="#ffd9b3" strokeWidth={3} />
                 </LineChart>
               </ResponsiveContainer>
             </div>
@@ -157,12 +159,12 @@ const Dashboard = () => {
             <div className="card">
               <h2>💪 Exercise Activity</h2>
               <ResponsiveContainer width="100%" height={300}>
-                <BarChart data={chartData.exercise_data}>
+                <BarChart data={chartData}>
                   <CartesianGrid strokeDasharray="3 3" />
                   <XAxis dataKey="date" />
                   <YAxis />
                   <Tooltip />
-                  <Bar dataKey="minutes" fill="#ffb3b3" />
+                  <Bar dataKey="exercise_minutes" name="minutes" fill="#ffb3b3" />
                 </BarChart>
               </ResponsiveContainer>
             </div>
@@ -170,12 +172,12 @@ const Dashboard = () => {
             <div className="card">
               <h2>💧 Hydration Tracking</h2>
               <ResponsiveContainer width="100%" height={300}>
-                <BarChart data={chartData.water_data}>
+                <BarChart data={chartData}>
                   <CartesianGrid strokeDasharray="3 3" />
                   <XAxis dataKey="date" />
                   <YAxis />
                   <Tooltip />
-                  <Bar dataKey="intake" fill="#ffc7a3" />
+                  <Bar dataKey="water_intake" name="intake" fill="#ffc7a3" />
                 </BarChart>
               </ResponsiveContainer>
             </div>
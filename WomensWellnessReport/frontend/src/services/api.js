@@ -21,14 +21,19 @@ const api = axios.create({
 export const healthCheck = () => api.get('/health');
 
 // Entries
-export const getEntries = () => api.get('/entries');
+export const getEntries = (params = {}) => api.get('/entries', { params });
 export const getRecentEntries = (limit = 30) => api.get(`/entries/recent?limit=${limit}`);
 export const getEntryByDate = (date) => api.get(`/entries/${date}`);
 export const createEntry = (entryData) => api.post('/entries', entryData);
+export const createEntriesBulk = (entries) => api.post('/entries/bulk', { entries });
+// Delta sync: pass the version of the previous response as since (0 = full snapshot)
+export const getEntryChanges = (since = 0) => api.get('/entries/changes', { params: { since } });
 
 // Dashboard
 export const getDashboardStats = () => api.get('/dashboard/stats');
-export const getDashboardCharts = () => api.get('/dashboard/charts');
+export const getDashboardCharts = (params = {}) => api.get('/dashboard/charts', { params });
+// sections: comma-separated subset of stats,charts,ml_status,cycle (default: all)
+export const getDashboardBundle = (params = {}) => api.get('/dashboard/bundle', { params });
 
 // Reports
 export const getWeeklyReport = () => api.get('/reports/weekly');
@@ -52,11 +57,43 @@ export const exportSummary = () => api.get('/export/summary', { responseType: 'b
 
 // ML
 export const predictWellness = (entryData) => api.post('/ml/predict', entryData);
+export const predictWellnessBatch = (entries) => api.post('/ml/predict/batch', { entries });
 export const getMLStatus = () => api.get('/ml/status');
 
 // Profile
 export const getProfile = () => api.get('/profile');
 export const updateProfile = (profileData) => api.put('/profile', profileData);
 
+// Expand a ?format=columnar payload ({field: [values...]}) into row objects
+export const columnsToRows = (columns) => {
+  const fields = Object.keys(columns || {});
+  const length = fields.length ? columns[fields[0]].length : 0;
+  const rows = new Array(length);
+  for (let i = 0; i < length; i += 1) {
+    const row = {};
+    for (const field of fields) row[field] = columns[field][i];
+    rows[i] = row;
+  }
+  return rows;
+};
+
+// Server-sent events (entry_saved, model_trained, cache_invalidated) instead of
+// polling; handlers maps event names to callbacks. Returns an unsubscribe function.
+export const subscribeEvents = (handlers) => {
+  const source = new EventSource(`${baseURL}/events`);
+  Object.entries(handlers).forEach(([event, handler]) => {
+    source.addEventListener(event, (message) => handler(JSON.parse(message.data)));
+  });
+  return () => source.close();
+};
+
+// Apply a /entries/changes payload to a local store {version, entries: {date: entry}}
+export const applyEntryChanges = (store, changes) => {
+  const entries = changes.full ? {} : { ...(store?.entries || {}) };
+  for (const entry of changes.upserted) entries[entry.date] = entry;
+  for (const date of changes.deleted) delete entries[date];
+  return { version: changes.version, entries };
+};
+
 export default api;
 
@@ -0,0 +1,61 @@
+"""
+Gunicorn settings for the API server (render.yaml):
+
+    gunicorn -c gunicorn.conf.py api_server:app
+
+Process and thread model:
+
+- The master imports api_server once (preload_app) and, in when_ready,
+  imports XGBoost and TextBlob and reads the saved XGBoost model, then
+  freezes the heap (api_server.preload_shared_state). It serves no requests
+  and runs no threads, and its database connections are closed before forking.
+- WEB_CONCURRENCY workers (default 2) are forked from it and share those
+  libraries and models copy-on-write, so an extra worker costs its own
+  request state rather than another copy of the ML stack. After fork each
+  worker (api_server.init_worker) opens its own database pool, starts its
+  training thread and imports TensorFlow, whose runtime is not fork-safe
+  and so is never loaded in the master. Workers do not retrain at startup
+  unless the entries changed since the saved models were trained; then one
+  worker retrains and the others load its saved result.
+- Each worker is a gthread worker with GUNICORN_THREADS request threads
+  (default 8). An /api/events stream holds one of them for up to
+  EVENT_STREAM_SECONDS, so threads bound the open event streams per worker.
+  Models, the entries cache and the result cache are per process and shared
+  by its threads; the event log and the saved models on disk are shared by
+  all workers.
+- Scale throughput with threads first (requests mostly wait on the database)
+  and add workers for CPU-bound work (training, reports). Models retrained
+  by a worker replace its copy-on-write pages with private ones; a worker
+  restarted by gunicorn forks from the master's snapshot again.
+
+PRELOAD_APP=0 turns preloading off: every worker then imports the app, and
+loads its models, on its own.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+# Training runs on a background thread, so the heartbeat timeout only has to
+# cover the slowest request
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+preload_app = os.environ.get('PRELOAD_APP', '1') == '1'
+
+if preload_app:
+    # Tells api_server to leave its background threads to init_worker()
+    os.environ['WELLNESS_PRELOAD'] = '1'
+
+
+def when_ready(server):
+    if preload_app:
+        import api_server
+        costs = api_server.preload_shared_state()
+        server.log.info("Preloaded ML backends and models: %s", costs)
+
+
+def post_fork(server, worker):
+    if preload_app:
+        import api_server
+        api_server.init_worker()
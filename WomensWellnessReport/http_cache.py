@@ -0,0 +1,76 @@
+"""
+Conditional GET support for the read endpoints.
+
+Every read view is a function of the user's entries (data version), the
+published ML models (model id, the same in every worker process serving
+those models) and, for cycle and recommendation views, today's date.
+Those three make a weak ETag; Last-Modified is the
+latest of the corresponding timestamps. Validators are checked before the
+view runs, so a matching If-None-Match / If-Modified-Since returns 304
+without loading or computing anything.
+"""
+
+from datetime import datetime, date, time, timedelta, timezone
+from functools import wraps
+
+from flask import request, make_response
+
+from db_storage import get_data_version_info
+
+
+def _ceil_to_second(stamp):
+    if stamp.microsecond:
+        return stamp.replace(microsecond=0) + timedelta(seconds=1)
+    return stamp
+
+
+def read_validators(user_id, model_id, model_published_at):
+    """
+    (etag, last_modified) for a user's read views at this moment.
+    last_modified is naive UTC rounded up to whole seconds, as HTTP dates are.
+    """
+    data_version, data_updated_at = get_data_version_info(user_id)
+    today = date.today()
+    etag = f"{user_id}-d{data_version}-m{model_id}-{today.isoformat()}"
+    # Local midnight (the day-dependent views use local time) expressed in UTC
+    start_of_day = datetime.combine(today, time.min).astimezone(timezone.utc).replace(tzinfo=None)
+    last_modified = max(stamp for stamp in (data_updated_at, model_published_at, start_of_day) if stamp is not None)
+    return etag, _ceil_to_second(last_modified)
+
+
+def is_not_modified(etag, last_modified):
+    """Evaluate the request's conditional headers (If-None-Match wins over If-Modified-Since)"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since is not None:
+        return last_modified <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+
+def conditional_get(model_state, user_id='default_user'):
+    """
+    Decorator factory for read views. model_state() returns the live
+    predictor's (model_id, published_at). Successful responses carry
+    ETag, Last-Modified and Cache-Control: no-cache (store, but revalidate).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag, last_modified = read_validators(user_id, *model_state())
+
+            if is_not_modified(etag, last_modified):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            # Only once that second is over: a write later in the same second
+            # would otherwise still compare as "not modified since"
+            if last_modified <= datetime.utcnow():
+                response.last_modified = last_modified
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
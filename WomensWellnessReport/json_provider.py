@@ -0,0 +1,76 @@
+"""
+JSON provider for the Flask API.
+
+With orjson installed, responses are encoded in one native call that also
+understands numpy arrays and scalars, pandas Timestamps and Periods and NaN
+(sent as null, since NaN is not valid JSON). Keys stay sorted, as with Flask's
+default provider, so payloads and ETags are stable. Without orjson the
+standard provider is used, extended with the same numpy/pandas conversions.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def convert_value(value):
+    """JSON-ready form of values neither encoder handles natively"""
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return value.isoformat()
+    if isinstance(value, pd.Period):
+        return str(value)  # e.g. '2025-06' for monthly aggregates
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (np.ndarray, pd.Series, pd.Index)):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class NumpyJSONProvider(DefaultJSONProvider):
+    """Flask's standard provider, plus numpy/pandas values"""
+
+    @staticmethod
+    def default(value):
+        try:
+            return convert_value(value)
+        except TypeError:
+            return DefaultJSONProvider.default(value)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """orjson-backed provider (see module docstring)"""
+
+    option = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS) if ORJSON_AVAILABLE else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=convert_value, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Trailing newline as in Flask's default responses
+        body = orjson.dumps(obj, default=convert_value, option=self.option | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def make_json_provider(app):
+    """The fastest available provider for app"""
+    return OrjsonProvider(app) if ORJSON_AVAILABLE else NumpyJSONProvider(app)
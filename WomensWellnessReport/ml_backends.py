@@ -0,0 +1,85 @@
+"""
+Deferred imports of the ML backends: XGBoost, TensorFlow/Keras and TextBlob.
+
+Each backend is imported on first use, exactly once, behind a lock, so a
+process that never predicts (health checks, exports) never pays for it.
+The *_AVAILABLE flags only check that a package is installed (find_spec,
+no import). Every load is timed; backend_load_stats() reports the costs for
+/api/ml/status and WellnessPredictor.warmup().
+"""
+
+import importlib.util
+import threading
+import time
+from types import SimpleNamespace
+
+
+class LazyBackend:
+    """A module (or set of names) imported on the first get()"""
+
+    def __init__(self, name, loader, package=None):
+        self.name = name
+        self.installed = importlib.util.find_spec(package or name) is not None
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._value = None
+        self._attempted = False
+        self.load_seconds = None
+        self.error = None
+
+    def get(self):
+        """The loaded backend, or None when it is not installed or failed to import"""
+        if self._attempted:
+            return self._value
+        with self._lock:
+            if not self._attempted:
+                if self.installed:
+                    started = time.perf_counter()
+                    try:
+                        self._value = self._loader()
+                    except Exception as e:
+                        self.error = str(e)
+                        print(f"Could not load {self.name}: {e}")
+                    self.load_seconds = round(time.perf_counter() - started, 3)
+                self._attempted = True
+        return self._value
+
+    def stats(self):
+        return {
+            "installed": self.installed,
+            "loaded": self._value is not None,
+            "load_seconds": self.load_seconds,
+            "error": self.error
+        }
+
+
+def _load_xgboost():
+    import xgboost
+    return xgboost
+
+
+def _load_tensorflow():
+    import tensorflow  # noqa: F401
+    from tensorflow import keras
+    from tensorflow.keras import layers
+    return SimpleNamespace(keras=keras, layers=layers)
+
+
+def _load_textblob():
+    from textblob import TextBlob
+    return TextBlob
+
+
+xgboost_backend = LazyBackend('xgboost', _load_xgboost)
+# TensorFlow is optional in production (Render); LSTM features are disabled without it
+tensorflow_backend = LazyBackend('tensorflow', _load_tensorflow)
+textblob_backend = LazyBackend('textblob', _load_textblob)
+
+BACKENDS = [xgboost_backend, tensorflow_backend, textblob_backend]
+
+TF_AVAILABLE = tensorflow_backend.installed
+
+
+def backend_load_stats():
+    """Per-backend load state and import cost in seconds"""
+    return {backend.name: backend.stats() for backend in BACKENDS}
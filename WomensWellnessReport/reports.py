@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+from entry_frame import format_entry_date
+
 def generate_weekly_report(df):
     """Generate comprehensive weekly wellness report"""
     
@@ -34,7 +36,7 @@ def generate_weekly_report(df):
     html = f"""
     <div style="background: linear-gradient(135deg, #ffb3b3 0%, #ffc7a3 50%, #ffd9b3 100%); padding: 25px; border-radius: 15px; color: #2d1b1b; margin-bottom: 25px;">
         <h2 style="margin-top: 0;">📋 Weekly Wellness Report</h2>
-        <p style="font-size: 1.1em;">Week of {recent_data.iloc[0]['date']} to {recent_data.iloc[-1]['date']}</p>
+        <p style="font-size: 1.1em;">Week of {format_entry_date(recent_data.iloc[0]['date'])} to {format_entry_date(recent_data.iloc[-1]['date'])}</p>
     </div>
     
     <div style="display: grid; grid-template-columns: repeat(4, 1fr); gap: 15px; margin-bottom: 25px;">
@@ -177,7 +179,7 @@ def generate_weekly_report(df):
         wellness_score = row.get('wellness_score', 0)
         html += f"""
         <tr style="border-bottom: 1px solid #ddd;">
-            <td style="padding: 10px;">{row['date']}</td>
+            <td style="padding: 10px;">{format_entry_date(row['date'])}</td>
             <td style="padding: 10px; text-align: center;">{wellness_score:.1f}</td>
             <td style="padding: 10px; text-align: center;">{row.get('sleep_hours', 0):.1f}h</td>
             <td style="padding: 10px; text-align: center;">{row.get('exercise_minutes', 0):.0f}min</td>
@@ -236,7 +238,7 @@ def generate_monthly_report(df, ml_predictor):
     <div style="background: linear-gradient(135deg, #ffb3b3 0%, #ffc7a3 50%, #ffd9b3 100%); padding: 25px; border-radius: 15px; color: #2d1b1b; margin-bottom: 25px;">
         <h2 style="margin-top: 0;">📅 Monthly Wellness Report</h2>
         <p style="font-size: 1.1em;">Comprehensive Analysis & AI Predictions</p>
-        <p>Period: {recent_data.iloc[0]['date']} to {recent_data.iloc[-1]['date']}</p>
+        <p>Period: {format_entry_date(recent_data.iloc[0]['date'])} to {format_entry_date(recent_data.iloc[-1]['date'])}</p>
     </div>
     """
     
@@ -0,0 +1,38 @@
+"""
+One database session, on one pooled connection, per Flask request.
+
+The storage layer stays free of Flask: init_request_sessions registers the
+request scope with database.register_session_scope, so get_db() inside a
+request returns the request's session and close_db() leaves it open until
+the app context is torn down.
+"""
+
+from flask import current_app, g, has_app_context
+
+import database
+
+REQUEST_SESSIONS_EXTENSION = 'wellness_request_sessions'
+
+
+def _request_session(create):
+    if not has_app_context() or REQUEST_SESSIONS_EXTENSION not in current_app.extensions:
+        return None
+    if create and 'db_session' not in g:
+        # Bound to one connection so commits inside the request do not
+        # hand it back to the pool and check out another
+        g.db_connection = database.engine.connect()
+        g.db_session = database.SessionLocal(bind=g.db_connection)
+    return g.get('db_session')
+
+
+def init_request_sessions(app):
+    """Share one session and one pooled connection per request of a Flask app"""
+    app.extensions[REQUEST_SESSIONS_EXTENSION] = True
+    database.register_session_scope(_request_session)
+
+    @app.teardown_appcontext
+    def close_request_session(exc):
+        db = g.pop('db_session', None)
+        if db is not None:
+            db.close()
+            g.pop('db_connection').close()
@@ -0,0 +1,138 @@
+"""
+Memoization of computed views (reports, recommendations, cycle predictions,
+analytics) keyed by (user_id, function, params, data_version, model_id).
+
+The analysis functions are pure functions of a user's entries, and of the
+published models for the ML-backed ones, so a result stays valid until the
+user's data version or the model changes. A repeat page view then costs one
+data-version read and a dictionary lookup. Memory is bounded by the pickled
+size of the stored results (LRU eviction). With a persist_dir, each
+(user, function) slot is also written to disk so a restarted worker starts
+warm; the stored key is checked on load, so stale slots are never served.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+from db_storage import get_data_version
+
+
+class ResultCache:
+    """Byte-bounded LRU of computed results, validated against the data version"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, persist_dir=None, load_version=get_data_version):
+        self.max_bytes = max_bytes
+        self.persist_dir = persist_dir
+        self._load_version = load_version
+        self._results = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if persist_dir:
+            os.makedirs(persist_dir, exist_ok=True)
+
+    def get_or_compute(self, user_id, name, compute, params=(), model_id=None):
+        """
+        Cached result of compute() for this user, function name and params.
+        model_id identifies the models the result depends on (None if it
+        does not use them). Results are shared: callers must not mutate them.
+        """
+        key = (user_id, name, params, self._load_version(user_id), model_id)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return cached[0]
+
+        value, payload = self._read_slot(key)
+        if payload is not None:
+            with self._lock:
+                self.disk_hits += 1
+        else:
+            with self._lock:
+                self.misses += 1
+            value = compute()
+            try:
+                payload = pickle.dumps((key, value), protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                print(f"Result cache: not caching {name}: {e}")
+                return value
+            self._write_slot(key, payload)
+
+        self._store(key, value, len(payload))
+        return value
+
+    def invalidate(self, user_id=None):
+        """Drop the in-memory results of one user, or all of them"""
+        with self._lock:
+            for key in [k for k in self._results if user_id is None or k[0] == user_id]:
+                self.bytes -= self._results.pop(key)[1]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._results),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 3) if lookups else None,
+                "persist_dir": self.persist_dir
+            }
+
+    def _store(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._results.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._results[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self._results.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def _slot_path(self, key):
+        # One file per (user, function): a newer version overwrites the old one
+        digest = hashlib.sha256(repr(key[:2]).encode()).hexdigest()[:32]
+        return os.path.join(self.persist_dir, f"{digest}.pkl")
+
+    def _read_slot(self, key):
+        if not self.persist_dir:
+            return None, None
+        try:
+            with open(self._slot_path(key), 'rb') as f:
+                payload = f.read()
+            stored_key, value = pickle.loads(payload)
+        except FileNotFoundError:
+            return None, None
+        except Exception as e:
+            print(f"Result cache: unreadable slot for {key[1]}: {e}")
+            return None, None
+        if stored_key != key:
+            return None, None
+        return value, payload
+
+    def _write_slot(self, key, payload):
+        if not self.persist_dir:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.persist_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, self._slot_path(key))
+        except OSError as e:
+            print(f"Result cache: could not persist {key[1]}: {e}")
@@ -94,7 +94,8 @@ def initialize_database():
     print("\n🗄️  Initializing database...")
     try:
         from database import init_db
-        init_db()
+        # Also upgrades legacy entry dates (migrate_entry_dates)
+        init_db(migrate=True)
         print("✅ Database initialized successfully!")
         return True
     except Exception as e:
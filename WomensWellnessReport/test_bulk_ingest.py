@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Test bulk entry ingestion: per-row validation, merge semantics and batch scoring"""
+
+from bulk_ingest import ingest_entries
+from db_storage import get_entry_by_date, get_data_version, save_wellness_entry
+from ml_models import WellnessPredictor
+
+
+def test_bulk_ingest_reports_row_errors_and_saves_the_rest(temp_db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    predictor = WellnessPredictor(load_saved=False)
+    records = [
+        {'date': '2025-03-01T08:30:00', 'morning_stress': '2', 'afternoon_stress': 4, 'night_stress': 6, 'sleep_hours': '7.5'},
+        {'date': 'not-a-date', 'sleep_hours': 8},
+        {'date': '2025-03-02', 'water_intake': 'lots'},
+        'not an entry',
+        {'date': '2025-03-03', 'exercise_minutes': 20.4},
+        {'date': '2025-03-03', 'exercise_minutes': 45},
+    ]
+
+    result = ingest_entries(records, predictor)
+
+    assert result['received'] == 6
+    assert result['saved'] == 2
+    assert [error['index'] for error in result['errors']] == [1, 2, 3, 4]
+    # Normalised dates of the saved rows (announced to event streams)
+    assert result['dates'] == ['2025-03-01', '2025-03-03']
+    first = get_entry_by_date('2025-03-01')
+    assert first['stress_morning'] == 2
+    assert first['average_stress'] == 4
+    assert 0 <= first['wellness_score'] <= 100
+    # The later duplicate wins
+    assert get_entry_by_date('2025-03-03')['exercise_minutes'] == 45
+    assert get_data_version('default_user') == 1
+
+
+def test_bulk_ingest_merges_into_existing_entries(temp_db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_wellness_entry({'date': '2025-03-01', 'sleep_hours': 6, 'notes': 'original', 'on_period': True})
+
+    ingest_entries([{'date': '2025-03-01', 'notes': 'updated'}], WellnessPredictor(load_saved=False))
+
+    entry = get_entry_by_date('2025-03-01')
+    assert entry['notes'] == 'updated'
+    assert entry['sleep_hours'] == 6
+    assert entry['on_period'] is True
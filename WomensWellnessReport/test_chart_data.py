@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Test the vectorized dashboard chart payload"""
+
+import numpy as np
+import pandas as pd
+
+from chart_data import build_chart_payload, build_chart_columns
+
+
+def test_chart_payload_series():
+    df = pd.DataFrame({
+        'date': pd.to_datetime(['2025-01-01', '2025-01-02']),
+        'wellness_score': [71.5, np.nan],
+        'stress_morning': [3.0, 4.0],
+        'stress_afternoon': [5.0, np.nan],
+        'stress_night': [2.0, 1.0],
+        'sleep_hours': [7.5, 6.0],
+        'sleep_quality': [8.0, np.nan],
+        'exercise_minutes': [30.0, 12.9],
+        'water_intake': [np.nan, 2000.0],
+    })
+
+    payload = build_chart_payload(df)
+
+    assert payload['wellness_scores'] == [
+        {'date': '2025-01-01 00:00:00', 'score': 71.5},
+        {'date': '2025-01-02 00:00:00', 'score': 0.0},
+    ]
+    assert payload['stress_levels'][1] == {'date': '2025-01-02 00:00:00', 'morning': 4.0, 'afternoon': 0.0, 'night': 1.0}
+    assert [point['minutes'] for point in payload['exercise_data']] == [30, 12]
+    assert [point['intake'] for point in payload['water_data']] == [0, 2000]
+
+    columns = build_chart_columns(df)
+    assert columns['date'] == ['2025-01-01', '2025-01-02']
+    assert columns['wellness_score'] == [71.5, 0.0]
+    assert columns['exercise_minutes'] == [30, 12]
+    # The columnar form carries the same values as the row series
+    assert [point['morning'] for point in payload['stress_levels']] == columns['stress_morning']
+
+
+def test_empty_chart_payload():
+    assert build_chart_payload(pd.DataFrame(columns=['date'])) == {
+        'wellness_scores': [], 'stress_levels': [], 'sleep_data': [], 'exercise_data': [], 'water_data': []
+    }
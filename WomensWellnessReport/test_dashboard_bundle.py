@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Test that GET /api/dashboard/bundle matches the standalone dashboard endpoints"""
+
+from datetime import date, timedelta
+
+
+def save_cycles(client, days=70):
+    # Periods every 28 days, so the cycle section has a prediction
+    start = date(2025, 1, 1)
+    response = client.post('/api/entries/bulk', json=[{
+        'date': (start + timedelta(days=day)).isoformat(),
+        'morning_stress': 2 + day % 5, 'afternoon_stress': 3, 'night_stress': 1 + day % 3,
+        'average_stress': 3 + day % 4,
+        'sleep_hours': 6 + day % 3, 'sleep_quality': 5 + day % 4,
+        'exercise_minutes': 10 * (day % 5), 'water_intake': 1500 + 50 * (day % 7),
+        'wellness_score': 50 + day % 30,
+        'on_period': day % 28 < 5
+    } for day in range(days)])
+    assert response.get_json()['data']['saved'] == days
+
+
+def test_sections_match_standalone_endpoints(api_client):
+    save_cycles(api_client)
+    from api_server import DASHBOARD_SECTIONS
+    bundle = api_client.get('/api/dashboard/bundle').get_json()['data']
+    assert set(bundle) == set(DASHBOARD_SECTIONS)
+
+    assert bundle['stats'] == api_client.get('/api/dashboard/stats').get_json()['data']
+    assert bundle['charts'] == api_client.get('/api/dashboard/charts').get_json()['data']
+    assert bundle['cycle'] is not None
+    assert bundle['cycle'] == api_client.get('/api/cycle/predict').get_json()['data']
+    # The bundle leaves out the live training queue and load costs
+    ml_status = api_client.get('/api/ml/status').get_json()['data']
+    assert bundle['ml_status'] == {key: value for key, value in ml_status.items()
+                                   if key not in ('training', 'load_costs')}
+
+    columnar = api_client.get('/api/dashboard/bundle?sections=charts&format=columnar').get_json()['data']
+    assert set(columnar) == {'charts'}
+    assert columnar['charts'] == api_client.get('/api/dashboard/charts?format=columnar').get_json()['data']
+
+
+def test_unknown_sections_are_rejected(api_client):
+    response = api_client.get('/api/dashboard/bundle?sections=stats,weather')
+    assert response.status_code == 400
+    assert 'weather' in response.get_json()['error']
+
+
+def test_bundle_revalidates_with_etag(api_client):
+    save_cycles(api_client, 10)
+    first = api_client.get('/api/dashboard/bundle?sections=stats')
+    etag = first.headers['ETag']
+    assert first.status_code == 200
+
+    cached = api_client.get('/api/dashboard/bundle?sections=stats', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.headers['ETag'] == etag
+
+    save_cycles(api_client, 11)
+    changed = api_client.get('/api/dashboard/bundle?sections=stats', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.get_json()['data']['stats']['total_entries'] == 11
+
+
+def test_only_ml_status_is_recomputed_for_new_models(api_client, monkeypatch):
+    save_cycles(api_client, 10)
+    import api_server
+    stats = api_client.get('/api/dashboard/bundle?sections=stats').get_json()['data']
+    monthly = api_client.get('/api/reports/monthly').get_json()
+    with_status = api_client.get('/api/dashboard/bundle').get_json()['data']
+
+    # A newly published model must not evict results that never read it
+    generate_monthly_report, dashboard_stats = api_server.generate_monthly_report, api_server.dashboard_stats
+    def recompute(*args, **kwargs):
+        raise AssertionError('recomputed')
+    monkeypatch.setattr(api_server, 'generate_monthly_report', recompute)
+    monkeypatch.setattr(api_server, 'dashboard_stats', recompute)
+    monkeypatch.setattr(api_server.ml_predictor, 'model_id', 'newly-published')
+    assert api_client.get('/api/dashboard/bundle?sections=stats').get_json()['data'] == stats
+    assert api_client.get('/api/reports/monthly').get_json() == monthly
+
+    monkeypatch.setattr(api_server, 'generate_monthly_report', generate_monthly_report)
+    monkeypatch.setattr(api_server, 'dashboard_stats', dashboard_stats)
+    calls = []
+    monkeypatch.setattr(api_server, 'model_status', lambda total: calls.append(total) or {})
+    assert api_client.get('/api/dashboard/bundle').get_json()['data'] != with_status
+    assert calls == [10]
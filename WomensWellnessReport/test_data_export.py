@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Test the streamed CSV and NDJSON exports"""
+
+import json
+from datetime import date, datetime
+
+import pytest
+
+from database import read_snapshot
+
+from data_export import export_to_csv, stream_csv, stream_ndjson
+from db_storage import save_wellness_entry, load_entries_frame, iter_entry_chunks, get_symptom_keys
+
+
+def test_streamed_exports_match_whole_frame_export(temp_db):
+    symptoms = [{'cramps': True}, None, {'cramps': False, 'fatigue': True}, {}, {'headache': True}]
+    for day, entry_symptoms in enumerate(symptoms, start=1):
+        save_wellness_entry({
+            'date': f'2025-03-0{day}',
+            'timestamp': datetime(2025, 3, day, 21, 0, 0, 500 * (day % 2)).isoformat(),
+            'sleep_hours': 7.5,
+            'exercise_minutes': day * 10,
+            'symptoms': entry_symptoms
+        })
+
+    keys = get_symptom_keys(chunk_size=2)
+    assert keys == ['cramps', 'fatigue', 'headache']
+
+    # Chunks of two rows render exactly like the single-frame export
+    streamed = ''.join(stream_csv(iter_entry_chunks(chunk_size=2), keys))
+    assert streamed == export_to_csv(load_entries_frame())
+    assert streamed.count('\n') == len(symptoms) + 1
+
+    # Same layout as the export built from entry dicts: integer metrics as
+    # integers, ISO timestamps and the frontend stress aliases
+    header, first = streamed.splitlines()[:2]
+    assert 'stress_night,morning_stress,afternoon_stress,night_stress' in header
+    row = dict(zip(header.split(','), first.split(',')))
+    assert row['exercise_minutes'] == '10'
+    assert row['timestamp'] == '2025-03-01T21:00:00.000500'
+
+    lines = ''.join(stream_ndjson(iter_entry_chunks(chunk_size=2))).splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [record['date'] for record in records] == [f'2025-03-0{day}' for day in range(1, 6)]
+    assert records[2]['symptoms'] == {'cramps': False, 'fatigue': True}
+    assert records[0]['exercise_minutes'] == 10
+    assert isinstance(records[0]['exercise_minutes'], int)
+
+    # Rendering leaves the caller's frame alone, with or without symptoms
+    frame = load_entries_frame(columns=['timestamp', 'exercise_minutes'])
+    before = frame.copy()
+    ''.join(stream_csv([frame], []))
+    assert frame.equals(before)
+
+
+def test_export_reads_one_snapshot(temp_db):
+    save_wellness_entry({'date': '2025-03-01', 'symptoms': {'cramps': True}})
+
+    with read_snapshot() as snapshot:
+        keys = get_symptom_keys(snapshot=snapshot)
+        # Saved on another connection after the header was fixed
+        save_wellness_entry({'date': '2025-03-02', 'symptoms': {'fatigue': True}})
+        streamed = ''.join(stream_csv(iter_entry_chunks(snapshot=snapshot), keys))
+
+    assert keys == ['cramps']
+    assert streamed.count('\n') == 2
+    assert get_symptom_keys() == ['cramps', 'fatigue']
+
+
+def test_columnar_export_round_trip(temp_db):
+    pytest.importorskip('pyarrow')
+    from columnar_export import write_entries, read_entries
+
+    for day, symptoms in enumerate([{'cramps': True}, None, {'fatigue': True}], start=1):
+        save_wellness_entry({'date': f'2025-04-0{day}', 'sleep_hours': 6 + day, 'symptoms': symptoms})
+
+    start, end = date(2025, 4, 2), date(2025, 4, 3)
+    df = load_entries_frame(start=start, end=end)
+    for fmt in ('parquet', 'arrow'):
+        data = write_entries(df, fmt, start, end)
+        # Same entries, same bytes: safe to serve from the result cache
+        assert write_entries(df, fmt, start, end) == data
+        exported = read_entries(data, fmt)
+        assert list(exported['date']) == [start, end]
+        assert list(exported['sleep_hours']) == [8.0, 9.0]
+        assert exported['symptom_fatigue'].tolist() == [False, True]
+        assert exported['symptom_fatigue'].dtype == bool
+
+
+def test_columnar_export_keeps_stored_precision(api_client):
+    pytest.importorskip('pyarrow')
+    from columnar_export import read_entries
+
+    api_client.post('/api/entries', json={'date': '2025-04-01', 'sleep_hours': 7.1, 'water_intake': 1890.53})
+    for fmt in ('parquet', 'arrow'):
+        response = api_client.get(f'/api/export/{fmt}')
+        assert response.status_code == 200
+        exported = read_entries(response.data, fmt)
+        # float32 would give 7.0999999 and 1890.5300293
+        assert exported['sleep_hours'].tolist() == [7.1]
+        assert exported['water_intake'].tolist() == [1890.53]
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Test the wellness entry storage queries against a temporary database"""
+
+from datetime import date, timedelta
+
+import numpy as np
+from flask import Flask
+from sqlalchemy import event
+
+import database
+import db_storage
+from request_sessions import init_request_sessions
+from db_storage import (save_wellness_entry, get_all_entries, get_entries_page,
+                        get_entry_by_date, delete_entry, load_entries_frame,
+                        bulk_upsert_entries, get_entry_changes)
+
+
+def add_days(count, start=date(2025, 1, 1)):
+    for offset in range(count):
+        save_wellness_entry({
+            'date': (start + timedelta(days=offset)).isoformat(),
+            'sleep_hours': 7.0,
+            'exercise_minutes': offset,
+            'symptoms': {}
+        })
+
+
+def test_range_and_cursor_pagination(temp_db):
+    add_days(10)
+
+    window = get_entries_page(start='2025-01-03', end='2025-01-05')
+    assert [e['date'] for e in window] == ['2025-01-03', '2025-01-04', '2025-01-05']
+
+    first = get_entries_page(limit=4)
+    second = get_entries_page(after=first[-1]['date'], limit=4)
+    third = get_entries_page(after=second[-1]['date'], limit=4)
+    dates = [e['date'] for e in first + second + third]
+    assert dates == [e['date'] for e in get_all_entries()]
+    assert len(third) == 2
+
+
+def test_lookup_and_delete_by_date(temp_db):
+    add_days(3)
+
+    assert get_entry_by_date('2025-01-02')['exercise_minutes'] == 1
+    assert get_entry_by_date('2025-02-01') is None
+
+    assert delete_entry('2025-01-02')
+    assert get_entry_by_date('2025-01-02') is None
+    assert len(get_all_entries()) == 2
+
+
+def test_load_entries_frame_is_typed(temp_db):
+    add_days(5)
+    save_wellness_entry({'date': '2025-01-06', 'on_period': True, 'symptoms': {'cramping': True}})
+
+    df = load_entries_frame(columns=['sleep_hours', 'exercise_minutes', 'on_period'], start='2025-01-02')
+    assert list(df.columns) == ['date', 'sleep_hours', 'exercise_minutes', 'on_period']
+    assert len(df) == 5
+    assert df['date'].dtype.kind == 'M'
+    assert df['sleep_hours'].dtype == np.float64
+    assert df['on_period'].dtype == bool
+    assert df['on_period'].tolist() == [False, False, False, False, True]
+    assert np.isnan(df['sleep_hours'].iloc[-1])
+
+    compact = load_entries_frame(columns=['sleep_hours'], compact=True)
+    assert compact['sleep_hours'].dtype == np.float32
+
+    assert load_entries_frame(user_id='nobody').empty
+
+
+def test_entry_cache_invalidated_by_writes(temp_db):
+    from entry_cache import EntryFrameCache
+
+    cache = EntryFrameCache(max_users=1)
+    add_days(3)
+
+    assert len(cache.get_frame(columns=['sleep_hours'])) == 3
+    assert len(cache.get_frame(columns=['on_period'])) == 3
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    save_wellness_entry({'date': '2025-01-04', 'sleep_hours': 6.0})
+    assert len(cache.get_frame()) == 4
+    delete_entry('2025-01-01')
+    assert cache.get_frame(start='2025-01-03')['date'].dt.day.tolist() == [3, 4]
+    assert cache.misses == 3
+
+    cache.get_frame(user_id='someone_else')
+    assert cache.stats()['evictions'] == 1
+
+
+def test_save_merges_partial_update(temp_db):
+    first_id = save_wellness_entry({'date': '2025-02-01', 'sleep_hours': 6.5, 'notes': 'tired', 'unknown_field': 1})
+    second_id = save_wellness_entry({'date': '2025-02-01T09:00:00', 'notes': 'better'})
+
+    assert first_id == second_id
+    entry = get_entry_by_date('2025-02-01')
+    assert entry['notes'] == 'better'
+    assert entry['sleep_hours'] == 6.5
+
+
+def test_save_with_only_a_date_is_idempotent(temp_db):
+    first_id = save_wellness_entry({'date': '2025-02-01', 'sleep_hours': 6.5})
+    # Nothing to update: the conflict must still return the existing id
+    assert save_wellness_entry({'date': '2025-02-01'}) == first_id
+    assert save_wellness_entry({'date': '2025-02-01'}) == first_id
+    assert get_entry_by_date('2025-02-01')['sleep_hours'] == 6.5
+
+
+def test_writes_merge_without_on_conflict(temp_db, monkeypatch):
+    # Dialects without ON CONFLICT go through the ORM merge and update-then-insert
+    monkeypatch.setattr(db_storage, 'dialect_name', lambda conn: 'other')
+    monkeypatch.setattr(database, 'dialect_name', lambda conn: 'other')
+    first_id = save_wellness_entry({'date': '2025-02-01', 'sleep_hours': 6.5, 'notes': 'tired'})
+    second_id = save_wellness_entry({'date': '2025-02-01', 'notes': 'better'})
+
+    assert first_id == second_id
+    entry = get_entry_by_date('2025-02-01')
+    assert (entry['notes'], entry['sleep_hours']) == ('better', 6.5)
+
+    saved, errors = bulk_upsert_entries([
+        (0, {'date': date(2025, 2, 1), 'sleep_hours': 8.0}),
+        (1, {'date': date(2025, 2, 2), 'sleep_hours': 7.0}),
+    ])
+    assert (saved, errors) == (2, [])
+    assert [(e['date'], e['notes'], e['sleep_hours']) for e in get_all_entries()] == [
+        ('2025-02-01', 'better', 8.0), ('2025-02-02', '', 7.0)
+    ]
+
+
+def test_data_version_bump_is_one_upsert(temp_db):
+    statements = []
+    event.listen(temp_db, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    with temp_db.begin() as conn:
+        assert [database.bump_data_version(conn, 'new_user') for _ in range(3)] == [1, 2, 3]
+    assert len(statements) == 3 and all('ON CONFLICT' in sql for sql in statements)
+
+
+def test_sqlite_connections_use_wal_profile(temp_db):
+    with temp_db.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == 'wal'
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == database.SQLITE_PRAGMAS['busy_timeout']
+
+    described = database.describe_engine()
+    assert described['pragmas']['journal_mode'] == 'wal'
+    assert described['pool']['size'] == database.DB_POOL_SIZE
+    assert described['pool']['max_overflow'] == database.DB_MAX_OVERFLOW
+    assert described['pool']['checked_out'] == 0
+
+
+def test_request_reuses_one_session(temp_db):
+    app = Flask(__name__)
+    init_request_sessions(app)
+    checkouts = []
+    event.listen(temp_db, 'checkout', lambda *args: checkouts.append(1))
+
+    with app.app_context():
+        save_wellness_entry({'date': '2025-03-01', 'sleep_hours': 7.0})
+        assert len(get_all_entries()) == 1
+        assert get_entry_by_date('2025-03-01')['sleep_hours'] == 7.0
+        assert temp_db.pool.checkedout() == 1
+
+    assert len(checkouts) == 1
+    assert temp_db.pool.checkedout() == 0
+
+
+def test_entry_changes_since_version(temp_db):
+    add_days(3)
+    snapshot = get_entry_changes(0)
+    assert snapshot['full'] and len(snapshot['upserted']) == 3
+    assert get_entry_changes(snapshot['version'])['upserted'] == []
+
+    save_wellness_entry({'date': '2025-01-02', 'sleep_hours': 9.0})
+    bulk_upsert_entries([(0, {'date': date(2025, 2, 1), 'sleep_hours': 6.0})])
+    delete_entry('2025-01-03')
+
+    delta = get_entry_changes(snapshot['version'])
+    assert not delta['full']
+    assert delta['version'] == snapshot['version'] + 3
+    assert [(e['date'], e['sleep_hours']) for e in delta['upserted']] == [('2025-01-02', 9.0), ('2025-02-01', 6.0)]
+    assert delta['deleted'] == ['2025-01-03']
+    # A version the database never reached falls back to a snapshot
+    assert get_entry_changes(delta['version'] + 10)['full']
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Test the migration of legacy string dates to the indexed DATE column"""
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+import database
+
+
+def test_migrate_legacy_string_dates(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    monkeypatch.setattr(database, 'engine', engine)
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE wellness_entries (id INTEGER PRIMARY KEY, user_id VARCHAR, "
+            "date VARCHAR NOT NULL, timestamp DATETIME, sleep_hours FLOAT)"
+        ))
+        conn.execute(text(
+            "INSERT INTO wellness_entries (id, user_id, date, timestamp, sleep_hours) VALUES "
+            "(1, 'default_user', '2025-11-01', '2025-11-01 21:00:00', 7.0), "
+            "(2, 'default_user', '2025-11-02T08:00:00', '2025-11-02 08:00:00', 6.0), "
+            "(3, 'default_user', '', '2025-11-03 22:00:00', 8.0), "
+            "(4, 'default_user', '', '2025-11-01 22:30:00', 5.0)"
+        ))
+    assert database.entry_dates_need_migration()
+
+    report = database.migrate_entry_dates()
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT id, date FROM wellness_entries ORDER BY id")).fetchall()
+        moved = conn.execute(text(f"SELECT id, sleep_hours FROM {database.ENTRY_DUPLICATES_TABLE}")).fetchall()
+    # Undated rows take their timestamp's day; a clash keeps the properly dated row
+    assert rows == [(1, '2025-11-01'), (2, '2025-11-02'), (3, '2025-11-03')]
+    # and moves the other one aside instead of deleting it
+    assert moved == [(4, 5.0)]
+    assert report == {'normalized': 2, 'moved_aside': [4], 'backup_table': database.ENTRY_DUPLICATES_TABLE}
+
+    with engine.connect() as conn:
+        version = conn.execute(text("SELECT version FROM user_data_versions WHERE user_id = 'default_user'")).scalar()
+    assert version == 1
+
+    indexes = {ix['name']: ix for ix in inspect(engine).get_indexes('wellness_entries')}
+    assert indexes[database.ENTRY_USER_DATE_INDEX]['unique']
+
+    # Running again is a no-op
+    assert not database.entry_dates_need_migration()
+    assert database.migrate_entry_dates() is None
+
+
+def test_init_db_leaves_postgresql_migration_to_an_explicit_step(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    monkeypatch.setattr(database, 'engine', engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE wellness_entries (id INTEGER PRIMARY KEY, user_id VARCHAR, date VARCHAR)"))
+    migrations = []
+    monkeypatch.setattr(database, 'migrate_entry_dates', lambda: migrations.append(1))
+
+    monkeypatch.setattr(engine.dialect, 'name', 'postgresql')
+    with pytest.raises(RuntimeError, match='migrate-dates'):
+        database.init_db()
+    assert migrations == []
+
+    monkeypatch.setattr(engine.dialect, 'name', 'sqlite')
+    database.init_db()
+    assert migrations == [1]
+
+
+def test_invalid_postgresql_index_still_needs_migration(temp_db, monkeypatch):
+    assert not database.entry_dates_need_migration()
+
+    # What a failed CREATE INDEX CONCURRENTLY leaves behind
+    monkeypatch.setattr(temp_db.dialect, 'name', 'postgresql')
+    monkeypatch.setattr(database, '_postgresql_index_is_valid', lambda name: False)
+    assert database.entry_dates_need_migration()
+    with pytest.raises(RuntimeError, match='migrate-dates'):
+        database.init_db()
+
+
+def test_ready_fails_until_dates_are_migrated(api_client, monkeypatch):
+    import api_server
+    monkeypatch.setattr(api_server, 'entry_dates_need_migration', lambda: True)
+    response = api_client.get('/api/ready')
+    assert response.status_code == 503
+    assert 'migrate-dates' in response.get_json()['error']
+
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Test the server-sent event bus and its database broker"""
+
+import queue
+import time
+
+from events import EventBus, DatabaseEventBroker, stream_events, format_event
+
+
+class OutOfOrderBroker:
+    """Event log whose rows become visible in any order, as PostgreSQL commits can"""
+
+    def __init__(self):
+        self.rows = {}
+
+    def commit(self, event_id):
+        self.rows[event_id] = (event_id, 'entry_saved', {'id': event_id}, 'default_user')
+
+    def read(self, after, upto=None, user_id=None, limit=1000):
+        ids = sorted(i for i in self.rows if i > after and (upto is None or i <= upto))
+        return [self.rows[i] for i in ids[:limit]]
+
+    def latest_id(self):
+        return max(self.rows, default=0)
+
+    def listen(self, worker_id):
+        pass
+
+
+def test_memory_bus_streams_events_per_user():
+    bus = EventBus()
+    mine = bus.subscribe('default_user')
+    other = bus.subscribe('someone_else')
+    stream = stream_events(bus, mine, keepalive_seconds=0.01)
+
+    assert next(stream).startswith('retry:')
+    bus.publish('entry_saved', {'dates': ['2025-01-01']})
+    assert next(stream) == 'id: 1\nevent: entry_saved\ndata: {"dates": ["2025-01-01"]}\n\n'
+    assert next(stream) == ': keepalive\n\n'
+    assert other.queue.empty()
+
+    stream.close()
+    assert bus.subscriber_count() == 1
+
+
+def test_database_broker_fans_out_across_workers_and_replays(temp_db):
+    # Two buses on one database stand in for two worker processes
+    writer = EventBus(broker=DatabaseEventBroker(), poll_interval=0.01)
+    reader = EventBus(broker=DatabaseEventBroker(), poll_interval=0.01)
+    subscription = reader.subscribe()
+
+    writer.publish('model_trained', {'model_version': 2})
+    event_id, event, data = subscription.queue.get(timeout=5)
+    assert (event, data) == ('model_trained', {'model_version': 2})
+
+    # A reconnecting client gets what it missed after its Last-Event-ID
+    writer.publish('cache_invalidated', {'reason': 'model'})
+    subscription.queue.get(timeout=5)
+    resumed = reader.subscribe(last_event_id=event_id)
+    assert resumed.queue.get_nowait()[1:] == ('cache_invalidated', {'reason': 'model'})
+
+    reader.unsubscribe(subscription)
+    reader.unsubscribe(resumed)
+
+
+def test_database_broker_logs_nothing_without_listeners(temp_db):
+    broker = DatabaseEventBroker(listener_ttl=30)
+    writer = EventBus(broker=broker, poll_interval=0.01)
+    writer.publish('entry_saved', {'dates': ['2025-01-01']})
+    assert broker.latest_id() == 0
+
+    # Another worker's stream makes saves log again, until its heartbeat expires
+    reader = EventBus(broker=DatabaseEventBroker(listener_ttl=0.2), poll_interval=0.01)
+    subscription = reader.subscribe()
+    writer.publish('entry_saved', {'dates': ['2025-01-02']})
+    assert subscription.queue.get(timeout=5)[1:] == ('entry_saved', {'dates': ['2025-01-02']})
+    reader.unsubscribe(subscription)
+
+    time.sleep(0.3)
+    assert not broker.has_listeners()
+    writer.publish('entry_saved', {'dates': ['2025-01-03']})
+    assert broker.latest_id() == 1
+
+
+def test_multiline_payloads_use_one_data_field_per_line():
+    message = format_event(7, 'cache_invalidated', {'a': 1}, dumps=lambda data: '{\n  "a": 1\n}')
+    assert message == 'id: 7\nevent: cache_invalidated\ndata: {\ndata:   "a": 1\ndata: }\n\n'
+
+
+def received_ids(subscription, wait=0.2):
+    ids = []
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        try:
+            ids.append(subscription.queue.get(timeout=0.01)[0])
+        except queue.Empty:
+            pass
+    return ids
+
+
+def test_poller_waits_for_ids_committed_out_of_order():
+    broker = OutOfOrderBroker()
+    broker.commit(1)
+    bus = EventBus(broker=broker, poll_interval=0.01, gap_seconds=60)
+    subscription = bus.subscribe()
+
+    # 3 committed before 2: held back rather than skipping 2 for good
+    broker.commit(3)
+    assert received_ids(subscription) == []
+    broker.commit(2)
+    assert received_ids(subscription) == [2, 3]
+
+    # Replay after 1 ends where delivery stands, with nothing skipped
+    resumed = bus.subscribe(last_event_id=1)
+    assert [resumed.queue.get_nowait()[0] for _ in range(2)] == [2, 3]
+    bus.unsubscribe(resumed)
+
+    # An id that never commits (rolled back) only delays later events
+    bus.gap_seconds = 0.05
+    broker.commit(5)
+    assert received_ids(subscription) == [5]
+    bus.unsubscribe(subscription)
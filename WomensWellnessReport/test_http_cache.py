@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Test conditional GET handling for the read endpoints"""
+
+from flask import Flask, jsonify
+
+from db_storage import save_wellness_entry
+from http_cache import conditional_get
+
+
+def make_app(calls, model):
+    app = Flask(__name__)
+
+    @app.route('/stats')
+    @conditional_get(lambda: (model['id'], None))
+    def stats():
+        calls.append(1)
+        return jsonify({"success": True})
+
+    return app.test_client()
+
+
+def test_matching_etag_skips_the_view(temp_db):
+    calls = []
+    model = {'id': 'heuristic'}
+    client = make_app(calls, model)
+
+    first = client.get('/stats')
+    etag = first.headers['ETag']
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    cached = client.get('/stats', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.headers['ETag'] == etag
+    assert len(calls) == 1
+
+    # A write or a newly published model changes the validator
+    save_wellness_entry({'date': '2025-01-01', 'sleep_hours': 7.0})
+    after_write = client.get('/stats', headers={'If-None-Match': etag})
+    assert after_write.status_code == 200
+    model['id'] = 'a1b2c3'
+    after_training = client.get('/stats', headers={'If-None-Match': after_write.headers['ETag']})
+    assert after_training.status_code == 200
+    assert len(calls) == 3
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Test the API's JSON provider and response compression"""
+
+import gzip
+import json
+
+import numpy as np
+import pandas as pd
+from flask import Flask, jsonify
+
+from compression import init_compression
+from json_provider import make_json_provider, NumpyJSONProvider
+
+
+def make_client(payload):
+    app = Flask(__name__)
+    app.json = make_json_provider(app)
+    init_compression(app, min_size=200)
+
+    @app.route('/data')
+    def data():
+        return jsonify(payload)
+
+    return app.test_client()
+
+
+PAYLOAD = {
+    'score': np.float64(71.5),
+    'count': np.int64(3),
+    'missing': float('nan'),
+    'series': np.array([1.0, 2.5]),
+    'day': pd.Timestamp('2025-01-02'),
+    'month': pd.Period('2025-01', freq='M'),
+}
+EXPECTED = {'score': 71.5, 'count': 3, 'missing': None, 'series': [1.0, 2.5],
+            'day': '2025-01-02T00:00:00', 'month': '2025-01'}
+
+
+def test_numpy_and_pandas_values_are_encoded():
+    response = make_client(PAYLOAD).get('/data')
+    assert json.loads(response.data) == EXPECTED
+
+    # The standard-library fallback agrees except for NaN, which it cannot map to null
+    fallback = NumpyJSONProvider(Flask(__name__))
+    assert json.loads(fallback.dumps({k: v for k, v in PAYLOAD.items() if k != 'missing'})) == \
+        {k: v for k, v in EXPECTED.items() if k != 'missing'}
+
+
+def test_large_responses_are_compressed():
+    client = make_client({'rows': [{'value': i} for i in range(200)]})
+
+    compressed = client.get('/data', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert len(json.loads(gzip.decompress(compressed.data))['rows']) == 200
+
+    plain = client.get('/data')
+    assert 'Content-Encoding' not in plain.headers
+
+
+def test_small_responses_are_sent_as_is():
+    response = make_client({'ok': True}).get('/data', headers={'Accept-Encoding': 'gzip, br'})
+    assert 'Content-Encoding' not in response.headers
+    assert json.loads(response.data) == {'ok': True}
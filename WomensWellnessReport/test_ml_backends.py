@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Test deferred loading of the ML backends and saved models"""
+
+import threading
+
+from ml_backends import LazyBackend
+from ml_models import WellnessPredictor
+
+
+def test_backend_loads_once_across_threads():
+    calls = []
+    barrier = threading.Barrier(4)
+
+    def loader():
+        calls.append(1)
+        return 'module'
+
+    backend = LazyBackend('json', loader)
+    results = []
+
+    def use():
+        barrier.wait()
+        results.append(backend.get())
+
+    threads = [threading.Thread(target=use) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ['module'] * 4 and calls == [1]
+    assert backend.stats()['loaded'] and backend.stats()['load_seconds'] is not None
+
+    missing = LazyBackend('no_such_backend_package', loader)
+    assert missing.get() is None and not missing.stats()['installed']
+
+
+def test_saved_model_is_read_on_first_use(tmp_path, monkeypatch, make_entries):
+    monkeypatch.chdir(tmp_path)
+    trained = WellnessPredictor(load_saved=False)
+    assert trained.train_xgboost_model(make_entries(12))
+
+    predictor = WellnessPredictor()
+    assert predictor.is_xgb_trained and predictor.model_load_seconds == {}
+
+    predictor.predict_wellness(make_entries(1)[0])
+    assert 'xgboost' in predictor.model_load_seconds
+    assert predictor.xgb_model is not None
+    assert predictor.warmup()['models'].keys() == {'xgboost'}
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Test the vectorized ML paths (feature matrix, labels, batch scoring) and POST /api/ml/predict/batch"""
+
+import numpy as np
+import pandas as pd
+
+from ml_models import WellnessPredictor, build_feature_matrix, heuristic_scores
+
+
+def test_feature_matrix_matches_per_entry_features():
+    predictor = WellnessPredictor(load_saved=False)
+    entries = [
+        {'average_stress': 3, 'exercise_minutes': 30, 'water_intake': 2000, 'sleep_hours': 7,
+         'sleep_quality': 8, 'symptoms': {'cramping': True, 'fatigue': False}, 'on_period': True},
+        {'average_stress': None, 'exercise_minutes': 'n/a', 'water_intake': None, 'sleep_hours': 6.5,
+         'sleep_quality': None, 'symptoms': {}, 'on_period': False},
+    ]
+
+    matrix = build_feature_matrix(pd.DataFrame(entries))
+
+    expected = np.vstack([predictor.extract_features(entry) for entry in entries])
+    np.testing.assert_allclose(matrix, expected)
+
+
+def test_heuristic_labels_match_per_entry_scores():
+    predictor = WellnessPredictor(load_saved=False)
+    entries = [
+        {'average_stress': stress, 'exercise_minutes': exercise, 'water_intake': water, 'sleep_hours': hours,
+         'sleep_quality': quality, 'symptoms': {f's{i}': i < count for i in range(10)}, 'sentiment_score': sentiment}
+        for stress, exercise, water, hours, quality, count, sentiment in [
+            (1, 0, 0, 4, 1, 0, -1), (3, 10, 999, 6, 5, 1, 0), (5, 20, 1000, 6.9, 7, 3, 0.35),
+            (7, 29.9, 1500, 7, 9, 8, 1), (10, 30, 2000, 9, 10, 10, 0.5), (2, 60, 2500, 9.5, 3, 2, 0.1),
+            (None, 'n/a', None, 10.5, None, 0, None)
+        ]
+    ]
+    # Symptoms as raw JSON text count the same as the dict
+    entries.append({**entries[1], 'symptoms': '{"cramping": true, "fatigue": false}'})
+
+    labels = heuristic_scores(pd.DataFrame(entries))
+
+    expected = [predictor._calculate_heuristic_score({**entry, 'symptoms': {'cramping': True}})
+                if isinstance(entry['symptoms'], str) else predictor._calculate_heuristic_score(entry)
+                for entry in entries]
+    np.testing.assert_array_equal(labels, expected)
+
+
+def test_batch_predictions_match_single_predictions(tmp_path, monkeypatch, make_entries):
+    monkeypatch.chdir(tmp_path)
+    entries = [
+        {'average_stress': 3, 'exercise_minutes': 30, 'water_intake': 2000, 'sleep_hours': 7, 'sleep_quality': 8,
+         'symptoms': {'cramping': True}, 'on_period': True, 'additional_notes': 'Happy and energetic'},
+        {'average_stress': 9, 'exercise_minutes': 0, 'water_intake': 500, 'sleep_hours': 4, 'sleep_quality': 2,
+         'symptoms': {}, 'on_period': False, 'additional_notes': 'tired, stressed and in pain'},
+        {'average_stress': 5, 'sleep_hours': 8, 'symptoms': {}, 'additional_notes': None},
+        {'average_stress': 4, 'sleep_hours': 6.5, 'symptoms': {}, 'additional_notes': 'Happy and energetic'},
+    ]
+    heuristic = WellnessPredictor(load_saved=False)
+    trained = WellnessPredictor(load_saved=False)
+    assert trained.train_xgboost_model(make_entries(12))
+
+    for predictor in (heuristic, trained):
+        batch = predictor.predict_wellness_batch(entries)
+        single = [predictor.predict_wellness(dict(entry)) for entry in entries]
+        assert batch['health_status'].tolist() == [result['health_status'] for result in single]
+        for field in ('wellness_score', 'sentiment_score', 'predicted_energy'):
+            np.testing.assert_allclose(batch[field], [result[field] for result in single])
+
+
+def test_predict_batch_endpoint_rejects_bad_bodies(api_client, monkeypatch):
+    import api_server
+    assert api_client.post('/api/ml/predict/batch', json={'entries': {'sleep_hours': 7}}).status_code == 400
+    assert api_client.post('/api/ml/predict/batch', json=[]).status_code == 400
+    response = api_client.post('/api/ml/predict/batch', json=[{'sleep_hours': 7}, 'tired', 3])
+    assert response.status_code == 400
+    assert response.get_json()['invalid'] == [1, 2]
+    assert api_client.post('/api/ml/predict/batch?format=csv', json=[{'sleep_hours': 7}]).status_code == 400
+
+    monkeypatch.setattr(api_server, 'MAX_PREDICT_ENTRIES', 3)
+    assert api_client.post('/api/ml/predict/batch', json=[{'sleep_hours': 7}] * 4).status_code == 413
+
+
+def test_predict_batch_endpoint_scores_in_chunks(api_client, monkeypatch, make_entries):
+    import api_server
+    entries = make_entries(5)
+    whole = api_client.post('/api/ml/predict/batch', json={'entries': entries}).get_json()
+    assert whole['count'] == 5 and whole['format'] == 'rows'
+
+    chunks = []
+    score = api_server.ml_predictor.predict_wellness_batch
+    monkeypatch.setattr(api_server.ml_predictor, 'predict_wellness_batch',
+                        lambda records: chunks.append(len(records)) or score(records))
+    monkeypatch.setattr(api_server, 'PREDICT_CHUNK_SIZE', 2)
+
+    chunked = api_client.post('/api/ml/predict/batch', json=entries).get_json()
+    assert chunks == [2, 2, 1]
+    assert chunked['data'] == whole['data']
+
+    columnar = api_client.post('/api/ml/predict/batch?format=columnar', json=entries).get_json()
+    assert columnar['format'] == 'columnar'
+    assert columnar['data'] == {field: [row[field] for row in whole['data']] for field in api_server.PREDICTION_FIELDS}
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Test the preload/fork hooks used by gunicorn.conf.py"""
+
+import os
+
+from sqlalchemy import text
+
+import database
+from ml_models import WellnessPredictor
+
+
+def test_warmup_before_fork_leaves_tensorflow_alone(monkeypatch):
+    predictor = WellnessPredictor(load_saved=False)
+    predictor.is_lstm_trained = True
+    loaded = []
+    monkeypatch.setattr(predictor, '_load_saved_model', loaded.append)
+
+    predictor.warmup(tensorflow=False)
+    assert loaded == []
+    predictor.warmup()
+    assert loaded == ['lstm']
+
+
+def test_forked_child_gets_its_own_connections(temp_db):
+    with temp_db.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert temp_db.pool.checkedin() == 1
+
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            database.reset_pool_after_fork()
+            with database.engine.connect() as conn:
+                code = 0 if conn.execute(text("SELECT count(*) FROM wellness_entries")).scalar() == 0 else 1
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+
+    # The parent's pooled connection was not closed by the child
+    with temp_db.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+    database.reset_pool_after_fork(parent=True)
+    assert temp_db.pool.checkedin() == 0
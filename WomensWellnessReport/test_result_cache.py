@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Test the computed-result cache"""
+
+from result_cache import ResultCache
+
+
+def make_cache(versions, **kwargs):
+    return ResultCache(load_version=lambda user_id: versions[user_id], **kwargs)
+
+
+def test_results_follow_data_and_model_versions():
+    versions = {'default_user': 1}
+    cache = make_cache(versions)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'report': len(calls)}
+
+    assert cache.get_or_compute('default_user', 'weekly', compute) == {'report': 1}
+    assert cache.get_or_compute('default_user', 'weekly', compute) == {'report': 1}
+    versions['default_user'] = 2
+    assert cache.get_or_compute('default_user', 'weekly', compute) == {'report': 2}
+    assert cache.get_or_compute('default_user', 'weekly', compute, model_id='m2') == {'report': 3}
+    assert cache.get_or_compute('default_user', 'weekly', compute, params=('2025-01-02',)) == {'report': 4}
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 4)
+
+
+def test_memory_bound_evicts_least_recently_used():
+    cache = make_cache({'default_user': 1}, max_bytes=3000)
+
+    for name in ('a', 'b', 'c'):
+        cache.get_or_compute('default_user', name, lambda: 'x' * 1000)
+    # 'a' was evicted to make room for 'c'
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['bytes'] <= 3000
+    cache.get_or_compute('default_user', 'a', lambda: 'recomputed')
+    assert cache.stats()['misses'] == 4
+
+
+def test_persisted_results_survive_a_restart(tmp_path):
+    versions = {'default_user': 5}
+    make_cache(versions, persist_dir=str(tmp_path)).get_or_compute('default_user', 'trends', lambda: [1, 2, 3])
+
+    restarted = make_cache(versions, persist_dir=str(tmp_path))
+    assert restarted.get_or_compute('default_user', 'trends', lambda: 'not called') == [1, 2, 3]
+    assert restarted.stats()['disk_hits'] == 1
+
+    # A slot written for an older version is not served
+    versions['default_user'] = 6
+    assert make_cache(versions, persist_dir=str(tmp_path)).get_or_compute(
+        'default_user', 'trends', lambda: 'fresh') == 'fresh'
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Test that model training runs in the background worker and publishes its result"""
+
+from ml_models import WellnessPredictor
+from training_worker import TrainingWorker
+
+
+def test_retrain_job_publishes_model(tmp_path, monkeypatch, make_entries):
+    # Keep saved models out of the repository's ml_models_saved directory
+    monkeypatch.chdir(tmp_path)
+    predictor = WellnessPredictor(load_saved=False)
+    entries = make_entries(12)
+    worker = TrainingWorker(predictor, load_entries=lambda user_id: entries, load_version=lambda user_id: 1)
+
+    assert worker.submit()
+    worker._queue.join()
+
+    assert predictor.is_xgb_trained
+    assert predictor.model_version == 1
+    assert worker.status()['last_job']['xgboost'] is True
+
+
+def test_not_enough_entries_keeps_heuristic(tmp_path, monkeypatch, make_entries):
+    monkeypatch.chdir(tmp_path)
+    predictor = WellnessPredictor(load_saved=False)
+    entries = make_entries(5)
+    worker = TrainingWorker(predictor, load_entries=lambda user_id: entries, load_version=lambda user_id: 1)
+
+    worker.submit(force=True)
+    worker._queue.join()
+
+    assert not predictor.is_xgb_trained
+    assert predictor.model_version == 0
+    assert 0 <= predictor.calculate_wellness_score(entries[0]) <= 100
+
+
+def test_failed_training_publishes_nothing(tmp_path, monkeypatch, make_entries):
+    monkeypatch.chdir(tmp_path)
+    predictor = WellnessPredictor(load_saved=False)
+    model_id = predictor.model_id
+    # Training that ends without a usable model, e.g. too few labelled rows
+    monkeypatch.setattr(WellnessPredictor, 'train_xgboost_model', lambda self, entries: False)
+    published = []
+    worker = TrainingWorker(predictor, load_entries=lambda user_id: make_entries(12),
+                            load_version=lambda user_id: 1,
+                            on_published=published.append)
+
+    worker.submit(force=True)
+    worker._queue.join()
+
+    assert not predictor.publish(WellnessPredictor(load_saved=False))
+    assert predictor.model_version == 0
+    assert predictor.model_id == model_id
+    assert published == []
+    assert worker.status()['last_job']['xgboost'] is False
+
+
+def test_retrain_policy_follows_entry_count(tmp_path, monkeypatch, make_entries):
+    monkeypatch.chdir(tmp_path)
+    predictor = WellnessPredictor(load_saved=False)
+    entries = make_entries(20)
+    worker = TrainingWorker(predictor, load_entries=lambda user_id: entries, load_version=lambda user_id: 1)
+
+    assert not worker.notify_entry_count(5)
+    assert worker.notify_entry_count(20)
+    worker._queue.join()
+    assert worker.status()['trained_on_entries'] == {'default_user': 20}
+
+    # Trained on 20: a handful of new entries is not worth a refit, a 20%+ growth is
+    assert not worker.notify_entry_count(24)
+    assert worker.notify_entry_count(27)
+    worker._queue.join()
+
+
+def test_startup_retrains_only_when_saved_models_are_behind(tmp_path, monkeypatch, make_entries):
+    monkeypatch.chdir(tmp_path)
+    entries = make_entries(12)
+    version = {'default_user': 3}
+
+    def start_process(predictor):
+        published = []
+        worker = TrainingWorker(predictor, load_entries=lambda user_id: entries,
+                                load_version=version.get, on_published=published.append)
+        worker.submit_startup()
+        worker._queue.join()
+        return worker, published
+
+    # Nothing saved yet: the first process trains and saves
+    first, _ = start_process(WellnessPredictor(load_saved=False))
+    assert first.predictor.model_version == 1
+    assert first.predictor.read_training_state() == {'user_id': 'default_user', 'data_version': 3, 'entries': 12}
+
+    fits = []
+    train = WellnessPredictor.train_xgboost_model
+    monkeypatch.setattr(WellnessPredictor, 'train_xgboost_model',
+                        lambda self, data: fits.append(1) or train(self, data))
+
+    # A process already using the saved models (as forked from a preloading
+    # master) keeps them; one that is not adopts them from disk
+    preloaded, published = start_process(WellnessPredictor())
+    assert preloaded.predictor.model_version == 0 and published == []
+    fresh, published = start_process(WellnessPredictor(load_saved=False))
+    assert fresh.predictor.model_version == 1 and len(published) == 1
+    assert preloaded.predictor.model_id == fresh.predictor.model_id == first.predictor.model_id
+    assert fits == []
+
+    # Entries written since: the next process retrains, once
+    version['default_user'] = 4
+    start_process(WellnessPredictor())
+    start_process(WellnessPredictor())
+    assert fits == [1]
+    assert first.predictor.read_training_state()['data_version'] == 4
+
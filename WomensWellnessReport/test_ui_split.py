@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""Test that the compute modules used by the API stay free of UI libraries"""
+
+import os
+import subprocess
+import sys
+
+COMPUTE_MODULES = ['comparative_analytics', 'cycle_prediction', 'data_export', 'reports', 'recommendations']
+
+
+def test_compute_modules_do_not_import_streamlit_or_plotly():
+    code = (
+        f"import sys\nfor name in {COMPUTE_MODULES!r}: __import__(name)\n"
+        "print(sorted(name for name in ('streamlit', 'plotly') if name in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
@@ -0,0 +1,243 @@
+"""
+Background training service for the wellness ML models.
+
+Retrain jobs are queued by the API (at startup and after new entries) and run
+on a dedicated daemon thread, so neither worker boot nor POST /api/entries waits
+on XGBoost/LSTM fitting. Each job trains a fresh WellnessPredictor and then
+publishes its models into the live predictor in a single step; until that
+happens endpoints keep serving the previous model or the heuristic fallback.
+
+Worker processes share the saved models: training and saving run under a
+file lock in the model directory, and the data version the models were
+trained on is saved next to them. At startup a process retrains only when
+that version is behind the current one, so after a deploy one process
+retrains and the others adopt its saved result (or, forked from a preloading
+master, keep the copy they share with it).
+"""
+
+import os
+import queue
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:
+    # No cross-process lock (Windows): run a single worker process there
+    fcntl = None
+
+from db_storage import get_all_entries, get_data_version
+from ml_models import WellnessPredictor, TF_AVAILABLE
+
+# Minimum number of entries before each model is worth training
+XGB_MIN_ENTRIES = 10
+LSTM_MIN_ENTRIES = 7
+# Trained models are refreshed once the history has grown by this fraction
+# (and by at least this many entries) since they were fitted
+RETRAIN_GROWTH = 0.2
+RETRAIN_MIN_NEW_ENTRIES = 7
+
+
+@contextmanager
+def saved_models_lock(model_dir):
+    """Held while models are trained and saved, so processes never write them concurrently"""
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(model_dir, '.training.lock'), 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class TrainingWorker:
+    """Runs "retrain" jobs off the request thread and publishes the results"""
+
+    def __init__(self, predictor, load_entries=get_all_entries, on_published=None, load_version=get_data_version):
+        self.predictor = predictor
+        self._load_entries = load_entries
+        self._load_version = load_version
+        # Called with the job record after new models have been published
+        self._on_published = on_published
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._thread = None
+        self._pid = None
+        self._running_job = None
+        self._trained_on = {}
+        self.last_job = None
+
+    def submit(self, user_id='default_user', force=False):
+        """
+        Queue a retrain job for a user.
+
+        With force=False only models that are not trained yet are fitted; with
+        force=True every model with enough data is refreshed. A job for a user
+        that is already waiting in the queue is coalesced into it.
+        """
+        return self._enqueue(user_id, force, startup=False)
+
+    def submit_startup(self, user_id='default_user'):
+        """
+        Queue a process's startup job: keep the saved models when they were
+        trained on the current data version, adopting them if this process
+        does not use them yet; otherwise retrain like submit(force=True).
+        """
+        return self._enqueue(user_id, True, startup=True)
+
+    def _enqueue(self, user_id, force, startup):
+        self._ensure_started()
+        with self._lock:
+            if user_id in self._pending:
+                return False
+            self._pending.add(user_id)
+        self._queue.put((user_id, force, startup))
+        return True
+
+    def notify_entry_count(self, entry_count, user_id='default_user'):
+        """
+        Retrain policy, applied after writes with the user's current entry
+        count: fit any model that has just reached its threshold, and refresh
+        all models once the history has outgrown what they were trained on.
+        Returns True when a job was queued.
+        """
+        if ((entry_count >= XGB_MIN_ENTRIES and not self.predictor.is_xgb_trained) or
+                (TF_AVAILABLE and entry_count >= LSTM_MIN_ENTRIES and not self.predictor.is_lstm_trained)):
+            return self.submit(user_id)
+
+        with self._lock:
+            trained_on = self._trained_on.get(user_id)
+        if trained_on is not None and entry_count - trained_on >= max(RETRAIN_MIN_NEW_ENTRIES, trained_on * RETRAIN_GROWTH):
+            return self.submit(user_id, force=True)
+        return False
+
+    def status(self):
+        """Snapshot of the worker state for the status endpoint"""
+        with self._lock:
+            return {
+                "training_in_progress": self._running_job is not None,
+                "queued_jobs": len(self._pending),
+                "trained_on_entries": dict(self._trained_on),
+                "last_job": dict(self.last_job) if self.last_job else None
+            }
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                # Threads do not survive fork(); a forked worker starts its own
+                # queue rather than waiting on the parent's.
+                self._queue = queue.Queue()
+                self._pending = set()
+                self._running_job = None
+                self._thread = None
+                self._pid = os.getpid()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='ml-training-worker', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            user_id, force, startup = self._queue.get()
+            with self._lock:
+                self._pending.discard(user_id)
+                self._running_job = user_id
+            try:
+                with saved_models_lock(self.predictor.model_dir):
+                    if not (startup and self._adopt_saved(user_id)):
+                        self._train(user_id, force)
+            except Exception as e:
+                print(f"Training job for {user_id} failed: {e}")
+                print(traceback.format_exc())
+                self._record(user_id, started=None, error=str(e))
+            finally:
+                with self._lock:
+                    self._running_job = None
+                self._queue.task_done()
+
+    def _adopt_saved(self, user_id):
+        """
+        Startup: use the saved models if they are current. Returns False when
+        there are none, or they were trained on an older data version.
+        """
+        started = time.perf_counter()
+        saved = WellnessPredictor()
+        if not saved.model_id.startswith('saved-'):
+            return False
+        version = self._load_version(user_id)
+        state = saved.read_training_state()
+        if state is None:
+            # Saved before training state was recorded: taken as current
+            total = len(self._load_entries(user_id))
+            saved.write_training_state(user_id=user_id, data_version=version, entries=total)
+        elif state.get('user_id') != user_id or state.get('data_version') != version:
+            return False
+        else:
+            total = state['entries']
+
+        # Already in use (e.g. shared with a preloading master): nothing to swap
+        published = saved.model_id != self.predictor.model_id and self.predictor.publish(saved)
+        with self._lock:
+            self._trained_on[user_id] = total
+        job = self._record(user_id, started, total_entries=total, adopted=saved.model_id)
+        if published:
+            self._announce(job)
+        return True
+
+    def _train(self, user_id, force):
+        started = time.perf_counter()
+        # Read before the entries, so writes made meanwhile count as newer
+        version = self._load_version(user_id)
+        entries = self._load_entries(user_id)
+        total = len(entries)
+
+        train_xgb = total >= XGB_MIN_ENTRIES and (force or not self.predictor.is_xgb_trained)
+        # Without TensorFlow there is no LSTM to fit
+        train_lstm = TF_AVAILABLE and total >= LSTM_MIN_ENTRIES and (force or not self.predictor.is_lstm_trained)
+        if not train_xgb and not train_lstm:
+            self._record(user_id, started, total_entries=total)
+            return
+
+        # Train into a separate predictor so the live one is never half-updated
+        candidate = WellnessPredictor(load_saved=False)
+        if train_xgb:
+            candidate.train_xgboost_model(entries)
+        if train_lstm:
+            candidate.train_lstm_model(entries)
+
+        published = self.predictor.publish(candidate)
+        if candidate.model_id.startswith('saved-'):
+            candidate.write_training_state(user_id=user_id, data_version=version, entries=total)
+        with self._lock:
+            self._trained_on[user_id] = total
+        job = self._record(user_id, started, total_entries=total,
+                           xgboost=candidate.is_xgb_trained, lstm=candidate.is_lstm_trained,
+                           metrics=candidate.training_metrics)
+        # Nothing adopted means predictions are unchanged: no event to announce
+        if published:
+            self._announce(job)
+
+    def _announce(self, job):
+        if self._on_published is not None:
+            try:
+                self._on_published(job)
+            except Exception as e:
+                print(f"Training publish hook failed: {e}")
+
+    def _record(self, user_id, started, error=None, **details):
+        job = {
+            "user_id": user_id,
+            "finished_at": datetime.utcnow().isoformat(),
+            "duration_seconds": round(time.perf_counter() - started, 3) if started else None,
+            "model_version": self.predictor.model_version,
+            "error": error
+        }
+        job.update(details)
+        with self._lock:
+            self.last_job = job
+        return job
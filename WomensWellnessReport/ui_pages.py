@@ -0,0 +1,672 @@
+"""
+Streamlit pages for app.py built on the compute modules: cycle forecast,
+comparative analytics and data export. Keeping them here means the API
+server, which imports cycle_prediction, comparative_analytics and
+data_export, never loads Streamlit or Plotly.
+"""
+
+import pandas as pd
+# Streamlit is optional in API runtime
+try:
+    import streamlit as st  # type: ignore
+except Exception:
+    st = None  # type: ignore
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from datetime import datetime, timedelta
+
+from entry_frame import as_entries_frame
+from cycle_prediction import predict_next_cycle, predict_symptom_likelihood
+from comparative_analytics import calculate_monthly_aggregates
+from data_export import export_to_csv, export_to_json, create_summary_report
+
+def display_cycle_forecast(data, ml_predictor):
+    """Display cycle prediction and forecast page (Streamlit UI). No-op if Streamlit absent."""
+    if st is None:
+        return
+    st.markdown('<p class="sub-header">🔮 Menstrual Cycle Forecast</p>', unsafe_allow_html=True)
+    
+    if not data or 'entries' not in data or len(data['entries']) == 0:
+        st.info("📝 No data available. Start tracking your cycle to see predictions!")
+        return
+    
+    st.markdown("""
+    <div style="background: linear-gradient(135deg, #FF6B9D 0%, #9B59B6 100%); padding: 20px; border-radius: 15px; color: white; margin-bottom: 20px;">
+        <h3>🌙 AI-Powered Cycle Predictions</h3>
+        <p>Based on your historical menstrual cycle data and machine learning analysis</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    prediction = predict_next_cycle(data)
+    
+    if prediction is None:
+        st.warning("📊 Need at least 2 menstrual cycles tracked to generate predictions. Keep logging your data!")
+        return
+    
+    # Display prediction summary
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        days_until = (prediction['predicted_date'] - datetime.now()).days
+        st.markdown(f"""
+        <div style="background-color: #FF6B9D22; padding: 20px; border-radius: 10px; text-align: center;">
+            <h2 style="color: #FF6B9D; margin: 0;">{days_until}</h2>
+            <p style="margin: 5px 0;">Days Until Next Period</p>
+            <small>Predicted: {prediction['predicted_date'].strftime('%B %d, %Y')}</small>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div style="background-color: #9B59B622; padding: 20px; border-radius: 10px; text-align: center;">
+            <h2 style="color: #9B59B6; margin: 0;">{prediction['avg_cycle_length']:.1f}</h2>
+            <p style="margin: 5px 0;">Average Cycle Length</p>
+            <small>{prediction['cycle_regularity']} Cycle</small>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown(f"""
+        <div style="background-color: #5DADE222; padding: 20px; border-radius: 10px; text-align: center;">
+            <h2 style="color: #5DADE2; margin: 0;">{prediction['confidence']}</h2>
+            <p style="margin: 5px 0;">Prediction Confidence</p>
+            <small>±{prediction['confidence_range_days']} days</small>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown("<br/>", unsafe_allow_html=True)
+    
+    # Cycle calendar visualization
+    st.markdown("### 📅 Cycle Calendar")
+    
+    # Create calendar view for next 90 days
+    today = datetime.now()
+    calendar_data = []
+    
+    for i in range(90):
+        date = today + timedelta(days=i)
+        
+        # Determine cycle phase
+        days_from_prediction = (date - prediction['predicted_date']).days
+        
+        if -5 <= days_from_prediction <= 0:
+            phase = "Predicted Period (±{})".format(prediction['confidence_range_days'])
+            color = "#FF6B9D"
+            intensity = 1.0
+        elif 1 <= days_from_prediction <= 5:
+            phase = "Predicted Period (±{})".format(prediction['confidence_range_days'])
+            color = "#FFB6C1"
+            intensity = 0.6
+        elif -prediction['avg_cycle_length'] + 28 <= days_from_prediction <= -prediction['avg_cycle_length'] + 32:
+            phase = "Next Predicted Period"
+            color = "#FF6B9D"
+            intensity = 0.8
+        else:
+            # Calculate phase based on predicted cycle
+            days_into_cycle = (date - prediction['predicted_date']).days % int(prediction['avg_cycle_length'])
+            
+            if days_into_cycle <= 13:
+                phase = "Follicular Phase"
+                color = "#87CEEB"
+                intensity = 0.5
+            elif days_into_cycle <= 17:
+                phase = "Ovulation Phase"
+                color = "#FFD700"
+                intensity = 0.6
+            else:
+                phase = "Luteal Phase"
+                color = "#DDA0DD"
+                intensity = 0.5
+        
+        calendar_data.append({
+            'date': date,
+            'phase': phase,
+            'color': color,
+            'intensity': intensity
+        })
+    
+    calendar_df = pd.DataFrame(calendar_data)
+    
+    # Create timeline visualization
+    fig = go.Figure()
+    
+    # Group by phase for better visualization
+    for phase in calendar_df['phase'].unique():
+        phase_data = calendar_df[calendar_df['phase'] == phase]
+        
+        fig.add_trace(go.Scatter(
+            x=phase_data['date'],
+            y=[1] * len(phase_data),
+            mode='markers',
+            name=phase,
+            marker=dict(
+                size=15,
+                color=phase_data['color'].iloc[0],
+                line=dict(width=1, color='white')
+            ),
+            hovertemplate='<b>%{x|%B %d}</b><br>' + phase + '<extra></extra>'
+        ))
+    
+    fig.update_layout(
+        title="Next 90 Days Cycle Forecast",
+        xaxis_title="Date",
+        yaxis=dict(visible=False),
+        height=250,
+        showlegend=True,
+        hovermode='closest',
+        template='plotly_white'
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Symptom predictions
+    st.markdown("### 🩺 Predicted Symptoms for Next Cycle")
+    
+    symptom_predictions = predict_symptom_likelihood(data)
+    
+    if symptom_predictions:
+        # Sort by likelihood
+        sorted_symptoms = sorted(symptom_predictions.items(), key=lambda x: x[1]['percentage'], reverse=True)
+        
+        col1, col2 = st.columns(2)
+        
+        for idx, (symptom, info) in enumerate(sorted_symptoms):
+            symptom_name = symptom.replace('_', ' ').title()
+            
+            col = col1 if idx % 2 == 0 else col2
+            
+            with col:
+                # Color based on likelihood
+                if info['category'] == 'Very Likely':
+                    bg_color = "#E74C3C22"
+                    text_color = "#E74C3C"
+                elif info['category'] == 'Likely':
+                    bg_color = "#F39C1222"
+                    text_color = "#F39C12"
+                elif info['category'] == 'Possible':
+                    bg_color = "#F1C40F22"
+                    text_color = "#F1C40F"
+                else:
+                    bg_color = "#95A5A622"
+                    text_color = "#95A5A6"
+                
+                st.markdown(f"""
+                <div style="background-color: {bg_color}; padding: 12px; margin: 8px 0; border-radius: 8px; border-left: 4px solid {text_color};">
+                    <strong style="color: {text_color};">{symptom_name}</strong><br/>
+                    <small>{info['category']}: {info['percentage']:.0f}% likelihood</small>
+                    <div style="background-color: {text_color}; width: {info['percentage']}%; height: 6px; border-radius: 3px; margin-top: 5px;"></div>
+                </div>
+                """, unsafe_allow_html=True)
+    else:
+        st.info("Track more cycles with symptoms to see predictions!")
+    
+    # Cycle history
+    st.markdown("### 📊 Cycle History")
+    
+    if len(prediction['cycle_lengths']) > 0:
+        # Create bar chart of cycle lengths
+        fig_history = go.Figure()
+        
+        fig_history.add_trace(go.Bar(
+            x=list(range(1, len(prediction['cycle_lengths']) + 1)),
+            y=prediction['cycle_lengths'],
+            marker_color='#9B59B6',
+            text=[f"{int(length)} days" for length in prediction['cycle_lengths']],
+            textposition='auto'
+        ))
+        
+        # Add average line
+        fig_history.add_hline(
+            y=prediction['avg_cycle_length'],
+            line_dash="dash",
+            line_color="green",
+            annotation_text=f"Average: {prediction['avg_cycle_length']:.1f} days"
+        )
+        
+        fig_history.update_layout(
+            title="Your Cycle Length History",
+            xaxis_title="Cycle Number",
+            yaxis_title="Days",
+            height=350,
+            template='plotly_white'
+        )
+        
+        st.plotly_chart(fig_history, use_container_width=True)
+        
+        # Statistics
+        st.markdown(f"""
+        **Cycle Statistics:**
+        - **Shortest Cycle:** {min(prediction['cycle_lengths']):.0f} days
+        - **Longest Cycle:** {max(prediction['cycle_lengths']):.0f} days
+        - **Average Cycle:** {prediction['avg_cycle_length']:.1f} days
+        - **Cycles Tracked:** {len(prediction['cycle_lengths'])}
+        """)
+    
+    # Tips based on prediction
+    st.markdown("---")
+    st.markdown("### 💡 Preparation Tips")
+    
+    if days_until <= 7:
+        st.info(f"""
+        🗓️ **Your next period is predicted in about {days_until} days!**
+        
+        **Preparation checklist:**
+        - Stock up on menstrual products
+        - Plan light activities if you expect fatigue
+        - Prepare comfort items (heating pad, favorite tea)
+        - Consider meal prep for easy, nutritious meals
+        """)
+    elif days_until <= 14:
+        st.success(f"""
+        🌸 **You're likely in your follicular phase!**
+        
+        **Make the most of it:**
+        - Energy levels may be higher - great time for challenging workouts
+        - Social activities and new projects are well-timed
+        - Metabolism may be slower - maintain balanced nutrition
+        """)
+    else:
+        st.success(f"""
+        🌙 **You have about {days_until} days until your next predicted period.**
+        
+        **Stay on track:**
+        - Continue daily wellness tracking for better predictions
+        - Monitor any PMS symptoms in the luteal phase
+        - Maintain healthy habits to optimize cycle health
+        """)
+
+def display_comparative_analytics(data):
+    """Display comparative analytics dashboard (Streamlit UI). No-op if Streamlit absent."""
+    if st is None:
+        return
+    st.markdown('<p class="sub-header">📊 Comparative Analytics</p>', unsafe_allow_html=True)
+    
+    df = as_entries_frame(data)
+    if df is None or len(df) < 14:
+        st.info("📊 Need at least 14 days of data spanning multiple months for comparative analysis.")
+        return
+    
+    # Check if we have multiple months
+    month_count = df['date'].dt.to_period('M').nunique()
+    
+    if month_count < 2:
+        st.info("📅 Keep tracking! Comparative analytics will be available once you have data from multiple months.")
+        return
+    
+    st.markdown("""
+    <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 20px; border-radius: 15px; color: white; margin-bottom: 20px;">
+        <h3>📈 Month-Over-Month Progress Analysis</h3>
+        <p>Track your wellness improvements across multiple menstrual cycles</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Calculate monthly aggregates
+    monthly_stats = calculate_monthly_aggregates(df)
+    
+    # Overview metrics
+    st.markdown("### 🎯 Overall Progress")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    if len(monthly_stats) >= 2:
+        latest = monthly_stats.iloc[-1]
+        previous = monthly_stats.iloc[-2]
+        
+        wellness_change = latest['wellness_score_mean'] - previous['wellness_score_mean']
+        stress_change = latest['average_stress_mean'] - previous['average_stress_mean']
+        sleep_change = latest['sleep_hours_mean'] - previous['sleep_hours_mean']
+        exercise_change = latest['exercise_minutes_mean'] - previous['exercise_minutes_mean']
+        
+        with col1:
+            delta_color = "normal" if wellness_change >= 0 else "inverse"
+            st.metric(
+                "Wellness Score",
+                f"{latest['wellness_score_mean']:.1f}",
+                f"{wellness_change:+.1f} vs last month",
+                delta_color=delta_color
+            )
+        
+        with col2:
+            delta_color = "inverse" if stress_change >= 0 else "normal"
+            st.metric(
+                "Stress Level",
+                f"{latest['average_stress_mean']:.1f}",
+                f"{stress_change:+.1f} vs last month",
+                delta_color=delta_color
+            )
+        
+        with col3:
+            delta_color = "normal" if sleep_change >= 0 else "inverse"
+            st.metric(
+                "Sleep Hours",
+                f"{latest['sleep_hours_mean']:.1f}h",
+                f"{sleep_change:+.1f}h vs last month",
+                delta_color=delta_color
+            )
+        
+        with col4:
+            delta_color = "normal" if exercise_change >= 0 else "inverse"
+            st.metric(
+                "Exercise",
+                f"{latest['exercise_minutes_mean']:.0f}min",
+                f"{exercise_change:+.0f}min vs last month",
+                delta_color=delta_color
+            )
+    
+    # Month-over-month trend charts
+    st.markdown("### 📈 Trend Comparison")
+    
+    # Create multi-metric comparison chart
+    fig = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=('Wellness Score Trend', 'Stress Level Trend', 
+                       'Sleep Quality Trend', 'Exercise Trend'),
+        vertical_spacing=0.12,
+        horizontal_spacing=0.1
+    )
+    
+    # Wellness score
+    fig.add_trace(
+        go.Scatter(
+            x=monthly_stats['month_str'],
+            y=monthly_stats['wellness_score_mean'],
+            mode='lines+markers',
+            name='Wellness Score',
+            line=dict(color='#9B59B6', width=3),
+            marker=dict(size=10),
+            fill='tozeroy',
+            fillcolor='rgba(155, 89, 182, 0.2)'
+        ),
+        row=1, col=1
+    )
+    
+    # Stress level
+    fig.add_trace(
+        go.Scatter(
+            x=monthly_stats['month_str'],
+            y=monthly_stats['average_stress_mean'],
+            mode='lines+markers',
+            name='Stress Level',
+            line=dict(color='#E74C3C', width=3),
+            marker=dict(size=10)
+        ),
+        row=1, col=2
+    )
+    
+    # Sleep hours
+    fig.add_trace(
+        go.Scatter(
+            x=monthly_stats['month_str'],
+            y=monthly_stats['sleep_hours_mean'],
+            mode='lines+markers',
+            name='Sleep Hours',
+            line=dict(color='#3498DB', width=3),
+            marker=dict(size=10)
+        ),
+        row=2, col=1
+    )
+    
+    # Exercise
+    fig.add_trace(
+        go.Scatter(
+            x=monthly_stats['month_str'],
+            y=monthly_stats['exercise_minutes_mean'],
+            mode='lines+markers',
+            name='Exercise',
+            line=dict(color='#27AE60', width=3),
+            marker=dict(size=10)
+        ),
+        row=2, col=2
+    )
+    
+    fig.update_xaxes(title_text="Month", row=2, col=1)
+    fig.update_xaxes(title_text="Month", row=2, col=2)
+    
+    fig.update_yaxes(title_text="Score (0-100)", row=1, col=1)
+    fig.update_yaxes(title_text="Level (1-10)", row=1, col=2)
+    fig.update_yaxes(title_text="Hours", row=2, col=1)
+    fig.update_yaxes(title_text="Minutes", row=2, col=2)
+    
+    fig.update_layout(
+        height=600,
+        showlegend=False,
+        template='plotly_white'
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Best and worst months
+    st.markdown("### 🏆 Performance Highlights")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        best_month_idx = monthly_stats['wellness_score_mean'].idxmax()
+        best_month = monthly_stats.iloc[best_month_idx]
+        
+        st.markdown(f"""
+        <div style="background-color: #27AE6022; padding: 20px; border-radius: 10px; border-left: 5px solid #27AE60;">
+            <h4 style="color: #27AE60; margin-top: 0;">🌟 Best Month</h4>
+            <p><strong>{best_month['month_str']}</strong></p>
+            <p>Wellness Score: {best_month['wellness_score_mean']:.1f}/100</p>
+            <p>Avg Sleep: {best_month['sleep_hours_mean']:.1f}h</p>
+            <p>Avg Exercise: {best_month['exercise_minutes_mean']:.0f}min/day</p>
+            <p>Avg Stress: {best_month['average_stress_mean']:.1f}/10</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        worst_month_idx = monthly_stats['wellness_score_mean'].idxmin()
+        worst_month = monthly_stats.iloc[worst_month_idx]
+        
+        st.markdown(f"""
+        <div style="background-color: #E74C3C22; padding: 20px; border-radius: 10px; border-left: 5px solid #E74C3C;">
+            <h4 style="color: #E74C3C; margin-top: 0;">📉 Room for Growth</h4>
+            <p><strong>{worst_month['month_str']}</strong></p>
+            <p>Wellness Score: {worst_month['wellness_score_mean']:.1f}/100</p>
+            <p>Avg Sleep: {worst_month['sleep_hours_mean']:.1f}h</p>
+            <p>Avg Exercise: {worst_month['exercise_minutes_mean']:.0f}min/day</p>
+            <p>Avg Stress: {worst_month['average_stress_mean']:.1f}/10</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Improvement percentage
+    if len(monthly_stats) >= 2:
+        first_month = monthly_stats.iloc[0]
+        latest_month = monthly_stats.iloc[-1]
+        
+        total_improvement = ((latest_month['wellness_score_mean'] - first_month['wellness_score_mean']) / 
+                           first_month['wellness_score_mean'] * 100)
+        
+        if total_improvement > 0:
+            st.success(f"""
+            🎉 **Amazing Progress!** Your wellness score has improved by **{total_improvement:.1f}%** 
+            from {first_month['month_str']} to {latest_month['month_str']}!
+            """)
+        elif total_improvement < -5:
+            st.info(f"""
+            💙 Your wellness score has decreased by {abs(total_improvement):.1f}% since {first_month['month_str']}. 
+            This is normal - wellness has natural fluctuations. Focus on consistent healthy habits!
+            """)
+        else:
+            st.info(f"""
+            ⚖️ Your wellness score has remained stable since {first_month['month_str']}. 
+            Consistency is key to long-term health!
+            """)
+    
+    # Monthly details table
+    st.markdown("### 📋 Monthly Summary Table")
+    
+    # Prepare display dataframe
+    display_df = monthly_stats[[
+        'month_str', 'wellness_score_mean', 'average_stress_mean',
+        'sleep_hours_mean', 'exercise_minutes_sum', 'on_period_sum'
+    ]].copy()
+    
+    display_df.columns = ['Month', 'Avg Wellness', 'Avg Stress', 'Avg Sleep (h)', 
+                          'Total Exercise (min)', 'Period Days']
+    
+    # Format numbers
+    display_df['Avg Wellness'] = display_df['Avg Wellness'].round(1)
+    display_df['Avg Stress'] = display_df['Avg Stress'].round(1)
+    display_df['Avg Sleep (h)'] = display_df['Avg Sleep (h)'].round(1)
+    display_df['Total Exercise (min)'] = display_df['Total Exercise (min)'].round(0).astype(int)
+    display_df['Period Days'] = display_df['Period Days'].astype(int)
+    
+    st.dataframe(display_df.sort_values('Month', ascending=False), use_container_width=True)
+    
+    # Cycle-specific analysis
+    if 'on_period' in df.columns and df['on_period'].any():
+        st.markdown("### 🌙 Cycle Impact Analysis")
+        
+        # Compare period vs non-period days across months
+        period_comparison = []
+        
+        for month in df['date'].dt.to_period('M').unique():
+            month_data = df[df['date'].dt.to_period('M') == month]
+            
+            period_days = month_data[month_data['on_period'] == True]
+            non_period_days = month_data[month_data['on_period'] == False]
+            
+            if len(period_days) > 0 and len(non_period_days) > 0:
+                period_comparison.append({
+                    'Month': str(month),
+                    'Period Wellness': period_days['wellness_score'].mean() if 'wellness_score' in period_days else 0,
+                    'Non-Period Wellness': non_period_days['wellness_score'].mean() if 'wellness_score' in non_period_days else 0,
+                    'Difference': (non_period_days['wellness_score'].mean() - period_days['wellness_score'].mean()) if 'wellness_score' in period_days else 0
+                })
+        
+        if period_comparison:
+            comparison_df = pd.DataFrame(period_comparison)
+            
+            fig_cycle = go.Figure()
+            
+            fig_cycle.add_trace(go.Bar(
+                name='During Period',
+                x=comparison_df['Month'],
+                y=comparison_df['Period Wellness'],
+                marker_color='#E91E63'
+            ))
+            
+            fig_cycle.add_trace(go.Bar(
+                name='Other Days',
+                x=comparison_df['Month'],
+                y=comparison_df['Non-Period Wellness'],
+                marker_color='#9C27B0'
+            ))
+            
+            fig_cycle.update_layout(
+                title='Wellness Score: Period vs Non-Period Days by Month',
+                barmode='group',
+                yaxis_title='Wellness Score',
+                height=400,
+                template='plotly_white'
+            )
+            
+            st.plotly_chart(fig_cycle, use_container_width=True)
+            
+            avg_impact = comparison_df['Difference'].mean()
+            if avg_impact > 5:
+                st.info(f"""
+                📊 **Pattern Detected:** Your wellness score tends to be **{avg_impact:.1f} points lower** during your period. 
+                This is normal - consider extra self-care during this time.
+                """)
+
+def display_export_page(data):
+    """Display the data export page in Streamlit (no-op if Streamlit absent)"""
+    if st is None:
+        return
+    st.markdown('<p class="sub-header">📥 Export Your Wellness Data</p>', unsafe_allow_html=True)
+    
+    if not data or 'entries' not in data or len(data['entries']) == 0:
+        st.info("📝 No data available to export. Start by adding some daily entries!")
+        return
+    
+    total_entries = len(data['entries'])
+    
+    st.markdown(f"""
+    <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 20px; border-radius: 15px; color: white; margin-bottom: 20px;">
+        <h3>📊 Export Your Health Records</h3>
+        <p>Download your complete wellness data for personal records or to share with healthcare providers.</p>
+        <p><strong>Total Entries:</strong> {total_entries}</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Export options
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### 📄 CSV Export")
+        st.write("Download your data in spreadsheet format - perfect for Excel, Google Sheets, or data analysis.")
+        
+        csv_data = export_to_csv(data)
+        if csv_data:
+            st.download_button(
+                label="⬇️ Download CSV",
+                data=csv_data,
+                file_name=f"wellness_data_{datetime.now().strftime('%Y%m%d')}.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
+    
+    with col2:
+        st.markdown("### 📋 JSON Export")
+        st.write("Download your data in JSON format - ideal for backups or importing into other applications.")
+        
+        json_data = export_to_json(data)
+        if json_data:
+            st.download_button(
+                label="⬇️ Download JSON",
+                data=json_data,
+                file_name=f"wellness_data_{datetime.now().strftime('%Y%m%d')}.json",
+                mime="application/json",
+                use_container_width=True
+            )
+    
+    st.markdown("---")
+    
+    # Summary report
+    st.markdown("### 📊 Summary Report")
+    st.write("Generate a text-based summary of your wellness journey.")
+    
+    if st.button("📄 Generate Summary Report", use_container_width=True):
+        summary = create_summary_report(data)
+        
+        st.text_area(
+            "Your Wellness Summary",
+            value=summary,
+            height=400,
+            disabled=True
+        )
+        
+        st.download_button(
+            label="⬇️ Download Summary Report",
+            data=summary,
+            file_name=f"wellness_summary_{datetime.now().strftime('%Y%m%d')}.txt",
+            mime="text/plain",
+            use_container_width=True
+        )
+    
+    # Data preview
+    st.markdown("---")
+    st.markdown("### 👁️ Data Preview")
+    
+    df = pd.DataFrame(data['entries'])
+    
+    # Show basic preview
+    preview_columns = ['date', 'wellness_score', 'average_stress', 'sleep_hours', 
+                      'exercise_minutes', 'water_intake', 'on_period']
+    
+    available_columns = [col for col in preview_columns if col in df.columns]
+    
+    if available_columns:
+        st.dataframe(
+            df[available_columns].tail(10).sort_values('date', ascending=False),
+            use_container_width=True
+        )
+        
+        st.caption(f"Showing last 10 entries out of {total_entries} total entries")
+    
+    # Privacy notice
+    st.info("🔒 **Privacy Note:** Your data is stored locally and never transmitted to external servers. "
+            "All exports are generated on your device for your personal use only.")